@@ -3,10 +3,15 @@ from __future__ import annotations
 import json
 import logging
 import os
-import re
-from typing import Any
+from functools import cached_property, lru_cache
+from typing import Any, Callable
 
-from coach.agent.prompts import SYSTEM_PROMPT, planner_prompt, summary_prompt
+from coach.agent.prompts import (
+    SYSTEM_PROMPT,
+    plan_and_prepare_prompt,
+    planner_prompt,
+    summary_prompt,
+)
 
 try:
     from google import genai
@@ -43,6 +48,34 @@ def _is_quota_error(exc: Exception) -> bool:
     return any(kw in msg for kw in ("quota", "rate limit", "resource exhausted", "429", "too many requests"))
 
 
+# ---------------------------------------------------------------------------
+# Generation config
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def _generation_config(temperature: float) -> Any:
+    """
+    Return a shared ``GenerateContentConfig`` for *temperature*.
+
+    The system instruction is the static prefix of every request. Building the
+    config once keeps that prefix byte-identical across calls (and across key
+    rotations), which lets Gemini's implicit prefix caching reuse it.
+    """
+    return types.GenerateContentConfig(system_instruction=SYSTEM_PROMPT, temperature=temperature)
+
+
+@lru_cache(maxsize=32)
+def _client_for_key(api_key: str) -> Any:
+    """
+    Return a shared ``genai.Client`` for *api_key*.
+
+    Clients are reused across ``LLMClient`` instances and key rotations, so a
+    service that builds a client per request (or cycles back to an earlier key)
+    does not pay for SDK/HTTP client setup again.
+    """
+    return genai.Client(api_key=api_key)
+
+
 # ---------------------------------------------------------------------------
 # Key loading (env-var fallback)
 # ---------------------------------------------------------------------------
@@ -223,7 +256,6 @@ class LLMClient:
                 self._init_env_fallback()
 
         self.enabled = bool(self._keys and genai is not None)
-        self.client = self._make_client() if self.enabled else None
 
     def _init_env_fallback(self) -> None:
         """Initialize key rotation from local env (no Redis)."""
@@ -234,6 +266,11 @@ class LLMClient:
     # Public helpers
     # ------------------------------------------------------------------
 
+    @cached_property
+    def client(self) -> Any:
+        """SDK client for the active key, built on first use (``None`` when disabled)."""
+        return self._make_client() if self.enabled else None
+
     @property
     def api_key(self) -> str | None:
         """The currently active API key."""
@@ -244,19 +281,48 @@ class LLMClient:
             return None
         response = self._generate_with_rotation(
             contents=planner_prompt(user_query),
-            config=types.GenerateContentConfig(system_instruction=SYSTEM_PROMPT, temperature=0.0),
+            config=_generation_config(temperature=0.0),
         )
         text = getattr(response, "text", None) or ""
         return _extract_json_payload(text) if text.strip() else None
 
-    def summarize(self, question: str, computed_payload: dict[str, Any]) -> str | None:
+    def plan_and_prepare(self, user_query: str) -> dict[str, Any] | None:
+        """
+        Plan and draft the answer in one round-trip.
+
+        Returns ``{"plan": {...}, "summary_template": "..."}``, where the template
+        is filled in from the computed payload instead of a second summarize call.
+        """
         if not self.enabled:
             return None
         response = self._generate_with_rotation(
-            contents=summary_prompt(question, computed_payload),
-            config=types.GenerateContentConfig(system_instruction=SYSTEM_PROMPT, temperature=0.2),
+            contents=plan_and_prepare_prompt(user_query),
+            config=_generation_config(temperature=0.0),
         )
-        text = getattr(response, "text", None)
+        text = getattr(response, "text", None) or ""
+        return _extract_json_payload(text) if text.strip() else None
+
+    def summarize(
+        self,
+        question: str,
+        computed_payload: dict[str, Any],
+        on_chunk: Callable[[str], None] | None = None,
+    ) -> str | None:
+        """
+        Summarize computed tool outputs.
+
+        When *on_chunk* is given the response is streamed and each text chunk is
+        passed to it as soon as it arrives; the full text is still returned.
+        """
+        if not self.enabled:
+            return None
+        contents = summary_prompt(question, computed_payload)
+        config = _generation_config(temperature=0.2)
+        if on_chunk is None:
+            response = self._generate_with_rotation(contents=contents, config=config)
+            text = getattr(response, "text", None)
+        else:
+            text = self._stream_with_rotation(contents=contents, config=config, on_chunk=on_chunk)
         return text if text and text.strip() else None
 
     # ------------------------------------------------------------------
@@ -264,7 +330,7 @@ class LLMClient:
     # ------------------------------------------------------------------
 
     def _make_client(self) -> Any:
-        return genai.Client(api_key=self.api_key)
+        return _client_for_key(self.api_key)
 
     def _advance(self) -> None:
         """Advance to the next key and rebuild the client."""
@@ -300,6 +366,38 @@ class LLMClient:
         Tries each key at most once per call.  Raises ``RuntimeError`` if
         the entire pool is exhausted.
         """
+        return self._call_with_rotation(
+            lambda: self.client.models.generate_content(
+                model=self.model,
+                contents=contents,
+                config=config,
+            )
+        )
+
+    def _stream_with_rotation(self, contents: Any, config: Any, on_chunk: Callable[[str], None]) -> str:
+        """
+        Stream ``generate_content_stream`` chunks to *on_chunk* with key rotation.
+
+        Rotation only applies before the first chunk is delivered; a quota error
+        mid-stream propagates because emitted text cannot be taken back.
+        """
+        emitted: list[str] = []
+
+        def _stream() -> str:
+            for chunk in self.client.models.generate_content_stream(
+                model=self.model,
+                contents=contents,
+                config=config,
+            ):
+                text = getattr(chunk, "text", None)
+                if text:
+                    emitted.append(text)
+                    on_chunk(text)
+            return "".join(emitted)
+
+        return self._call_with_rotation(_stream, can_retry=lambda: not emitted)
+
+    def _call_with_rotation(self, call: Callable[[], Any], can_retry: Callable[[], bool] | None = None) -> Any:
         redis_queue = getattr(self, "_redis_queue", None)
         n = len(redis_queue) if redis_queue is not None else len(self._keys)
         if n == 0:
@@ -308,13 +406,9 @@ class LLMClient:
 
         for attempt in range(n):
             try:
-                return self.client.models.generate_content(
-                    model=self.model,
-                    contents=contents,
-                    config=config,
-                )
+                return call()
             except Exception as exc:  # noqa: BLE001
-                if _is_quota_error(exc):
+                if _is_quota_error(exc) and (can_retry is None or can_retry()):
                     last_exc = exc
                     self._advance()
                     # If we've looped all the way back to the key we started
@@ -333,21 +427,22 @@ class LLMClient:
 # JSON extraction helper
 # ---------------------------------------------------------------------------
 
-def _extract_json_payload(text: str) -> dict[str, Any]:
-    try:
-        payload = json.loads(text)
-        if isinstance(payload, dict):
-            return payload
-    except json.JSONDecodeError:
-        pass
+_JSON_DECODER = json.JSONDecoder()
 
-    fenced = re.search(r"```json\s*(\{.*\})\s*```", text, flags=re.DOTALL | re.IGNORECASE)
-    if fenced:
-        return json.loads(fenced.group(1))
 
+def _extract_json_payload(text: str) -> dict[str, Any]:
+    """
+    Return the JSON object embedded in *text* (bare, fenced or in prose).
+
+    ``raw_decode`` parses from the first ``{`` and stops at the end of that
+    object, so no regex is needed. Only that first top-level object is
+    accepted: a malformed object, or another ``}`` after it, is an error.
+    """
     start = text.find("{")
-    end = text.rfind("}")
-    if start >= 0 and end > start:
-        return json.loads(text[start : end + 1])
+    if start >= 0:
+        payload, end = _JSON_DECODER.raw_decode(text, start)
+        if text.find("}", end) >= 0:
+            raise json.JSONDecodeError("Extra data after JSON object.", text, end)
+        return payload
 
     raise json.JSONDecodeError("No JSON object found in response.", text, 0)
@@ -1,14 +1,32 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
-from typing import Any
+import string
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
 
 from coach.agent.llm_client import LLMClient
+from coach.agent.prompts import summary_template_values
 from coach.agent.schemas import Plan, ToolInstruction
-from coach.data.adapters.local_csv import LocalCSVAdapter
+from coach.data.adapters.local_csv import LocalCSVAdapter, PlayerNameTables, PlayerRecord
+from coach.data.stats_builder import build_matchup_params, estimate_influence_weights
 from coach.service import BadmintonCoachService
 
+_STRATEGY_RE = re.compile(r"strategy|adjust|improve|beat|change|optimiz|what should|recommend|tactic")
+_CONSTRAINT_RE = re.compile(r"aggress|safe|error|serve")
+_CONSTRAINT_BY_MARKER = {
+    "aggress": "emphasize aggression",
+    "safe": "control unforced errors",
+    "error": "control unforced errors",
+    "serve": "serve mix considered",
+}
+_CONSTRAINT_ORDER = ("emphasize aggression", "control unforced errors", "serve mix considered")
+_VS_RE = re.compile(r"(.+?)\s+vs\.?\s+(.+)", flags=re.IGNORECASE)
+_BETWEEN_RE = re.compile(r"between\s+(.+?)\s+and\s+(.+)", flags=re.IGNORECASE)
+_TEMPLATE_FORMATTER = string.Formatter()
+
 
 @dataclass(frozen=True)
 class ExecutionResult:
@@ -18,109 +36,139 @@ class ExecutionResult:
     payload: dict[str, Any]
 
 
+_STRATEGY_SEARCH_SPACE: dict[str, Any] = {
+    "serve_mix_A.short": [-0.2, -0.1, -0.05, 0.05, 0.1, 0.2],
+    "rally_style_A.attack": [-0.2, -0.1, -0.05, 0.05, 0.1, 0.2],
+    "l1_bound": 0.3,
+}
+_PREDICTION_TEMPLATE: tuple[tuple[str, dict[str, Any]], ...] = (
+    ("ResolvePlayers", {}),
+    ("LoadStats", {"playerA_id": "$playerA_id", "playerB_id": "$playerB_id", "source": "local"}),
+    (
+        "BuildModel",
+        {
+            "params": "$params",
+            "template_name": "badminton_rally_template.pcsp",
+            "out_path": "$run_dir/matchup.pcsp",
+        },
+    ),
+    ("RunPAT", {"pcsp_path": "$pcsp_path", "pat_path": None, "timeout_s": 60}),
+    ("SummarizeResults", {"pat_outputs": "$pat_outputs"}),
+)
+_STRATEGY_TEMPLATE: tuple[tuple[str, dict[str, Any]], ...] = (
+    ("ResolvePlayers", {}),
+    ("LoadStats", {"playerA_id": "$playerA_id", "playerB_id": "$playerB_id", "source": "local"}),
+    ("BatchSensitivity", {"base_params": "$params", "objective": "maximize_A_win"}),
+    ("SummarizeResults", {"pat_outputs": "$pat_outputs"}),
+)
+
+
+def _enabled_or_none(llm_client: LLMClient | None) -> LLMClient | None:
+    """Drop a disabled client up front so hot paths only need an ``is None`` check."""
+    return llm_client if llm_client is not None and llm_client.enabled else None
+
+
+class _NameMatcher:
+    """Single-pass matcher for a fixed set of lowercase name keys."""
+
+    def __init__(self, entries: list[tuple[str, str]]) -> None:
+        self._names_by_key: dict[str, list[str]] = {}
+        for key, name in entries:
+            if key:
+                self._names_by_key.setdefault(key, []).append(name)
+        keys = sorted(self._names_by_key, key=len, reverse=True)
+        # Zero-width lookahead so overlapping names (e.g. a surname inside a full name) still match.
+        self._pattern = re.compile("(?=(" + "|".join(re.escape(key) for key in keys) + "))") if keys else None
+
+    def first_two(self, text: str) -> list[str]:
+        """Return the first two names in order of their first occurrence in *text*."""
+        if self._pattern is None:
+            return []
+        hits: list[str] = []
+        seen_keys: set[str] = set()
+        for match in self._pattern.finditer(text):
+            key = match.group(1)
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+            hits.extend(self._names_by_key[key])
+            if len(hits) >= 2:
+                break
+        return hits[:2]
+
+
 class Planner:
     """Creates tool-call plans from user queries (LLM first, heuristic fallback)."""
 
     def __init__(self, adapter: LocalCSVAdapter, llm_client: LLMClient | None = None) -> None:
         self.adapter = adapter
-        self.llm_client = llm_client
+        self.llm_client = _enabled_or_none(llm_client)
+        self._name_matchers: tuple[PlayerNameTables, _NameMatcher, _NameMatcher] | None = None
 
     def create_plan(self, user_query: str, mode: str = "mock", window: int = 30, budget: int = 60) -> Plan:
-        if self.llm_client is not None:
-            llm_plan = self.llm_client.plan(user_query)
-            if llm_plan is not None:
-                try:
-                    return Plan.model_validate(llm_plan)
-                except Exception:
-                    pass
-
+        llm_plan = self.llm_plan(user_query)
+        if llm_plan is not None:
+            return llm_plan
+        return self.heuristic_plan(user_query, mode=mode, window=window, budget=budget)
+
+    def llm_plan(self, user_query: str) -> Plan | None:
+        """Ask the LLM for a plan; ``None`` when unavailable or the output does not validate."""
+        if self.llm_client is None:
+            return None
+        raw_plan = self.llm_client.plan(user_query)
+        if raw_plan is None:
+            return None
+        try:
+            return Plan.model_validate(raw_plan)
+        except Exception:
+            return None
+
+    def llm_plan_and_template(self, user_query: str) -> tuple[Plan | None, str | None]:
+        """Ask the LLM for a plan plus a summary template in one call; ``(None, None)`` when unusable."""
+        if self.llm_client is None:
+            return None, None
+        raw = self.llm_client.plan_and_prepare(user_query)
+        if not isinstance(raw, dict):
+            return None, None
+        try:
+            plan = Plan.model_validate(raw.get("plan"))
+        except Exception:
+            return None, None
+        template = raw.get("summary_template")
+        return plan, template if isinstance(template, str) and template.strip() else None
+
+    def heuristic_plan(self, user_query: str, mode: str = "mock", window: int = 30, budget: int = 60) -> Plan:
         task_type = self._detect_task_type(user_query)
         players = self._extract_players(user_query)
         constraints = self._extract_constraints(user_query)
 
         if task_type == "prediction":
-            tool_calls = [
-                ToolInstruction(tool="ResolvePlayers", arguments={"names": players}),
-                ToolInstruction(
-                    tool="LoadStats",
-                    arguments={
-                        "playerA_id": "$playerA_id",
-                        "playerB_id": "$playerB_id",
-                        "window": window,
-                        "source": "local",
-                    },
-                ),
-                ToolInstruction(
-                    tool="BuildModel",
-                    arguments={
-                        "params": "$params",
-                        "template_name": "badminton_rally_template.pcsp",
-                        "out_path": "$run_dir/matchup.pcsp",
-                    },
-                ),
-                ToolInstruction(
-                    tool="RunPAT",
-                    arguments={
-                        "pcsp_path": "$pcsp_path",
-                        "pat_path": None,
-                        "mode": mode,
-                        "timeout_s": 60,
-                    },
-                ),
-                ToolInstruction(
-                    tool="SummarizeResults",
-                    arguments={
-                        "pat_outputs": "$pat_outputs",
-                        "question": user_query,
-                        "constraints": constraints,
-                    },
-                ),
-            ]
-            return Plan(
-                task_type="prediction",
-                analysis_type="reachability",
-                players=players,
-                constraints=constraints,
-                tool_calls=tool_calls,
-            )
+            varying: dict[str, dict[str, Any]] = {
+                "ResolvePlayers": {"names": players},
+                "LoadStats": {"window": window},
+                "RunPAT": {"mode": mode},
+                "SummarizeResults": {"question": user_query, "constraints": constraints},
+            }
+            template = _PREDICTION_TEMPLATE
+            analysis_type = "reachability"
+        else:
+            varying = {
+                "ResolvePlayers": {"names": players},
+                "LoadStats": {"window": window},
+                "BatchSensitivity": {"search_space": deepcopy(_STRATEGY_SEARCH_SPACE), "budget": budget},
+                "SummarizeResults": {"question": user_query, "constraints": constraints},
+            }
+            template = _STRATEGY_TEMPLATE
+            analysis_type = "sensitivity"
 
+        # Heuristic plans are built from trusted templates, so skip pydantic validation.
         tool_calls = [
-            ToolInstruction(tool="ResolvePlayers", arguments={"names": players}),
-            ToolInstruction(
-                tool="LoadStats",
-                arguments={
-                    "playerA_id": "$playerA_id",
-                    "playerB_id": "$playerB_id",
-                    "window": window,
-                    "source": "local",
-                },
-            ),
-            ToolInstruction(
-                tool="BatchSensitivity",
-                arguments={
-                    "base_params": "$params",
-                    "search_space": {
-                        "serve_mix_A.short": [-0.2, -0.1, -0.05, 0.05, 0.1, 0.2],
-                        "rally_style_A.attack": [-0.2, -0.1, -0.05, 0.05, 0.1, 0.2],
-                        "l1_bound": 0.3,
-                    },
-                    "budget": budget,
-                    "objective": "maximize_A_win",
-                },
-            ),
-            ToolInstruction(
-                tool="SummarizeResults",
-                arguments={
-                    "pat_outputs": "$pat_outputs",
-                    "question": user_query,
-                    "constraints": constraints,
-                },
-            ),
+            ToolInstruction.model_construct(tool=tool, arguments={**static_args, **varying.get(tool, {})})
+            for tool, static_args in template
         ]
-
-        return Plan(
-            task_type="strategy",
-            analysis_type="sensitivity",
+        return Plan.model_construct(
+            task_type=task_type,
+            analysis_type=analysis_type,
             players=players,
             constraints=constraints,
             tool_calls=tool_calls,
@@ -128,46 +176,29 @@ class Planner:
 
     @staticmethod
     def _detect_task_type(query: str) -> str:
-        q = query.lower()
-        strategy_markers = [
-            "strategy",
-            "adjust",
-            "improve",
-            "beat",
-            "change",
-            "optimiz",
-            "what should",
-            "recommend",
-            "tactic",
-        ]
-        return "strategy" if any(marker in q for marker in strategy_markers) else "prediction"
+        return "strategy" if _STRATEGY_RE.search(query.lower()) else "prediction"
+
+    def _get_name_matchers(self) -> tuple[_NameMatcher, _NameMatcher]:
+        tables = self.adapter.player_name_tables
+        if self._name_matchers is None or self._name_matchers[0] is not tables:
+            full = _NameMatcher(list(zip(tables.names_lower, tables.canonical_names)))
+            surnames = _NameMatcher(list(zip(tables.surnames_lower, tables.canonical_names)))
+            self._name_matchers = (tables, full, surnames)
+        return self._name_matchers[1], self._name_matchers[2]
 
     def _extract_players(self, query: str) -> list[str]:
-        names = self.adapter.players_df["name"].tolist()
         lower = query.lower()
+        full_matcher, surname_matcher = self._get_name_matchers()
 
-        hits: list[tuple[int, str]] = []
-        for name in names:
-            idx = lower.find(name.lower())
-            if idx >= 0:
-                hits.append((idx, name))
-
+        hits = full_matcher.first_two(lower)
         if len(hits) >= 2:
-            hits.sort(key=lambda item: item[0])
-            return [hits[0][1], hits[1][1]]
-
-        surname_hits: list[tuple[int, str]] = []
-        for name in names:
-            surname = name.split()[-1].lower()
-            idx = lower.find(surname)
-            if idx >= 0:
-                surname_hits.append((idx, name))
+            return hits
 
+        surname_hits = surname_matcher.first_two(lower)
         if len(surname_hits) >= 2:
-            surname_hits.sort(key=lambda item: item[0])
-            return [surname_hits[0][1], surname_hits[1][1]]
+            return surname_hits
 
-        vs_match = re.search(r"(.+?)\s+vs\.?\s+(.+)", query, flags=re.IGNORECASE)
+        vs_match = _VS_RE.search(query)
         if vs_match:
             left = vs_match.group(1).strip(" ?!.,")
             right = vs_match.group(2).strip(" ?!.,")
@@ -178,7 +209,7 @@ class Planner:
             except Exception:
                 pass
 
-        between_match = re.search(r"between\s+(.+?)\s+and\s+(.+)", query, flags=re.IGNORECASE)
+        between_match = _BETWEEN_RE.search(query)
         if between_match:
             left = between_match.group(1).strip(" ?!.,")
             right = between_match.group(2).strip(" ?!.,")
@@ -196,15 +227,8 @@ class Planner:
 
     @staticmethod
     def _extract_constraints(query: str) -> list[str]:
-        q = query.lower()
-        constraints: list[str] = []
-        if "aggress" in q:
-            constraints.append("emphasize aggression")
-        if "safe" in q or "error" in q:
-            constraints.append("control unforced errors")
-        if "serve" in q:
-            constraints.append("serve mix considered")
-        return constraints
+        found = {_CONSTRAINT_BY_MARKER[m.group(0)] for m in _CONSTRAINT_RE.finditer(query.lower())}
+        return [constraint for constraint in _CONSTRAINT_ORDER if constraint in found]
 
 
 class AgentExecutor:
@@ -218,11 +242,76 @@ class AgentExecutor:
     ) -> None:
         self.service = service or BadmintonCoachService()
         self.adapter = self.service.adapter
-        self.llm_client = llm_client
+        self.llm_client = _enabled_or_none(llm_client)
         self.planner = planner or Planner(adapter=self.adapter, llm_client=llm_client)
+        self._task_handlers = {
+            "prediction": self._execute_prediction,
+            "strategy": self._execute_strategy,
+        }
+
+    def run(
+        self,
+        user_query: str,
+        mode: str = "mock",
+        window: int = 30,
+        budget: int = 60,
+        on_answer_chunk: Callable[[str], None] | None = None,
+    ) -> ExecutionResult:
+        plan, template, tool_trace, payload = self._plan_and_execute(
+            user_query, mode=mode, window=window, budget=budget
+        )
+        # A template drafted with the plan saves the summarize round-trip; fall back when it does not render.
+        answer = _render_summary_template(template, payload) if template is not None else None
+        if answer is None:
+            answer = self._summarize(user_query, payload, on_chunk=on_answer_chunk)
+        elif on_answer_chunk is not None:
+            on_answer_chunk(answer)
+        return ExecutionResult(plan=plan, tool_trace=tool_trace, answer=answer, payload=payload)
 
-    def run(self, user_query: str, mode: str = "mock", window: int = 30, budget: int = 60) -> ExecutionResult:
-        plan = self.planner.create_plan(user_query, mode=mode, window=window, budget=budget)
+    def _plan_and_execute(
+        self, user_query: str, *, mode: str, window: int, budget: int
+    ) -> tuple[Plan, str | None, list[dict[str, Any]], dict[str, Any]]:
+        if self.llm_client is None:
+            plan = self.planner.create_plan(user_query, mode=mode, window=window, budget=budget)
+            return (plan, None, *self._execute(plan, mode=mode, window=window, budget=budget))
+
+        try:
+            heuristic = self.planner.heuristic_plan(user_query, mode=mode, window=window, budget=budget)
+        except ValueError:
+            heuristic = None
+
+        # The LLM planning call is a network round-trip that does not depend on local stats, so
+        # warm the adapter caches the run will need while it is in flight. Only side-effect-free
+        # work runs early: PAT calls and run directories wait for the final plan.
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            llm_future = pool.submit(self.planner.llm_plan_and_template, user_query)
+            self._warm_up(heuristic, window=window)
+            llm_plan, template = llm_future.result()
+
+        if llm_plan is None:
+            if heuristic is None:
+                # Re-raise the heuristic planner's "could not identify players" error.
+                heuristic = self.planner.heuristic_plan(user_query, mode=mode, window=window, budget=budget)
+            plan = heuristic
+        else:
+            plan = llm_plan
+        return (plan, template, *self._execute(plan, mode=mode, window=window, budget=budget))
+
+    def _warm_up(self, heuristic: Plan | None, *, window: int) -> None:
+        """Fit the influence weights and, for the heuristic players, load their matchup stats."""
+        estimate_influence_weights(self.adapter)
+        if heuristic is None:
+            return
+        player_a, player_b = heuristic.players
+        try:
+            build_matchup_params(self.adapter, player_a, player_b, window=window)
+        except ValueError:
+            # The final plan may name other players; its own run reports any real problem.
+            pass
+
+    def _execute(
+        self, plan: Plan, *, mode: str, window: int, budget: int
+    ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
         player_a, player_b = plan.players
 
         tool_trace: list[dict[str, Any]] = []
@@ -241,46 +330,67 @@ class AgentExecutor:
             }
         )
 
-        if plan.task_type == "prediction":
-            prediction = self.service.predict(
-                player_a=a_resolved.player_id,
-                player_b=b_resolved.player_id,
-                window=window,
-                mode=mode,
-            )
+        handler = self._task_handlers[plan.task_type]
+        payload = handler(a_resolved, b_resolved, tool_trace, mode=mode, window=window, budget=budget)
+        return tool_trace, payload
 
-            tool_trace.append(
-                {
-                    "tool": "LoadStats",
-                    "output": {
-                        "playerA": prediction.stats.player_a_stats,
-                        "playerB": prediction.stats.player_b_stats,
-                        "head_to_head": prediction.stats.head_to_head,
-                    },
-                }
-            )
-            tool_trace.append(
-                {
-                    "tool": "BuildModel",
-                    "output": {
-                        "pcsp_path": str(prediction.model.matchup_pcsp_path),
-                        "params_json": str(prediction.model.params_json_path),
-                    },
-                }
-            )
-            tool_trace.append({"tool": "RunPAT", "output": prediction.pat.to_dict()})
-
-            payload = {
-                "task_type": "prediction",
-                "player_a": prediction.player_a,
-                "player_b": prediction.player_b,
-                "probability": prediction.probability,
-                "mode": prediction.mode,
-                "run_dir": str(prediction.run_dir),
+    def _execute_prediction(
+        self,
+        a_resolved: PlayerRecord,
+        b_resolved: PlayerRecord,
+        tool_trace: list[dict[str, Any]],
+        *,
+        mode: str,
+        window: int,
+        budget: int,
+    ) -> dict[str, Any]:
+        prediction = self.service.predict(
+            player_a=a_resolved.player_id,
+            player_b=b_resolved.player_id,
+            window=window,
+            mode=mode,
+        )
+
+        tool_trace.append(
+            {
+                "tool": "LoadStats",
+                "output": {
+                    "playerA": prediction.stats.player_a_stats,
+                    "playerB": prediction.stats.player_b_stats,
+                    "head_to_head": prediction.stats.head_to_head,
+                },
+            }
+        )
+        tool_trace.append(
+            {
+                "tool": "BuildModel",
+                "output": {
+                    "pcsp_path": str(prediction.model.matchup_pcsp_path),
+                    "params_json": str(prediction.model.params_json_path),
+                },
             }
-            answer = self._summarize(user_query, payload)
-            return ExecutionResult(plan=plan, tool_trace=tool_trace, answer=answer, payload=payload)
+        )
+        tool_trace.append({"tool": "RunPAT", "output": prediction.pat.to_dict()})
+
+        return {
+            "task_type": "prediction",
+            "player_a": prediction.player_a,
+            "player_b": prediction.player_b,
+            "probability": prediction.probability,
+            "mode": prediction.mode,
+            "run_dir": str(prediction.run_dir),
+        }
 
+    def _execute_strategy(
+        self,
+        a_resolved: PlayerRecord,
+        b_resolved: PlayerRecord,
+        tool_trace: list[dict[str, Any]],
+        *,
+        mode: str,
+        window: int,
+        budget: int,
+    ) -> dict[str, Any]:
         strategy = self.service.strategy(
             player_a=a_resolved.player_id,
             player_b=b_resolved.player_id,
@@ -295,29 +405,35 @@ class AgentExecutor:
                     "baseline_probability": strategy.baseline_probability,
                     "improved_probability": strategy.improved_probability,
                     "delta": strategy.delta,
-                    "best_candidate": strategy.best_candidate.__dict__,
-                    "top_alternatives": [cand.__dict__ for cand in strategy.top_alternatives],
+                    "best_candidate": asdict(strategy.best_candidate),
+                    "top_alternatives": [asdict(cand) for cand in strategy.top_alternatives],
                 },
             }
         )
 
-        payload = {
+        return {
             "task_type": "strategy",
             "player_a": strategy.player_a,
             "player_b": strategy.player_b,
             "baseline_probability": strategy.baseline_probability,
             "improved_probability": strategy.improved_probability,
             "delta": strategy.delta,
-            "best_candidate": strategy.best_candidate.__dict__,
+            "best_candidate": asdict(strategy.best_candidate),
             "mode": strategy.mode,
             "run_dir": str(strategy.run_dir),
         }
-        answer = self._summarize(user_query, payload)
-        return ExecutionResult(plan=plan, tool_trace=tool_trace, answer=answer, payload=payload)
 
-    def _summarize(self, question: str, payload: dict[str, Any]) -> str:
+    def _summarize(
+        self,
+        question: str,
+        payload: dict[str, Any],
+        on_chunk: Callable[[str], None] | None = None,
+    ) -> str:
         if self.llm_client is not None:
-            llm_text = self.llm_client.summarize(question, payload)
+            if on_chunk is None:
+                llm_text = self.llm_client.summarize(question, payload)
+            else:
+                llm_text = self.llm_client.summarize(question, payload, on_chunk=on_chunk)
             if llm_text:
                 return llm_text
 
@@ -340,3 +456,16 @@ class AgentExecutor:
             f"error profile {best.get('error_profile_delta', 0.0):+.1%}, "
             f"and rally tolerance {best.get('rally_tolerance_delta', 0.0):+.1%}."
         )
+
+
+def _render_summary_template(template: str, payload: dict[str, Any]) -> str | None:
+    """Fill a prepared summary template from *payload*; ``None`` unless every placeholder is known."""
+    values = summary_template_values(payload)
+    try:
+        names = [name for _, name, _, _ in _TEMPLATE_FORMATTER.parse(template) if name is not None]
+        # Plain names only (no positional "{}", attribute or index lookups), and at least one of them.
+        if not names or any(name not in values for name in names):
+            return None
+        return template.format_map(values).strip() or None
+    except (ValueError, TypeError, KeyError, IndexError):
+        return None
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import json
+
 SYSTEM_PROMPT = """You are the AI Badminton Coach planner.
 You must never guess probabilities. You must use tool outputs.
 Rules:
@@ -17,10 +19,46 @@ def planner_prompt(user_query: str) -> str:
     )
 
 
+# Placeholders a prepared summary template may use, per task type. Strategy templates can also
+# use ``best_<field>`` for each field of the best candidate (e.g. ``best_attack_delta``).
+SUMMARY_TEMPLATE_FIELDS: dict[str, tuple[str, ...]] = {
+    "prediction": ("player_a", "player_b", "probability", "mode"),
+    "strategy": ("player_a", "player_b", "baseline_probability", "improved_probability", "delta", "mode"),
+}
+
+
+def plan_and_prepare_prompt(user_query: str) -> str:
+    fields = "; ".join(f"{task}: {', '.join(names)}" for task, names in SUMMARY_TEMPLATE_FIELDS.items())
+    return (
+        "Produce a JSON object with keys plan and summary_template. "
+        "plan is a JSON plan with keys: task_type, analysis_type, players, constraints, tool_calls. "
+        "summary_template is concise badminton coaching advice for that plan's computed outputs, written "
+        "as a Python format string: every number must be a {placeholder} (format specs such as "
+        "{probability:.1%} are allowed), never a literal value. "
+        f"Placeholders by task_type: {fields}; strategy also allows best_<adjustment field>, "
+        "e.g. {best_attack_delta:+.1%}. "
+        f"User query: {user_query}"
+    )
+
+
+def summary_template_values(computed_payload: dict) -> dict:
+    """The values a prepared summary template is rendered with, keyed by placeholder name."""
+    names = SUMMARY_TEMPLATE_FIELDS.get(computed_payload.get("task_type"), ())
+    values = {name: computed_payload[name] for name in names if name in computed_payload}
+    for name, value in (computed_payload.get("best_candidate") or {}).items():
+        values[f"best_{name}"] = value
+    return values
+
+
+# Local-only fields that carry no information for the summarizer.
+_SUMMARY_EXCLUDED_KEYS = frozenset({"run_dir"})
+
+
 def summary_prompt(question: str, computed_payload: dict) -> str:
+    payload = {k: v for k, v in computed_payload.items() if k not in _SUMMARY_EXCLUDED_KEYS}
     return (
         "Use only computed outputs. Do not invent numbers. "
         "Provide concise badminton coaching advice with quantified probabilities/deltas.\n"
         f"Question: {question}\n"
-        f"Computed payload: {computed_payload}"
+        f"Computed payload: {json.dumps(payload, separators=(',', ':'), default=str)}"
     )
@@ -6,13 +6,13 @@ from pydantic import BaseModel, ConfigDict, Field
 
 
 class ResolvePlayers(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     names: list[str] = Field(..., min_length=2, max_length=2)
 
 
 class LoadStats(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     playerA_id: str
     playerB_id: str
@@ -21,7 +21,7 @@ class LoadStats(BaseModel):
 
 
 class BuildModel(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     params: dict[str, Any]
     template_name: str = "badminton_rally_template.pcsp"
@@ -29,7 +29,7 @@ class BuildModel(BaseModel):
 
 
 class RunPAT(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     pcsp_path: str
     pat_path: str | None = None
@@ -38,7 +38,7 @@ class RunPAT(BaseModel):
 
 
 class BatchSensitivity(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     base_params: dict[str, Any]
     search_space: dict[str, Any]
@@ -47,7 +47,7 @@ class BatchSensitivity(BaseModel):
 
 
 class SummarizeResults(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     pat_outputs: list[dict[str, Any]]
     question: str
@@ -65,14 +65,14 @@ ToolName = Literal[
 
 
 class ToolInstruction(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     tool: ToolName
     arguments: dict[str, Any]
 
 
 class Plan(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     task_type: Literal["prediction", "strategy"]
     analysis_type: Literal["reachability", "sensitivity"]
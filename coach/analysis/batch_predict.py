@@ -2,10 +2,37 @@ from __future__ import annotations
 
 import argparse
 import csv
+from contextlib import nullcontext
 from pathlib import Path
+from typing import NamedTuple
 
+from coach.analysis.pairs import default_pairs
+from coach.analysis.result_cache import cache_key, get_or_compute
+from coach.analysis.run_archive import RunArchive
+from coach.config import CoachConfig
 from coach.data.adapters.local_csv import LocalCSVAdapter
-from coach.service import BadmintonCoachService
+from coach.service import BadmintonCoachService, PredictionResult
+from coach.utils import iter_ordered_map
+
+
+class PredictionRow(NamedTuple):
+    run_id: str
+    player_a: str
+    player_b: str
+    probability_a_win: float
+    mode: str
+    run_dir: str
+
+
+def prediction_row(result: PredictionResult) -> PredictionRow:
+    return PredictionRow(
+        result.run_id,
+        result.player_a,
+        result.player_b,
+        round(result.probability, 6),
+        result.mode,
+        str(result.run_dir),
+    )
 
 
 def load_matchups(path: str | Path) -> list[tuple[str, str]]:
@@ -18,14 +45,7 @@ def load_matchups(path: str | Path) -> list[tuple[str, str]]:
 
 
 def default_matchups(adapter: LocalCSVAdapter, limit: int = 10) -> list[tuple[str, str]]:
-    names = adapter.players_df["name"].tolist()
-    pairs: list[tuple[str, str]] = []
-    for i, a in enumerate(names):
-        for b in names[i + 1 :]:
-            pairs.append((a, b))
-            if len(pairs) >= limit:
-                return pairs
-    return pairs
+    return default_pairs(adapter, limit)
 
 
 def run_batch_predictions(
@@ -34,35 +54,41 @@ def run_batch_predictions(
     window: int = 30,
     limit: int = 10,
     matchups_file: str | Path | None = None,
+    workers: int | None = None,
+    service: BadmintonCoachService | None = None,
+    use_cache: bool = False,
+    archive_runs: bool = False,
 ) -> Path:
-    adapter = LocalCSVAdapter()
-    service = BadmintonCoachService(adapter=adapter)
+    if service is None:
+        service = BadmintonCoachService(adapter=LocalCSVAdapter(), config=CoachConfig.from_env())
+    config = service.config
+    adapter = service.adapter
 
     if matchups_file:
         matchups = load_matchups(matchups_file)
     else:
         matchups = default_matchups(adapter=adapter, limit=limit)
 
-    rows: list[dict[str, str | float]] = []
-    for a, b in matchups:
-        result = service.predict(player_a=a, player_b=b, window=window, mode=mode)
-        rows.append(
-            {
-                "run_id": result.run_id,
-                "player_a": result.player_a,
-                "player_b": result.player_b,
-                "probability_a_win": round(result.probability, 6),
-                "mode": result.mode,
-                "run_dir": str(result.run_dir),
-            }
-        )
+    # Real-mode predictions wait on PAT subprocesses, so run them on a thread pool by default.
+    max_workers = workers if workers is not None else (config.pat_max_workers if mode == "real" else 1)
+    cache_dir = service.runs_root / ".cache" if use_cache else None
+
+    def _cached_row(pair: tuple[str, str]) -> PredictionRow:
+        key = cache_key(service, "predict", player_a=pair[0], player_b=pair[1], window=window, mode=mode)
+        return get_or_compute(cache_dir, key, lambda: _compute_row(pair), PredictionRow)
+
+    def _compute_row(pair: tuple[str, str]) -> PredictionRow:
+        row = prediction_row(service.predict(player_a=pair[0], player_b=pair[1], window=window, mode=mode))
+        return archive.archive_row(row) if archive is not None else row
 
     output_path = Path(output_csv)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
-        writer.writeheader()
-        writer.writerows(rows)
+    # With archive_runs, each finished run directory is folded into one append-only tar.
+    archive_ctx = RunArchive(output_path.with_suffix(".runs.tar")) if archive_runs else nullcontext()
+    with output_path.open("w", newline="", encoding="utf-8") as f, archive_ctx as archive:
+        writer = csv.writer(f)
+        writer.writerow(PredictionRow._fields)
+        writer.writerows(iter_ordered_map(_cached_row, matchups, max_workers=max_workers))
     return output_path
 
 
@@ -73,6 +99,13 @@ def main() -> None:
     parser.add_argument("--window", type=int, default=30)
     parser.add_argument("--limit", type=int, default=10)
     parser.add_argument("--matchups-file", default=None)
+    parser.add_argument("--workers", type=int, default=None, help="Parallel predictions (default: auto)")
+    parser.add_argument("--cache", action="store_true", help="Reuse rows cached under runs/.cache from earlier batches")
+    parser.add_argument(
+        "--archive-runs",
+        action="store_true",
+        help="Pack each run directory into <output>.runs.tar instead of leaving it under runs/",
+    )
     args = parser.parse_args()
 
     out = run_batch_predictions(
@@ -81,6 +114,9 @@ def main() -> None:
         window=args.window,
         limit=args.limit,
         matchups_file=args.matchups_file,
+        workers=args.workers,
+        use_cache=args.cache,
+        archive_runs=args.archive_runs,
     )
     print(f"Saved {out}")
 
@@ -2,21 +2,67 @@ from __future__ import annotations
 
 import argparse
 import csv
+from contextlib import nullcontext
+from operator import attrgetter
 from pathlib import Path
+from typing import NamedTuple
 
+from coach.analysis.pairs import default_pairs
+from coach.analysis.result_cache import cache_key, get_or_compute
+from coach.analysis.run_archive import RunArchive
+from coach.config import CoachConfig
 from coach.data.adapters.local_csv import LocalCSVAdapter
-from coach.service import BadmintonCoachService
+from coach.service import BadmintonCoachService, StrategyResult
+from coach.utils import iter_ordered_map
+
+
+class StrategyRow(NamedTuple):
+    run_id: str
+    player_a: str
+    player_b: str
+    baseline_probability: float
+    improved_probability: float
+    delta: float
+    best_serve_short_delta: float
+    best_attack_delta: float
+    best_unforced_error_delta: float
+    best_return_pressure_delta: float
+    best_clutch_delta: float
+    best_serve_effectiveness_delta: float
+    best_error_profile_delta: float
+    best_rally_tolerance_delta: float
+    mode: str
+    run_dir: str
+
+
+_BEST_DELTAS = attrgetter(
+    "serve_short_delta",
+    "attack_delta",
+    "unforced_error_delta",
+    "return_pressure_delta",
+    "clutch_delta",
+    "serve_effectiveness_delta",
+    "error_profile_delta",
+    "rally_tolerance_delta",
+)
+
+
+def strategy_row(result: StrategyResult) -> StrategyRow:
+    return StrategyRow(
+        result.run_id,
+        result.player_a,
+        result.player_b,
+        round(result.baseline_probability, 6),
+        round(result.improved_probability, 6),
+        round(result.delta, 6),
+        *[round(value, 6) for value in _BEST_DELTAS(result.best_candidate)],
+        result.mode,
+        str(result.run_dir),
+    )
 
 
 def default_strategy_queries(adapter: LocalCSVAdapter, limit: int = 5) -> list[tuple[str, str]]:
-    names = adapter.players_df["name"].tolist()
-    pairs: list[tuple[str, str]] = []
-    for i, a in enumerate(names):
-        for b in names[i + 1 :]:
-            pairs.append((a, b))
-            if len(pairs) >= limit:
-                return pairs
-    return pairs
+    return default_pairs(adapter, limit)
 
 
 def run_batch_strategy(
@@ -25,46 +71,37 @@ def run_batch_strategy(
     window: int = 30,
     budget: int = 60,
     limit: int = 5,
+    workers: int | None = None,
+    service: BadmintonCoachService | None = None,
+    use_cache: bool = False,
+    archive_runs: bool = False,
 ) -> Path:
-    adapter = LocalCSVAdapter()
-    service = BadmintonCoachService(adapter=adapter)
-
-    rows: list[dict[str, str | float]] = []
-    for a, b in default_strategy_queries(adapter, limit=limit):
-        result = service.strategy(
-            player_a=a,
-            player_b=b,
-            window=window,
-            mode=mode,
-            budget=budget,
-        )
-        rows.append(
-            {
-                "run_id": result.run_id,
-                "player_a": result.player_a,
-                "player_b": result.player_b,
-                "baseline_probability": round(result.baseline_probability, 6),
-                "improved_probability": round(result.improved_probability, 6),
-                "delta": round(result.delta, 6),
-                "best_serve_short_delta": round(result.best_candidate.serve_short_delta, 6),
-                "best_attack_delta": round(result.best_candidate.attack_delta, 6),
-                "best_unforced_error_delta": round(result.best_candidate.unforced_error_delta, 6),
-                "best_return_pressure_delta": round(result.best_candidate.return_pressure_delta, 6),
-                "best_clutch_delta": round(result.best_candidate.clutch_delta, 6),
-                "best_serve_effectiveness_delta": round(result.best_candidate.serve_effectiveness_delta, 6),
-                "best_error_profile_delta": round(result.best_candidate.error_profile_delta, 6),
-                "best_rally_tolerance_delta": round(result.best_candidate.rally_tolerance_delta, 6),
-                "mode": result.mode,
-                "run_dir": str(result.run_dir),
-            }
-        )
+    if service is None:
+        service = BadmintonCoachService(adapter=LocalCSVAdapter(), config=CoachConfig.from_env())
+    config = service.config
+    adapter = service.adapter
+
+    # Real-mode strategies wait on PAT subprocesses, so run them on a thread pool by default.
+    max_workers = workers if workers is not None else (config.pat_max_workers if mode == "real" else 1)
+    cache_dir = service.runs_root / ".cache" if use_cache else None
+
+    def _cached_row(pair: tuple[str, str]) -> StrategyRow:
+        key = cache_key(service, "strategy", player_a=pair[0], player_b=pair[1], window=window, mode=mode, budget=budget)
+        return get_or_compute(cache_dir, key, lambda: _compute_row(pair), StrategyRow)
 
+    def _compute_row(pair: tuple[str, str]) -> StrategyRow:
+        row = strategy_row(service.strategy(player_a=pair[0], player_b=pair[1], window=window, mode=mode, budget=budget))
+        return archive.archive_row(row) if archive is not None else row
+
+    queries = default_strategy_queries(adapter, limit=limit)
     output_path = Path(output_csv)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
-        writer.writeheader()
-        writer.writerows(rows)
+    # With archive_runs, each finished run directory is folded into one append-only tar.
+    archive_ctx = RunArchive(output_path.with_suffix(".runs.tar")) if archive_runs else nullcontext()
+    with output_path.open("w", newline="", encoding="utf-8") as f, archive_ctx as archive:
+        writer = csv.writer(f)
+        writer.writerow(StrategyRow._fields)
+        writer.writerows(iter_ordered_map(_cached_row, queries, max_workers=max_workers))
     return output_path
 
 
@@ -75,6 +112,13 @@ def main() -> None:
     parser.add_argument("--window", type=int, default=30)
     parser.add_argument("--budget", type=int, default=60)
     parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None, help="Parallel strategy runs (default: auto)")
+    parser.add_argument("--cache", action="store_true", help="Reuse rows cached under runs/.cache from earlier batches")
+    parser.add_argument(
+        "--archive-runs",
+        action="store_true",
+        help="Pack each run directory into <output>.runs.tar instead of leaving it under runs/",
+    )
     args = parser.parse_args()
 
     out = run_batch_strategy(
@@ -83,6 +127,9 @@ def main() -> None:
         window=args.window,
         budget=args.budget,
         limit=args.limit,
+        workers=args.workers,
+        use_cache=args.cache,
+        archive_runs=args.archive_runs,
     )
     print(f"Saved {out}")
 
@@ -1,34 +1,62 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from pathlib import Path
 
 from coach.analysis.batch_predict import run_batch_predictions
 from coach.analysis.batch_strategy import run_batch_strategy
 from coach.analysis.plots import plot_prediction_probabilities, plot_strategy_deltas
+from coach.config import CoachConfig
+from coach.data.adapters.local_csv import LocalCSVAdapter
+from coach.service import BadmintonCoachService
 
 
 def run_experiments(output_dir: str | Path = "runs/experiments", mode: str = "mock") -> dict[str, Path]:
     out_dir = Path(output_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    pred_csv = run_batch_predictions(
-        output_csv=out_dir / "predictions.csv",
-        mode=mode,
-        window=30,
-        limit=10,
+    # Each stage gets its own service and adapter, so their lazily filled caches are never shared
+    # across threads; the parsed CSV frames are still loaded once via the module-level frame cache.
+    config = CoachConfig.from_env()
+    strategy_workers = max(1, config.pat_max_workers // 2)
+    predict_workers = max(1, config.pat_max_workers - strategy_workers)
+    pred_service = BadmintonCoachService(
+        adapter=LocalCSVAdapter(), config=replace(config, pat_max_workers=predict_workers)
     )
-    strat_csv = run_batch_strategy(
-        output_csv=out_dir / "strategy.csv",
-        mode=mode,
-        window=30,
-        budget=60,
-        limit=5,
+    strat_service = BadmintonCoachService(
+        adapter=LocalCSVAdapter(), config=replace(config, pat_max_workers=strategy_workers)
     )
 
+    # The stages split one PAT_MAX_WORKERS budget and mostly wait on PAT, so let them overlap
+    # when the budget allows it. Strategy rows run one at a time; its candidates use its share.
+    with ThreadPoolExecutor(max_workers=min(2, config.pat_max_workers)) as pool:
+        pred_future = pool.submit(
+            run_batch_predictions,
+            output_csv=out_dir / "predictions.csv",
+            mode=mode,
+            window=30,
+            limit=10,
+            service=pred_service,
+        )
+        strat_future = pool.submit(
+            run_batch_strategy,
+            output_csv=out_dir / "strategy.csv",
+            mode=mode,
+            window=30,
+            budget=60,
+            limit=5,
+            workers=1,
+            service=strat_service,
+        )
+        pred_csv = pred_future.result()
+        strat_csv = strat_future.result()
+
     pred_plot = out_dir / "predictions.png"
     strat_plot = out_dir / "strategy_deltas.png"
 
+    # Both plots render on one shared figure, so they run one after the other.
     plot_prediction_probabilities(pred_csv, pred_plot)
     plot_strategy_deltas(strat_csv, strat_plot)
 
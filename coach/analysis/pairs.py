@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from itertools import combinations, islice
+
+from coach.data.adapters.local_csv import LocalCSVAdapter
+
+
+def default_pairs(adapter: LocalCSVAdapter, limit: int) -> list[tuple[str, str]]:
+    """First *limit* roster pairs (a, b) in roster order, each unordered pair once."""
+    names = adapter.players_df["name"].to_numpy(copy=False)
+    return list(islice(combinations(names, 2), max(limit, 0)))
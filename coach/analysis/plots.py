@@ -1,65 +1,90 @@
 from __future__ import annotations
 
-import csv
 import os
+import threading
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-os.environ.setdefault("MPLCONFIGDIR", str((Path.cwd() / "runs" / "mplcache").resolve()))
+import numpy as np
+import pandas as pd
 
-import matplotlib
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
 
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+# Both plots draw on one reusable figure; building a figure is the bulk of a short plot's cost.
+_FIGURE_LOCK = threading.Lock()
+_FIGURE: Figure | None = None
+_AXES: Axes | None = None
+
+
+def _new_figure() -> Figure:
+    # Matplotlib is only imported (and its cache dir configured) once a plot is actually drawn.
+    os.environ.setdefault("MPLCONFIGDIR", str((Path.cwd() / "runs" / "mplcache").resolve()))
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from matplotlib.figure import Figure
+
+    return Figure()
+
+
+def _shared_axes(width: float, height: float) -> tuple[Figure, Axes]:
+    global _FIGURE, _AXES
+    if _FIGURE is None or _AXES is None:
+        _FIGURE = _new_figure()
+        _AXES = _FIGURE.add_subplot()
+    else:
+        _AXES.clear()
+    _FIGURE.set_size_inches(width, height)
+    return _FIGURE, _AXES
+
+
+def _read_labeled_values(csv_path: str | Path, value_column: str) -> tuple[list[str], np.ndarray]:
+    frame = pd.read_csv(
+        csv_path,
+        usecols=["player_a", "player_b", value_column],
+        dtype={"player_a": str, "player_b": str, value_column: "float32"},
+    )
+    labels = (frame["player_a"] + " vs " + frame["player_b"]).tolist()
+    return labels, frame[value_column].to_numpy()
 
 
 def plot_prediction_probabilities(csv_path: str | Path, output_path: str | Path) -> Path:
-    labels: list[str] = []
-    values: list[float] = []
-
-    with Path(csv_path).open("r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            labels.append(f"{row['player_a']} vs {row['player_b']}")
-            values.append(float(row["probability_a_win"]))
-
-    fig, ax = plt.subplots(figsize=(12, 5))
-    ax.bar(range(len(values)), values, color="#2f6f9f")
-    ax.set_ylim(0, 1)
-    ax.set_ylabel("P(A wins)")
-    ax.set_title("Batch Matchup Predictions")
-    ax.set_xticks(range(len(labels)))
-    ax.set_xticklabels(labels, rotation=35, ha="right")
-    fig.tight_layout()
-
-    out = Path(output_path)
-    out.parent.mkdir(parents=True, exist_ok=True)
-    fig.savefig(out, dpi=160)
-    plt.close(fig)
+    labels, values = _read_labeled_values(csv_path, "probability_a_win")
+
+    with _FIGURE_LOCK:
+        fig, ax = _shared_axes(12, 5)
+        ax.bar(range(len(values)), values, color="#2f6f9f")
+        ax.set_ylim(0, 1)
+        ax.set_ylabel("P(A wins)")
+        ax.set_title("Batch Matchup Predictions")
+        ax.set_xticks(range(len(labels)))
+        ax.set_xticklabels(labels, rotation=35, ha="right")
+        fig.tight_layout()
+
+        out = Path(output_path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        fig.savefig(out, dpi=160)
     return out
 
 
 def plot_strategy_deltas(csv_path: str | Path, output_path: str | Path) -> Path:
-    labels: list[str] = []
-    deltas: list[float] = []
-
-    with Path(csv_path).open("r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            labels.append(f"{row['player_a']} vs {row['player_b']}")
-            deltas.append(float(row["delta"]))
-
-    fig, ax = plt.subplots(figsize=(10, 5))
-    colors = ["#1f8a70" if d >= 0 else "#b93a32" for d in deltas]
-    ax.bar(range(len(deltas)), deltas, color=colors)
-    ax.axhline(0.0, color="black", linewidth=1)
-    ax.set_ylabel("Delta P(A wins)")
-    ax.set_title("Strategy Search Improvements")
-    ax.set_xticks(range(len(labels)))
-    ax.set_xticklabels(labels, rotation=30, ha="right")
-    fig.tight_layout()
-
-    out = Path(output_path)
-    out.parent.mkdir(parents=True, exist_ok=True)
-    fig.savefig(out, dpi=160)
-    plt.close(fig)
+    labels, deltas = _read_labeled_values(csv_path, "delta")
+
+    with _FIGURE_LOCK:
+        fig, ax = _shared_axes(10, 5)
+        colors = np.where(deltas >= 0, "#1f8a70", "#b93a32")
+        ax.bar(range(len(deltas)), deltas, color=colors)
+        ax.axhline(0.0, color="black", linewidth=1)
+        ax.set_ylabel("Delta P(A wins)")
+        ax.set_title("Strategy Search Improvements")
+        ax.set_xticks(range(len(labels)))
+        ax.set_xticklabels(labels, rotation=30, ha="right")
+        fig.tight_layout()
+
+        out = Path(output_path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        fig.savefig(out, dpi=160)
     return out
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, TypeVar
+
+from coach.model.builder import template_digest
+from coach.pat.runner import resolve_pat_console_path
+from coach.service import BadmintonCoachService
+from coach.utils import read_json, write_json
+
+_Row = TypeVar("_Row", bound=NamedTuple)
+# Bump when row contents or the computation behind them change in a way the key cannot see.
+ROW_CACHE_FORMAT = 2
+
+
+def _file_fingerprint(path: Path) -> list[Any]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return [str(path), None, None]
+    return [str(path.resolve()), stat.st_mtime_ns, stat.st_size]
+
+
+def _pat_setup(service: BadmintonCoachService) -> list[Any]:
+    # Same resolution run_pat sees, so a changed install or mono setting means a different key.
+    pat_console, use_mono = service.resolve_pat_target()
+    resolved = resolve_pat_console_path(pat_console) if pat_console is not None else None
+    return [_file_fingerprint(resolved) if resolved is not None else None, use_mono]
+
+
+def cache_key(service: BadmintonCoachService, kind: str, **inputs: Any) -> str:
+    """Stable key for a batch row: task inputs plus the data, template and PAT setup they depend on."""
+    adapter = service.adapter
+    material = {
+        "format": ROW_CACHE_FORMAT,
+        "kind": kind,
+        "inputs": inputs,
+        "players": _file_fingerprint(Path(adapter.players_path)),
+        "matches": _file_fingerprint(Path(adapter.matches_path)),
+        "template": [service.template_name, template_digest(service.template_name)],
+        "pat": _pat_setup(service) if inputs.get("mode") == "real" else None,
+    }
+    encoded = json.dumps(material, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def _artifacts_present(row: NamedTuple) -> bool:
+    """Whether the run directory (or ``<tar>#<run_id>`` archive) a cached row points at still exists."""
+    run_dir = getattr(row, "run_dir", None)
+    if run_dir is None or Path(run_dir).exists():
+        return True
+    tar_path, sep, _ = str(run_dir).rpartition("#")
+    return bool(sep) and Path(tar_path).is_file()
+
+
+def get_or_compute(
+    cache_dir: Path | None,
+    key: str,
+    compute: Callable[[], _Row],
+    row_type: type[_Row],
+) -> _Row:
+    """Return the cached row for *key* from *cache_dir*, computing and storing it on a miss.
+
+    A cached row whose run artifacts have since been deleted counts as a miss.
+    """
+    if cache_dir is None:
+        return compute()
+
+    cache_file = cache_dir / f"{key}.json"
+    if cache_file.exists():
+        try:
+            cached = read_json(cache_file)
+            if tuple(cached["columns"]) == row_type._fields:
+                row = row_type._make(cached["values"])
+                if _artifacts_present(row):
+                    return row
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    row = compute()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    write_json(cache_file, {"columns": list(row._fields), "values": list(row)})
+    return row
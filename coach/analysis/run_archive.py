@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import shutil
+import tarfile
+import threading
+from pathlib import Path
+from typing import NamedTuple, TypeVar
+
+_Row = TypeVar("_Row", bound=NamedTuple)
+
+
+class RunArchive:
+    """Append-only tar that absorbs per-run directories produced by a batch."""
+
+    def __init__(self, tar_path: str | Path) -> None:
+        self.tar_path = Path(tar_path)
+        self.tar_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._tar = tarfile.open(self.tar_path, mode="a")
+
+    def add(self, run_dir: str | Path) -> str:
+        """Move *run_dir* into the archive and return its ``<tar>#<run_id>`` reference."""
+        run_dir = Path(run_dir)
+        with self._lock:
+            self._tar.add(run_dir, arcname=run_dir.name)
+        shutil.rmtree(run_dir)
+        return f"{self.tar_path}#{run_dir.name}"
+
+    def archive_row(self, row: _Row) -> _Row:
+        return row._replace(run_dir=self.add(row.run_dir))
+
+    def close(self) -> None:
+        with self._lock:
+            self._tar.close()
+
+    def __enter__(self) -> RunArchive:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
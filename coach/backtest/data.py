@@ -10,7 +10,7 @@ from urllib.request import urlopen
 
 import pandas as pd
 
-from coach.data.adapters.local_csv import LocalCSVAdapter
+from coach.data.adapters.local_csv import MATCHES_CSV_DTYPES, PLAYERS_CSV_DTYPES, LocalCSVAdapter
 from scripts.build_real_data import build_data, validate
 
 _COACHAI_ARCHIVE_URLS = (
@@ -118,9 +118,8 @@ def load_backtest_frames(
     players_path: str | Path,
     matches_path: str | Path,
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
-    players_df = pd.read_csv(players_path)
-    matches_df = pd.read_csv(matches_path)
-    matches_df["date"] = pd.to_datetime(matches_df["date"], utc=False)
+    players_df = pd.read_csv(players_path, dtype=PLAYERS_CSV_DTYPES, engine="c")
+    matches_df = pd.read_csv(matches_path, dtype=MATCHES_CSV_DTYPES, parse_dates=["date"], engine="c")
     return players_df, matches_df
 
 
@@ -190,10 +189,16 @@ class SnapshotCSVAdapter(LocalCSVAdapter):
         self.laplace_alpha = laplace_alpha
         self._players_df = players_df.copy().reset_index(drop=True)
         self._players_lookup_df = None
+        self._player_name_index = None
+        self._player_id_index = None
+        self._player_name_tables = None
+        self._player_records = None
+        self._match_row_index = None
         self._player_params_cache: dict[tuple[str, int, str | None, str], dict[str, Any]] = {}
         self._head_to_head_cache: dict[tuple[str, str, int, str | None], dict[str, Any]] = {}
         self._global_prior_cache: dict[str | None, dict[str, Any]] = {}
         self._influence_weights_cache = None
+        self._influence_weights_source = None
         self.snapshot_cutoff = pd.Timestamp(cutoff)
         self.timestamp_column = timestamp_column if timestamp_column in matches_df.columns else None
 
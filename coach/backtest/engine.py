@@ -33,10 +33,10 @@ from coach.data.stats_builder import build_matchup_params
 from coach.model.builder import build_matchup_model
 from coach.model.params import MatchupParams
 from coach.pat.mock_pat import mock_probability
-from coach.pat.parser import parse_probability, read_pat_output
+from coach.pat.parser import parse_probability_file
 from coach.pat.runner import run_pat
 from coach.runs import new_run_dir
-from coach.utils import write_json
+from coach.utils import iter_ordered_map, write_json
 
 
 @dataclass(frozen=True)
@@ -52,6 +52,7 @@ class BacktestConfig:
     end_date: str | None = None
     limit: int | None = None
     calibration_bins: int = 10
+    workers: int | None = None
 
 
 @dataclass(frozen=True)
@@ -137,6 +138,7 @@ class TimeMachineBacktester:
             "recent_form": RollingPlattCalibrator(),
         }
 
+        jobs: list[tuple[Any, MatchupParams | None, Any, str | None]] = []
         for row in prepared.itertuples(index=False):
             cutoff_key = str(row.cutoff_key)
             snapshot_adapter = self._get_snapshot_adapter(
@@ -153,17 +155,29 @@ class TimeMachineBacktester:
                     allow_cold_start=True,
                 )
             except ValueError as exc:
-                skipped_rows.append(self._build_skipped_row(row=row, reason=str(exc)))
+                jobs.append((row, None, None, str(exc)))
                 continue
+            jobs.append((row, params, stats, None))
 
+        def predict(job: tuple[Any, MatchupParams | None, Any, str | None]) -> dict[str, Any] | Exception | None:
+            row, params, _, _ = job
+            if params is None:
+                return None
             try:
-                pcsp_prediction = self._predict_match(
-                    match_id=str(row.match_id),
-                    params=params,
-                    run_dir=run_dir,
-                )
+                return self._predict_match(match_id=str(row.match_id), params=params, run_dir=run_dir)
             except Exception as exc:  # noqa: BLE001
-                skipped_rows.append(self._build_skipped_row(row=row, reason=str(exc)))
+                return exc
+
+        # PCSP predictions depend only on each match's snapshot params, so real PAT runs can overlap;
+        # the online models below still see the matches strictly in chronological order.
+        workers = self.config.workers or (self.coach_config.pat_max_workers if self.config.mode == "real" else 1)
+        predictions = iter_ordered_map(predict, jobs, max_workers=workers)
+        for (row, params, stats, skip_reason), pcsp_prediction in zip(jobs, predictions):
+            if skip_reason is not None:
+                skipped_rows.append(self._build_skipped_row(row=row, reason=skip_reason))
+                continue
+            if isinstance(pcsp_prediction, Exception):
+                skipped_rows.append(self._build_skipped_row(row=row, reason=str(pcsp_prediction)))
                 continue
 
             actual_a_win = int(row.actual_a_win)
@@ -325,11 +339,12 @@ class TimeMachineBacktester:
                     if self.config.pat_path
                     else self.coach_config.pat_console_path
                 ),
+                write_summary=artifact_dir_path is not None,
             )
 
             probability = result.get("probability")
             if probability is None and out_path.exists():
-                probability = parse_probability(read_pat_output(out_path))
+                probability = parse_probability_file(out_path)
             if probability is None:
                 raise RuntimeError("PAT execution did not produce a probability.")
 
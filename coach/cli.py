@@ -5,19 +5,23 @@ import datetime as dt
 import json
 import shutil
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from coach.agent.llm_client import LLMClient
-from coach.agent.planner import AgentExecutor
 from coach.config import CoachConfig
-from coach.data.adapters.local_csv import LocalCSVAdapter
-from coach.pat.parser import parse_probability, read_pat_output
-from coach.pat.runner import run_pat
 from coach.runs import new_run_dir
-from coach.service import BadmintonCoachService
 from coach.utils import write_json
 
+if TYPE_CHECKING:
+    from coach.service import BadmintonCoachService
+
+# Heavy modules (pandas, numpy, the LLM SDK) are imported inside the commands that need them,
+# so `--help` and argument errors stay fast.
+
 
 def _build_service() -> BadmintonCoachService:
+    from coach.data.adapters.local_csv import LocalCSVAdapter
+    from coach.service import BadmintonCoachService
+
     config = CoachConfig.from_env()
     adapter = LocalCSVAdapter()
     return BadmintonCoachService(adapter=adapter, runs_root=config.runs_dir, config=config)
@@ -90,6 +94,9 @@ def command_strategy(args: argparse.Namespace) -> None:
 
 
 def command_pat_run(args: argparse.Namespace) -> None:
+    from coach.pat.parser import parse_probability_file
+    from coach.pat.runner import run_pat
+
     config = CoachConfig.from_env()
 
     pcsp_src = Path(args.pcsp).expanduser().resolve()
@@ -118,6 +125,7 @@ def command_pat_run(args: argparse.Namespace) -> None:
         pat_console_path=pat_console_path,
         timeout_s=timeout_s,
         use_mono=use_mono,
+        write_summary=False,
     )
 
     if not bool(result.get("ok", False)):
@@ -143,7 +151,7 @@ def command_pat_run(args: argparse.Namespace) -> None:
     probability: float | None = None
     parse_error: str | None = None
     try:
-        probability = parse_probability(read_pat_output(out_path))
+        probability = parse_probability_file(out_path)
     except Exception as exc:
         parse_error = str(exc)
 
@@ -171,6 +179,9 @@ def command_pat_run(args: argparse.Namespace) -> None:
 
 
 def command_chat(args: argparse.Namespace) -> None:
+    from coach.agent.llm_client import LLMClient
+    from coach.agent.planner import AgentExecutor
+
     llm_client = LLMClient(model=args.model)
     service = _build_service()
     executor = AgentExecutor(service=service, llm_client=llm_client)
@@ -188,12 +199,33 @@ def command_chat(args: argparse.Namespace) -> None:
         if query.lower() in {"quit", "exit", "q"}:
             break
 
+        streamed: list[str] = []
+
+        def _print_chunk(text: str) -> None:
+            if not streamed:
+                print("Coach> ", end="", flush=True)
+            streamed.append(text)
+            print(text, end="", flush=True)
+
         try:
-            result = executor.run(query, mode=args.mode, window=args.window, budget=args.budget)
-            print(f"Coach> {result.answer}")
+            result = executor.run(
+                query,
+                mode=args.mode,
+                window=args.window,
+                budget=args.budget,
+                on_answer_chunk=_print_chunk,
+            )
+            if streamed:
+                # End the streamed line before anything else is printed on the next one.
+                print()
+            if "".join(streamed) != result.answer:
+                # The stream broke off or yielded nothing usable, so show the answer actually returned.
+                print(f"Coach> {result.answer}")
             if args.show_trace:
                 print(json.dumps(result.tool_trace, indent=2))
         except Exception as exc:
+            if streamed:
+                print()
             print(f"Error: {exc}")
 
 
@@ -2,23 +2,36 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 from dotenv import load_dotenv
 
 _TRUE_VALUES = {"1", "true", "yes", "y", "on"}
 _FALSE_VALUES = {"0", "false", "no", "n", "off"}
+_BOOL_MAP = {**dict.fromkeys(_TRUE_VALUES, True), **dict.fromkeys(_FALSE_VALUES, False)}
+_ENV_DEFAULTS: dict[str, str | None] = {
+    "PAT_CONSOLE_PATH": "",
+    "PAT_USE_MONO": None,
+    "MONO_PATH": "mono",
+    "PAT_TIMEOUT_S": "120",
+    "RUNS_DIR": "runs",
+    "PAT_MAX_WORKERS": "",
+}
+
+
+@lru_cache(maxsize=1)
+def _load_dotenv_once() -> None:
+    load_dotenv(override=False)
 
 
 def _parse_optional_bool(value: str | None) -> bool | None:
-    if value is None or value.strip() == "":
+    if value is None or not (stripped := value.strip()):
         return None
-    lowered = value.strip().lower()
-    if lowered in _TRUE_VALUES:
-        return True
-    if lowered in _FALSE_VALUES:
-        return False
-    raise ValueError(f"Invalid boolean value: {value!r}. Use one of {_TRUE_VALUES | _FALSE_VALUES}.")
+    parsed = _BOOL_MAP.get(stripped.lower())
+    if parsed is None:
+        raise ValueError(f"Invalid boolean value: {value!r}. Use one of {_TRUE_VALUES | _FALSE_VALUES}.")
+    return parsed
 
 
 @dataclass(frozen=True)
@@ -28,36 +41,14 @@ class CoachConfig:
     mono_path: str
     pat_timeout_s: int
     runs_dir: Path
+    pat_max_workers: int = 1
 
     @classmethod
     def from_env(cls) -> "CoachConfig":
-        load_dotenv(override=False)
-
-        pat_console_raw = os.getenv("PAT_CONSOLE_PATH", "").strip()
-        pat_console_path = Path(pat_console_raw).expanduser() if pat_console_raw else None
-
-        pat_use_mono = _parse_optional_bool(os.getenv("PAT_USE_MONO"))
-
-        mono_path = os.getenv("MONO_PATH", "mono").strip() or "mono"
-
-        timeout_raw = os.getenv("PAT_TIMEOUT_S", "120").strip()
-        try:
-            pat_timeout_s = int(timeout_raw)
-        except ValueError as exc:
-            raise ValueError(f"PAT_TIMEOUT_S must be an integer, got {timeout_raw!r}") from exc
-        if pat_timeout_s <= 0:
-            raise ValueError("PAT_TIMEOUT_S must be > 0")
-
-        runs_dir_raw = os.getenv("RUNS_DIR", "runs").strip() or "runs"
-        runs_dir = Path(runs_dir_raw)
-
-        return cls(
-            pat_console_path=pat_console_path,
-            pat_use_mono=pat_use_mono,
-            mono_path=mono_path,
-            pat_timeout_s=pat_timeout_s,
-            runs_dir=runs_dir,
-        )
+        _load_dotenv_once()
+        # Keyed on the raw values so later environment changes still produce a fresh config.
+        values = tuple(os.getenv(key, default) for key, default in _ENV_DEFAULTS.items())
+        return _config_from_values(values)
 
     def resolve_use_mono(self, pat_console_path: Path | None = None) -> bool:
         if self.pat_use_mono is not None:
@@ -67,3 +58,43 @@ class CoachConfig:
         if path is None:
             return False
         return path.suffix.lower() == ".exe"
+
+
+@lru_cache(maxsize=8)
+def _config_from_values(values: tuple[str | None, ...]) -> CoachConfig:
+    env = dict(zip(_ENV_DEFAULTS, values, strict=True))
+    pat_console_raw = env["PAT_CONSOLE_PATH"].strip()
+    pat_console_path = Path(pat_console_raw).expanduser() if pat_console_raw else None
+
+    pat_use_mono = _parse_optional_bool(env["PAT_USE_MONO"])
+
+    mono_path = env["MONO_PATH"].strip() or "mono"
+
+    timeout_raw = env["PAT_TIMEOUT_S"].strip()
+    try:
+        pat_timeout_s = int(timeout_raw)
+    except ValueError as exc:
+        raise ValueError(f"PAT_TIMEOUT_S must be an integer, got {timeout_raw!r}") from exc
+    if pat_timeout_s <= 0:
+        raise ValueError("PAT_TIMEOUT_S must be > 0")
+
+    runs_dir_raw = env["RUNS_DIR"].strip() or "runs"
+    runs_dir = Path(runs_dir_raw)
+
+    workers_raw = env["PAT_MAX_WORKERS"].strip()
+    try:
+        # Each PAT run is a memory-hungry (often mono) process, so the default stays small.
+        pat_max_workers = int(workers_raw) if workers_raw else min(4, os.cpu_count() or 1)
+    except ValueError as exc:
+        raise ValueError(f"PAT_MAX_WORKERS must be an integer, got {workers_raw!r}") from exc
+    if pat_max_workers <= 0:
+        raise ValueError("PAT_MAX_WORKERS must be > 0")
+
+    return CoachConfig(
+        pat_console_path=pat_console_path,
+        pat_use_mono=pat_use_mono,
+        mono_path=mono_path,
+        pat_timeout_s=pat_timeout_s,
+        runs_dir=runs_dir,
+        pat_max_workers=pat_max_workers,
+    )
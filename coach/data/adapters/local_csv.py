@@ -1,14 +1,158 @@
 from __future__ import annotations
 
 import difflib
+import os
+import threading
+from collections import OrderedDict
 from copy import deepcopy
 from dataclasses import dataclass
+from functools import lru_cache
 from math import sqrt
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable
 
+import numpy as np
 import pandas as pd
 
+if TYPE_CHECKING:
+    from coach.model.params import InfluenceWeights
+
+try:  # pragma: no cover - optional dependency
+    from rapidfuzz import fuzz
+    from rapidfuzz import process as fuzz_process
+except Exception:  # pragma: no cover
+    fuzz = None  # type: ignore[assignment]
+    fuzz_process = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - optional dependency
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:  # pragma: no cover
+    pa = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+
+_SIDECAR_SOURCE_KEY = b"coach_source_fingerprint"
+# Bump when the CSV parse changes (dtypes, derived columns) so older sidecars are re-parsed.
+_SIDECAR_FORMAT = 3
+
+# Latest parsed version per (kind, path); an edited file replaces its entry rather than adding one,
+# and only the most recently used paths are kept.
+_CSV_FRAME_CACHE: OrderedDict[tuple[str, str], tuple[int, int, pd.DataFrame]] = OrderedDict()
+_CSV_FRAME_CACHE_MAX_PATHS = 8
+_CSV_FRAME_CACHE_LOCK = threading.Lock()
+
+
+def _load_frame_cached(kind: str, path: Path, loader: Callable[[Path], pd.DataFrame]) -> pd.DataFrame:
+    """
+    Parse a CSV once per process and file version.
+
+    Checked against the resolved path's ``st_mtime_ns``/``st_size`` so an edited
+    file is re-read; each caller receives its own copy of the parsed frame.
+    """
+    resolved = path.resolve()
+    stat = resolved.stat()
+    key = (kind, str(resolved))
+    with _CSV_FRAME_CACHE_LOCK:
+        cached = _CSV_FRAME_CACHE.get(key)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            _CSV_FRAME_CACHE.move_to_end(key)
+            return cached[2].copy()
+    frame = loader(resolved)
+    with _CSV_FRAME_CACHE_LOCK:
+        _CSV_FRAME_CACHE[key] = (stat.st_mtime_ns, stat.st_size, frame)
+        _CSV_FRAME_CACHE.move_to_end(key)
+        while len(_CSV_FRAME_CACHE) > _CSV_FRAME_CACHE_MAX_PATHS:
+            _CSV_FRAME_CACHE.popitem(last=False)
+    return frame.copy()
+
+
+def _parquet_sidecar_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.parquet")
+
+
+def _read_with_parquet_sidecar(path: Path, parse_csv: Callable[[Path], pd.DataFrame]) -> pd.DataFrame:
+    """Parse *path* once and keep the result as ``<name>.csv.parquet`` for later processes.
+
+    The sidecar records the parse format and the CSV's ``st_mtime_ns``/``st_size`` and is ignored
+    once either changes; without pyarrow, or when the directory is not writable, this is a plain
+    CSV parse.
+    """
+    if pq is None:
+        return parse_csv(path)
+
+    stat = path.stat()
+    fingerprint = f"{_SIDECAR_FORMAT}:{stat.st_mtime_ns}:{stat.st_size}".encode()
+    sidecar = _parquet_sidecar_path(path)
+    try:
+        table = pq.read_table(sidecar)
+        if (table.schema.metadata or {}).get(_SIDECAR_SOURCE_KEY) == fingerprint:
+            return table.to_pandas()
+    except (OSError, ValueError, pa.ArrowException):
+        pass
+
+    df = parse_csv(path)
+    # Written beside the sidecar and renamed over it, so a concurrent reader never sees a partial file.
+    partial = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = {**(table.schema.metadata or {}), _SIDECAR_SOURCE_KEY: fingerprint}
+        pq.write_table(table.replace_schema_metadata(metadata), partial)
+        os.replace(partial, sidecar)
+    except (OSError, ValueError, pa.ArrowException):
+        partial.unlink(missing_ok=True)
+    return df
+
+
+# Identifier and label columns are always text, even when a value looks numeric (e.g. "007");
+# numeric columns are left to the C parser's inference. Columns absent from a file are ignored.
+PLAYERS_CSV_DTYPES: dict[str, Any] = {
+    "player_id": str,
+    "name": str,
+    "country": str,
+    "handedness": str,
+}
+MATCHES_CSV_DTYPES: dict[str, Any] = {
+    "playerA_id": str,
+    "playerB_id": str,
+    "winner_id": str,
+    "tournament": str,
+    "round": str,
+}
+
+
+def _parse_players_csv(path: Path) -> pd.DataFrame:
+    return pd.read_csv(path, dtype=PLAYERS_CSV_DTYPES, engine="c")
+
+
+_INT32_RANGE = (np.iinfo(np.int32).min, np.iinfo(np.int32).max)
+
+
+def _downcast_count_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Store integer count columns (points, rallies, samples) as int32 when every value fits.
+
+    Counts are exact in int32 and numpy still accumulates their sums in int64, so results are
+    unchanged. Rate columns stay float64: a float32 copy of a parsed decimal is a different number.
+    """
+    counts = df.select_dtypes(include="int64")
+    if counts.empty:
+        return df
+    fits = (counts.min() >= _INT32_RANGE[0]) & (counts.max() <= _INT32_RANGE[1])
+    return df.astype({column: np.int32 for column in fits.index[fits]})
+
+
+def _parse_matches_csv(path: Path) -> pd.DataFrame:
+    df = pd.read_csv(path, dtype=MATCHES_CSV_DTYPES, parse_dates=["date"], engine="c")
+    df = _downcast_count_columns(df.sort_values("date"))
+    return df.reset_index(drop=True)
+
+
+def _read_players_csv(path: Path) -> pd.DataFrame:
+    return _read_with_parquet_sidecar(path, _parse_players_csv)
+
+
+def _read_matches_csv(path: Path) -> pd.DataFrame:
+    return _read_with_parquet_sidecar(path, _parse_matches_csv)
+
 
 @dataclass(frozen=True)
 class PlayerRecord:
@@ -18,6 +162,31 @@ class PlayerRecord:
     handedness: str | None = None
 
 
+@dataclass(frozen=True)
+class PlayerNameTables:
+    canonical_names: tuple[str, ...]
+    names_lower: tuple[str, ...]
+    surnames_lower: tuple[str, ...]
+    normalized_names: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class _MatchRowIndex:
+    matches: pd.DataFrame
+    positions_by_player: dict[str, np.ndarray]
+    dates: np.ndarray
+    dates_sorted: bool
+
+
+_NO_POSITIONS = np.empty(0, dtype=np.int64)
+
+
+@lru_cache(maxsize=1024)
+def _as_of_timestamp(as_of_date: str) -> pd.Timestamp:
+    # Backtests ask for the same cutoff once per player and window; parse each string once.
+    return pd.to_datetime(as_of_date)
+
+
 class LocalCSVAdapter:
     """Local CSV-backed stats adapter used by tools and CLI."""
 
@@ -35,14 +204,21 @@ class LocalCSVAdapter:
         self._players_df: pd.DataFrame | None = None
         self._matches_df: pd.DataFrame | None = None
         self._players_lookup_df: pd.DataFrame | None = None
+        self._player_name_index: dict[str, int] | None = None
+        self._player_id_index: dict[str, int] | None = None
+        self._player_name_tables: PlayerNameTables | None = None
+        self._player_records: tuple[PlayerRecord, ...] | None = None
+        self._match_row_index: _MatchRowIndex | None = None
         self._player_params_cache: dict[tuple[str, int, str | None, str], dict[str, Any]] = {}
         self._head_to_head_cache: dict[tuple[str, str, int, str | None], dict[str, Any]] = {}
         self._global_prior_cache: dict[str | None, dict[str, Any]] = {}
+        self._influence_weights_cache: InfluenceWeights | None = None
+        self._influence_weights_source: pd.DataFrame | None = None
 
     @property
     def players_df(self) -> pd.DataFrame:
         if self._players_df is None:
-            self._players_df = pd.read_csv(self.players_path)
+            self._players_df = _load_frame_cached("players", self.players_path, _read_players_csv)
         return self._players_df
 
     @property
@@ -53,13 +229,66 @@ class LocalCSVAdapter:
             self._players_lookup_df = players
         return self._players_lookup_df
 
+    @property
+    def player_name_index(self) -> dict[str, int]:
+        """Normalized player name -> positional row in ``players_lookup_df`` (first wins)."""
+        if self._player_name_index is None:
+            index: dict[str, int] = {}
+            for pos, norm in enumerate(self.players_lookup_df["_norm"].tolist()):
+                index.setdefault(norm, pos)
+            self._player_name_index = index
+        return self._player_name_index
+
+    @property
+    def player_records(self) -> tuple[PlayerRecord, ...]:
+        """One ``PlayerRecord`` per row of ``players_lookup_df``, built once."""
+        if self._player_records is None:
+            players = self.players_lookup_df
+
+            def column(name: str) -> list[Any]:
+                # Blank cells become "" (then None) rather than the string "nan".
+                return players[name].fillna("").tolist() if name in players.columns else [""] * len(players)
+
+            self._player_records = tuple(
+                PlayerRecord(
+                    player_id=str(player_id),
+                    name=str(name),
+                    country=str(country) or None,
+                    handedness=str(handedness) or None,
+                )
+                for player_id, name, country, handedness in zip(
+                    column("player_id"), column("name"), column("country"), column("handedness")
+                )
+            )
+        return self._player_records
+
+    @property
+    def player_name_tables(self) -> PlayerNameTables:
+        """Aligned canonical / lowercased full-name / surname / normalized name lists, built once."""
+        if self._player_name_tables is None:
+            canonical = tuple(str(name) for name in self.players_df["name"].tolist())
+            self._player_name_tables = PlayerNameTables(
+                canonical_names=canonical,
+                names_lower=tuple(name.lower() for name in canonical),
+                surnames_lower=tuple(name.split()[-1].lower() if name.split() else "" for name in canonical),
+                normalized_names=tuple(self.players_lookup_df["_norm"].tolist()),
+            )
+        return self._player_name_tables
+
+    @property
+    def player_id_index(self) -> dict[str, int]:
+        """Player id -> positional row in ``players_df`` (first wins)."""
+        if self._player_id_index is None:
+            index: dict[str, int] = {}
+            for pos, player_id in enumerate(self.players_df["player_id"].astype(str).tolist()):
+                index.setdefault(player_id, pos)
+            self._player_id_index = index
+        return self._player_id_index
+
     @property
     def matches_df(self) -> pd.DataFrame:
         if self._matches_df is None:
-            df = pd.read_csv(self.matches_path)
-            df["date"] = pd.to_datetime(df["date"], utc=False)
-            df = df.sort_values("date")
-            self._matches_df = df.reset_index(drop=True)
+            self._matches_df = _load_frame_cached("matches", self.matches_path, _read_matches_csv)
         return self._matches_df
 
     @staticmethod
@@ -68,219 +297,154 @@ class LocalCSVAdapter:
 
     def resolve_player(self, name: str) -> PlayerRecord:
         normalized = self._normalize_name(name)
-        players = self.players_lookup_df
-
-        exact = players[players["_norm"] == normalized]
-        if not exact.empty:
-            row = exact.iloc[0]
-            return PlayerRecord(
-                player_id=str(row["player_id"]),
-                name=str(row["name"]),
-                country=str(row.get("country", "")) or None,
-                handedness=str(row.get("handedness", "")) or None,
-            )
+        records = self.player_records
+        tables = self.player_name_tables
 
-        contains = players[players["_norm"].str.contains(normalized, regex=False)]
+        exact_pos = self.player_name_index.get(normalized)
+        if exact_pos is not None:
+            return records[exact_pos]
+
+        contains = [pos for pos, norm in enumerate(tables.normalized_names) if normalized in norm]
         if len(contains) == 1:
-            row = contains.iloc[0]
-            return PlayerRecord(
-                player_id=str(row["player_id"]),
-                name=str(row["name"]),
-                country=str(row.get("country", "")) or None,
-                handedness=str(row.get("handedness", "")) or None,
-            )
+            return records[contains[0]]
 
-        candidates = players["name"].tolist()
-        close = difflib.get_close_matches(name, candidates, n=3, cutoff=0.55)
+        close = self._close_names(name, tables.canonical_names)
         if close:
             raise ValueError(f"Player '{name}' not found. Did you mean: {', '.join(close)}?")
         raise ValueError(f"Player '{name}' not found in local player table.")
 
-    def _window_filter(self, window: int, as_of_date: str | None = None) -> pd.DataFrame:
+    @staticmethod
+    def _close_names(name: str, candidates: tuple[str, ...]) -> list[str]:
+        """Up to three "did you mean" suggestions; RapidFuzz when installed, else difflib."""
+        if fuzz_process is not None:
+            matches = fuzz_process.extract(name, candidates, scorer=fuzz.ratio, limit=3, score_cutoff=55)
+            return [match for match, _, _ in matches]
+        return difflib.get_close_matches(name, candidates, n=3, cutoff=0.55)
+
+    @property
+    def match_row_index(self) -> _MatchRowIndex:
+        """Sorted ``matches_df`` row positions per player id (as A or B), rebuilt if the frame changes."""
+        matches = self.matches_df
+        cached = self._match_row_index
+        if cached is None or cached.matches is not matches:
+            a_ids = matches["playerA_id"].to_numpy()
+            b_ids = matches["playerB_id"].to_numpy()
+            rows = np.arange(len(matches), dtype=np.int64)
+            distinct_b = b_ids != a_ids
+            ids = np.concatenate([a_ids, b_ids[distinct_b]])
+            positions = np.concatenate([rows, rows[distinct_b]])
+            grouped = pd.Series(positions).groupby(ids, sort=False).indices
+            cached = _MatchRowIndex(
+                matches=matches,
+                positions_by_player={
+                    str(player_id): np.sort(positions[idx]) for player_id, idx in grouped.items()
+                },
+                dates=matches["date"].to_numpy(),
+                dates_sorted=bool(matches["date"].is_monotonic_increasing),
+            )
+            self._match_row_index = cached
+        return cached
+
+    def _cutoff_end(self, as_of_date: str | None) -> int | None:
+        """Row count of the ``date <= as_of_date`` prefix of ``matches_df``, or None if dates are unsorted."""
+        index = self.match_row_index
+        if not as_of_date:
+            return len(index.dates)
+        if not index.dates_sorted:
+            return None
+        return int(np.searchsorted(index.dates, np.datetime64(_as_of_timestamp(as_of_date)), side="right"))
+
+    def _player_window_positions(self, player_id: str, rows: int, as_of_date: str | None) -> np.ndarray:
+        """Positions of *player_id*'s matches inside ``_window_filter(...)``'s slice, without masking it."""
+        index = self.match_row_index
+        positions = index.positions_by_player.get(player_id, _NO_POSITIONS)
+        end = self._cutoff_end(as_of_date)
+        if end is None:
+            eligible = np.flatnonzero(index.dates <= np.datetime64(_as_of_timestamp(as_of_date)))[-rows:]
+            return positions[np.isin(positions, eligible)]
+        lo, hi = np.searchsorted(positions, [max(end - rows, 0), end])
+        return positions[lo:hi]
+
+    def _matches_as_of(self, as_of_date: str | None) -> pd.DataFrame:
+        """``matches_df`` rows dated on or before *as_of_date*: a positional slice when dates are sorted."""
         df = self.matches_df
-        if as_of_date:
-            cutoff = pd.to_datetime(as_of_date)
-            df = df[df["date"] <= cutoff]
-        return df.tail(max(window * 4, window))
+        end = self._cutoff_end(as_of_date)
+        if end is not None:
+            return df.iloc[:end]
+        return df[df["date"] <= _as_of_timestamp(as_of_date)]
+
+    def _window_filter(self, window: int, as_of_date: str | None = None) -> pd.DataFrame:
+        return self._matches_as_of(as_of_date).tail(max(window * 4, window))
 
     def get_player_matches(self, player_id: str, window: int = 30, as_of_date: str | None = None) -> pd.DataFrame:
-        df = self._window_filter(window=window, as_of_date=as_of_date)
-        mask = (df["playerA_id"] == player_id) | (df["playerB_id"] == player_id)
-        player_df = df.loc[mask].copy().sort_values("date")
+        rows = max(window * 4, window)
+        if rows > 0:
+            positions = self._player_window_positions(player_id, rows, as_of_date)
+            player_df = self.matches_df.take(positions).sort_values("date")
+        else:
+            df = self._window_filter(window=window, as_of_date=as_of_date)
+            mask = (df["playerA_id"] == player_id) | (df["playerB_id"] == player_id)
+            player_df = df.loc[mask].sort_values("date")
         if player_df.empty:
             raise ValueError(f"No matches found for player_id='{player_id}'.")
         return player_df.tail(window)
 
-    @staticmethod
-    def _series_or_default(df: pd.DataFrame, column: str, default: float | int | str) -> pd.Series:
-        if column in df.columns:
-            return df[column]
-        return pd.Series(default, index=df.index)
-
-    @classmethod
-    def _select_side_series(
-        cls,
-        df: pd.DataFrame,
-        *,
-        player_is_a: pd.Series,
-        a_column: str,
-        b_column: str,
-        default: float | int | str,
-    ) -> pd.Series:
-        a_values = cls._series_or_default(df, a_column, default)
-        b_values = cls._series_or_default(df, b_column, default)
-        return a_values.where(player_is_a, b_values)
-
     def _perspective_frame(self, df: pd.DataFrame, player_id: str) -> pd.DataFrame:
-        player_is_a = df["playerA_id"] == player_id
-
-        serve_rallies = self._select_side_series(
-            df,
-            player_is_a=player_is_a,
-            a_column="a_serve_rallies",
-            b_column="b_serve_rallies",
-            default=0,
+        n = len(df)
+        present = set(df.columns)
+        arrays: dict[str, np.ndarray] = {}
+
+        def column(name: str, default: float | int) -> np.ndarray:
+            values = arrays.get(name)
+            if values is None:
+                values = df[name].to_numpy() if name in present else np.full(n, default)
+                arrays[name] = values
+            return values
+
+        player_a_ids = df["playerA_id"].to_numpy()
+        player_b_ids = df["playerB_id"].to_numpy()
+        winner_ids = df["winner_id"].to_numpy()
+        player_is_a = player_a_ids == player_id
+
+        def side(a_column: str, b_column: str, default: float | int, dtype: type) -> np.ndarray:
+            values = np.where(player_is_a, column(a_column, default), column(b_column, default))
+            return values.astype(dtype)
+
+        serve_rallies = side("a_serve_rallies", "b_serve_rallies", 0, int)
+        receive_rallies = np.where(
+            player_is_a, column("b_serve_rallies", 0), column("a_serve_rallies", 0)
         )
-        receive_rallies = self._select_side_series(
-            df,
-            player_is_a=player_is_a,
-            a_column="b_serve_rallies",
-            b_column="a_serve_rallies",
-            default=0,
-        )
-        opponent_serve_wins = self._select_side_series(
-            df,
-            player_is_a=player_is_a,
-            a_column="b_serve_wins",
-            b_column="a_serve_wins",
-            default=0,
-        )
-        won = (df["winner_id"] == df["playerA_id"]).where(player_is_a, df["winner_id"] == df["playerB_id"])
+        opponent_serve_wins = np.where(player_is_a, column("b_serve_wins", 0), column("a_serve_wins", 0))
 
         perspective = pd.DataFrame(
             {
-                "date": df["date"],
-                "player_id": player_id,
-                "opponent_id": df["playerB_id"].where(player_is_a, df["playerA_id"]),
-                "serve_rallies": serve_rallies.astype(int),
-                "serve_wins": self._select_side_series(
-                    df,
-                    player_is_a=player_is_a,
-                    a_column="a_serve_wins",
-                    b_column="b_serve_wins",
-                    default=0,
-                ).astype(int),
+                "date": df["date"].to_numpy(),
+                "player_id": np.full(n, player_id, dtype=object),
+                "opponent_id": np.where(player_is_a, player_b_ids, player_a_ids),
+                "serve_rallies": serve_rallies,
+                "serve_wins": side("a_serve_wins", "b_serve_wins", 0, int),
                 "receive_rallies": receive_rallies.astype(int),
                 "receive_wins": (receive_rallies - opponent_serve_wins).astype(int),
-                "short_rate": self._select_side_series(
-                    df,
-                    player_is_a=player_is_a,
-                    a_column="a_short_serve_rate",
-                    b_column="b_short_serve_rate",
-                    default=0.5,
-                ).astype(float),
-                "flick_rate": self._select_side_series(
-                    df,
-                    player_is_a=player_is_a,
-                    a_column="a_flick_serve_rate",
-                    b_column="b_flick_serve_rate",
-                    default=0.5,
-                ).astype(float),
-                "attack_rate": self._select_side_series(
-                    df,
-                    player_is_a=player_is_a,
-                    a_column="a_attack_rate",
-                    b_column="b_attack_rate",
-                    default=1 / 3,
-                ).astype(float),
-                "neutral_rate": self._select_side_series(
-                    df,
-                    player_is_a=player_is_a,
-                    a_column="a_neutral_rate",
-                    b_column="b_neutral_rate",
-                    default=1 / 3,
-                ).astype(float),
-                "safe_rate": self._select_side_series(
-                    df,
-                    player_is_a=player_is_a,
-                    a_column="a_safe_rate",
-                    b_column="b_safe_rate",
-                    default=1 / 3,
-                ).astype(float),
-                "points_for": self._select_side_series(
-                    df,
-                    player_is_a=player_is_a,
-                    a_column="a_points",
-                    b_column="b_points",
-                    default=0,
-                ).astype(int),
-                "points_against": self._select_side_series(
-                    df,
-                    player_is_a=player_is_a,
-                    a_column="b_points",
-                    b_column="a_points",
-                    default=0,
-                ).astype(int),
-                "avg_rally_len": self._series_or_default(df, "avg_rally_len", 0.0).astype(float),
-                "long_rally_share": self._series_or_default(df, "long_rally_share", 0.0).astype(float),
-                "short_serve_win_rate": self._select_side_series(
-                    df,
-                    player_is_a=player_is_a,
-                    a_column="a_short_serve_win_rate",
-                    b_column="b_short_serve_win_rate",
-                    default=0.5,
-                ).astype(float),
-                "long_serve_win_rate": self._select_side_series(
-                    df,
-                    player_is_a=player_is_a,
-                    a_column="a_long_serve_win_rate",
-                    b_column="b_long_serve_win_rate",
-                    default=0.5,
-                ).astype(float),
-                "short_serve_samples": self._select_side_series(
-                    df,
-                    player_is_a=player_is_a,
-                    a_column="a_short_serve_samples",
-                    b_column="b_short_serve_samples",
-                    default=0,
-                ).astype(int),
-                "long_serve_samples": self._select_side_series(
-                    df,
-                    player_is_a=player_is_a,
-                    a_column="a_long_serve_samples",
-                    b_column="b_long_serve_samples",
-                    default=0,
-                ).astype(int),
-                "backhand_rate": self._select_side_series(
-                    df,
-                    player_is_a=player_is_a,
-                    a_column="a_backhand_rate",
-                    b_column="b_backhand_rate",
-                    default=0.0,
-                ).astype(float),
-                "aroundhead_rate": self._select_side_series(
-                    df,
-                    player_is_a=player_is_a,
-                    a_column="a_aroundhead_rate",
-                    b_column="b_aroundhead_rate",
-                    default=0.0,
-                ).astype(float),
-                "net_error_lost_rate": self._select_side_series(
-                    df,
-                    player_is_a=player_is_a,
-                    a_column="a_net_error_lost_rate",
-                    b_column="b_net_error_lost_rate",
-                    default=0.0,
-                ).astype(float),
-                "out_error_lost_rate": self._select_side_series(
-                    df,
-                    player_is_a=player_is_a,
-                    a_column="a_out_error_lost_rate",
-                    b_column="b_out_error_lost_rate",
-                    default=0.0,
-                ).astype(float),
-                "won": won.astype(int),
-            }
+                "short_rate": side("a_short_serve_rate", "b_short_serve_rate", 0.5, float),
+                "flick_rate": side("a_flick_serve_rate", "b_flick_serve_rate", 0.5, float),
+                "attack_rate": side("a_attack_rate", "b_attack_rate", 1 / 3, float),
+                "neutral_rate": side("a_neutral_rate", "b_neutral_rate", 1 / 3, float),
+                "safe_rate": side("a_safe_rate", "b_safe_rate", 1 / 3, float),
+                "points_for": side("a_points", "b_points", 0, int),
+                "points_against": side("b_points", "a_points", 0, int),
+                "avg_rally_len": column("avg_rally_len", 0.0).astype(float),
+                "long_rally_share": column("long_rally_share", 0.0).astype(float),
+                "short_serve_win_rate": side("a_short_serve_win_rate", "b_short_serve_win_rate", 0.5, float),
+                "long_serve_win_rate": side("a_long_serve_win_rate", "b_long_serve_win_rate", 0.5, float),
+                "short_serve_samples": side("a_short_serve_samples", "b_short_serve_samples", 0, int),
+                "long_serve_samples": side("a_long_serve_samples", "b_long_serve_samples", 0, int),
+                "backhand_rate": side("a_backhand_rate", "b_backhand_rate", 0.0, float),
+                "aroundhead_rate": side("a_aroundhead_rate", "b_aroundhead_rate", 0.0, float),
+                "net_error_lost_rate": side("a_net_error_lost_rate", "b_net_error_lost_rate", 0.0, float),
+                "out_error_lost_rate": side("a_out_error_lost_rate", "b_out_error_lost_rate", 0.0, float),
+                "won": (winner_ids == np.where(player_is_a, player_a_ids, player_b_ids)).astype(int),
+            },
+            copy=False,
         )
         return perspective.sort_values("date").reset_index(drop=True)
 
@@ -333,10 +497,7 @@ class LocalCSVAdapter:
         if cached is not None:
             return deepcopy(cached)
 
-        df = self.matches_df
-        if as_of_date:
-            cutoff = pd.to_datetime(as_of_date, utc=False)
-            df = df[df["date"] <= cutoff]
+        df = self._matches_as_of(as_of_date)
 
         if df.empty:
             priors = {
@@ -523,14 +684,19 @@ class LocalCSVAdapter:
     @staticmethod
     def _estimate_unforced_error_proxy(
         *,
-        attack_rate: float | pd.Series,
-        safe_rate: float | pd.Series,
-        flick_rate: float | pd.Series,
-        points_for: float | pd.Series,
-        points_against: float | pd.Series,
-    ) -> float | pd.Series:
+        attack_rate: float | pd.Series | np.ndarray,
+        safe_rate: float | pd.Series | np.ndarray,
+        flick_rate: float | pd.Series | np.ndarray,
+        points_for: float | pd.Series | np.ndarray,
+        points_against: float | pd.Series | np.ndarray,
+    ) -> float | pd.Series | np.ndarray:
         total = points_for + points_against
-        total = total.clip(lower=1.0) if isinstance(total, pd.Series) else max(total, 1.0)
+        if isinstance(total, pd.Series):
+            total = total.clip(lower=1.0)
+        elif isinstance(total, np.ndarray):
+            total = np.maximum(total, 1.0)
+        else:
+            total = max(total, 1.0)
         point_loss = points_against / total
         proxy = (
             0.08
@@ -541,6 +707,8 @@ class LocalCSVAdapter:
         )
         if isinstance(proxy, pd.Series):
             return proxy.clip(lower=0.01, upper=0.6)
+        if isinstance(proxy, np.ndarray):
+            return np.clip(proxy, 0.01, 0.6)
         return float(min(0.6, max(0.01, proxy)))
 
     def get_player_params(
@@ -569,24 +737,34 @@ class LocalCSVAdapter:
         priors = self._build_global_priors(as_of_date=as_of_date)
         reference_time = self._resolve_reference_time(perspective, as_of_date)
 
-        weighted_serve_trials = perspective["serve_rallies"] * recency
-        weighted_receive_trials = perspective["receive_rallies"] * recency
-        serve_trials = float(perspective["serve_rallies"].sum())
-        serve_wins = float((perspective["serve_wins"] * recency).sum())
-        receive_trials = float(perspective["receive_rallies"].sum())
-        receive_wins = float((perspective["receive_wins"] * recency).sum())
+        # Pull each column out once and reduce over plain arrays; the sums keep
+        # pandas' NaN-skipping (nansum) and summation order.
+        serve_rallies = perspective["serve_rallies"].to_numpy()
+        receive_rallies = perspective["receive_rallies"].to_numpy()
+        points_for = perspective["points_for"].to_numpy()
+        points_against = perspective["points_against"].to_numpy()
+        won = perspective["won"].to_numpy()
+        recency_w = recency.to_numpy()
 
-        base_srv = self._smooth_probability(serve_wins, float(weighted_serve_trials.sum()))
-        base_rcv = self._smooth_probability(receive_wins, float(weighted_receive_trials.sum()))
+        serve_trials = float(serve_rallies.sum())
+        serve_wins = float(np.nansum(perspective["serve_wins"].to_numpy() * recency_w))
+        receive_trials = float(receive_rallies.sum())
+        receive_wins = float(np.nansum(perspective["receive_wins"].to_numpy() * recency_w))
 
-        serve_weight = (perspective["serve_rallies"].clip(lower=1) * recency).clip(lower=1e-6)
-        rally_weight = ((perspective["points_for"] + perspective["points_against"]).clip(lower=1) * recency).clip(
-            lower=1e-6
-        )
+        base_srv = self._smooth_probability(serve_wins, float(np.nansum(serve_rallies * recency_w)))
+        base_rcv = self._smooth_probability(receive_wins, float(np.nansum(receive_rallies * recency_w)))
 
-        short = float((perspective["short_rate"] * serve_weight).sum() / serve_weight.sum())
-        attack = float((perspective["attack_rate"] * rally_weight).sum() / rally_weight.sum())
-        safe = float((perspective["safe_rate"] * rally_weight).sum() / rally_weight.sum())
+        serve_weight = np.maximum(np.maximum(serve_rallies, 1) * recency_w, 1e-6)
+        rally_weight = np.maximum(np.maximum(points_for + points_against, 1) * recency_w, 1e-6)
+        serve_weight_total = np.nansum(serve_weight)
+        rally_weight_total = np.nansum(rally_weight)
+
+        def rally_weighted(column: str) -> float:
+            return float(np.nansum(perspective[column].to_numpy() * rally_weight) / rally_weight_total)
+
+        short = float(np.nansum(perspective["short_rate"].to_numpy() * serve_weight) / serve_weight_total)
+        attack = rally_weighted("attack_rate")
+        safe = rally_weighted("safe_rate")
 
         # Dirichlet-style smoothing on mix vectors.
         alpha_mix = 0.02
@@ -599,24 +777,24 @@ class LocalCSVAdapter:
         total = attack + neutral + safe
         attack, neutral, safe = attack / total, neutral / total, safe / total
 
-        wins = int(perspective["won"].sum())
+        wins = int(won.sum())
         matches = int(len(perspective))
-        points_for_total = float(perspective["points_for"].sum())
-        points_against_total = float(perspective["points_against"].sum())
+        points_for_total = float(points_for.sum())
+        points_against_total = float(points_against.sum())
         point_share = points_for_total / max(points_for_total + points_against_total, 1.0)
-        weighted_point_share = float((perspective["points_for"] * recency).sum()) / max(
-            float(((perspective["points_for"] + perspective["points_against"]) * recency).sum()),
+        weighted_point_share = float(np.nansum(points_for * recency_w)) / max(
+            float(np.nansum((points_for + points_against) * recency_w)),
             1.0,
         )
 
-        ue_proxy_series = self._estimate_unforced_error_proxy(
-            attack_rate=perspective["attack_rate"],
-            safe_rate=perspective["safe_rate"],
-            flick_rate=perspective["flick_rate"],
-            points_for=perspective["points_for"],
-            points_against=perspective["points_against"],
+        ue_proxy = self._estimate_unforced_error_proxy(
+            attack_rate=perspective["attack_rate"].to_numpy(),
+            safe_rate=perspective["safe_rate"].to_numpy(),
+            flick_rate=perspective["flick_rate"].to_numpy(),
+            points_for=points_for,
+            points_against=points_against,
         )
-        unforced_error_rate = float((ue_proxy_series * rally_weight).sum() / rally_weight.sum())
+        unforced_error_rate = float(np.nansum(ue_proxy * rally_weight) / rally_weight_total)
 
         return_pressure = float(
             min(
@@ -628,39 +806,44 @@ class LocalCSVAdapter:
             )
         )
 
-        close_match = (perspective["points_for"] - perspective["points_against"]).abs() <= 6
-        close_df = perspective.loc[close_match]
-        if close_df.empty:
+        close_match = np.abs(points_for - points_against) <= 6
+        if not close_match.any():
             clutch_point_win = point_share
         else:
-            close_points_for = float(close_df["points_for"].sum())
-            close_points_against = float(close_df["points_against"].sum())
+            close_points_for = float(points_for[close_match].sum())
+            close_points_against = float(points_against[close_match].sum())
             close_point_share = close_points_for / max(close_points_for + close_points_against, 1.0)
-            close_win_rate = self._smooth_probability(float(close_df["won"].sum()), float(len(close_df)), alpha=1.0)
+            close_win_rate = self._smooth_probability(
+                float(won[close_match].sum()), float(close_match.sum()), alpha=1.0
+            )
             clutch_point_win = 0.65 * close_point_share + 0.35 * close_win_rate
         clutch_point_win = float(min(0.99, max(0.01, clutch_point_win)))
 
-        short_serve_trials = float(perspective["short_serve_samples"].sum())
-        long_serve_trials = float(perspective["long_serve_samples"].sum())
-        short_serve_wins = float((perspective["short_serve_win_rate"] * perspective["short_serve_samples"]).sum())
-        long_serve_wins = float((perspective["long_serve_win_rate"] * perspective["long_serve_samples"]).sum())
+        short_serve_samples = perspective["short_serve_samples"].to_numpy()
+        long_serve_samples = perspective["long_serve_samples"].to_numpy()
+        short_serve_trials = float(short_serve_samples.sum())
+        long_serve_trials = float(long_serve_samples.sum())
+        short_serve_wins = float(np.nansum(perspective["short_serve_win_rate"].to_numpy() * short_serve_samples))
+        long_serve_wins = float(np.nansum(perspective["long_serve_win_rate"].to_numpy() * long_serve_samples))
         short_serve_skill = self._smooth_probability(short_serve_wins, short_serve_trials, alpha=1.2)
         long_serve_skill = self._smooth_probability(long_serve_wins, long_serve_trials, alpha=1.2)
 
-        avg_rally_len_raw = float((perspective["avg_rally_len"] * rally_weight).sum() / rally_weight.sum())
+        avg_rally_len_raw = rally_weighted("avg_rally_len")
         avg_rally_len_norm = min(1.0, max(0.0, avg_rally_len_raw / 12.0))
-        long_rally_share = float((perspective["long_rally_share"] * rally_weight).sum() / rally_weight.sum())
+        long_rally_share = rally_weighted("long_rally_share")
         rally_tolerance = min(0.99, max(0.01, 0.45 * avg_rally_len_norm + 0.55 * long_rally_share))
 
-        net_error_rate = float((perspective["net_error_lost_rate"] * rally_weight).sum() / rally_weight.sum())
-        out_error_rate = float((perspective["out_error_lost_rate"] * rally_weight).sum() / rally_weight.sum())
-        backhand_rate = float((perspective["backhand_rate"] * rally_weight).sum() / rally_weight.sum())
-        aroundhead_rate = float((perspective["aroundhead_rate"] * rally_weight).sum() / rally_weight.sum())
+        net_error_rate = rally_weighted("net_error_lost_rate")
+        out_error_rate = rally_weighted("out_error_lost_rate")
+        backhand_rate = rally_weighted("backhand_rate")
+        aroundhead_rate = rally_weighted("aroundhead_rate")
         net_error_rate = min(1.0, max(0.0, net_error_rate))
         out_error_rate = min(1.0, max(0.0, out_error_rate))
         backhand_rate = min(1.0, max(0.0, backhand_rate))
         aroundhead_rate = min(1.0, max(0.0, aroundhead_rate))
-        weighted_win_rate = self._smooth_probability(float((perspective["won"] * recency).sum()), float(recency.sum()), alpha=1.5)
+        weighted_win_rate = self._smooth_probability(
+            float(np.nansum(won * recency_w)), float(np.nansum(recency_w)), alpha=1.5
+        )
         recent_form = float(min(0.99, max(0.01, (0.55 * weighted_win_rate) + (0.45 * weighted_point_share))))
 
         if reference_time is None:
@@ -731,11 +914,24 @@ class LocalCSVAdapter:
         if cached is not None:
             return deepcopy(cached)
 
-        df = self._window_filter(window=window * 2, as_of_date=as_of_date)
+        rows = max(window * 8, window * 2)
+        if rows > 0:
+            # Head-to-head rows are among player A's window rows that player B also played in,
+            # so intersect the two sorted position lists and mask only those rows.
+            positions_b = self.match_row_index.positions_by_player.get(player_b_id, _NO_POSITIONS)
+            df = self.matches_df.take(
+                np.intersect1d(
+                    self._player_window_positions(player_a_id, rows, as_of_date),
+                    positions_b,
+                    assume_unique=True,
+                )
+            )
+        else:
+            df = self._window_filter(window=window * 2, as_of_date=as_of_date)
         h2h = df[
             ((df["playerA_id"] == player_a_id) & (df["playerB_id"] == player_b_id))
             | ((df["playerA_id"] == player_b_id) & (df["playerB_id"] == player_a_id))
-        ].copy()
+        ]
 
         if h2h.empty:
             result = {
@@ -764,3 +960,24 @@ class LocalCSVAdapter:
         }
         self._head_to_head_cache[cache_key] = deepcopy(result)
         return deepcopy(result)
+
+    def get_matchup_params(
+        self,
+        player_a_id: str,
+        player_b_id: str,
+        window: int = 30,
+        as_of_date: str | None = None,
+        allow_cold_start: bool = False,
+    ) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+        """Player A stats, player B stats and their head-to-head, all served from the match row index."""
+        a_stats, b_stats = (
+            self.get_player_params(
+                player_id,
+                window=window,
+                as_of_date=as_of_date,
+                allow_cold_start=allow_cold_start,
+            )
+            for player_id in (player_a_id, player_b_id)
+        )
+        h2h = self.get_head_to_head(player_a_id, player_b_id, window=window, as_of_date=as_of_date)
+        return a_stats, b_stats, h2h
@@ -47,28 +47,31 @@ def _default_influence_weights() -> InfluenceWeights:
 
 
 def _resolve_player(adapter: LocalCSVAdapter, player_ref: str) -> PlayerRecord:
-    by_id = adapter.players_df[adapter.players_df["player_id"] == player_ref]
-    if not by_id.empty:
-        row = by_id.iloc[0]
-        return PlayerRecord(
-            player_id=str(row["player_id"]),
-            name=str(row["name"]),
-            country=str(row.get("country", "")) or None,
-            handedness=str(row.get("handedness", "")) or None,
-        )
+    pos = adapter.player_id_index.get(player_ref)
+    if pos is not None:
+        return adapter.player_records[pos]
     return adapter.resolve_player(player_ref)
 
 
+def _cache_influence_weights(adapter: LocalCSVAdapter, matches: pd.DataFrame, weights: InfluenceWeights) -> InfluenceWeights:
+    adapter._influence_weights_source = matches
+    adapter._influence_weights_cache = weights
+    return weights
+
+
 def estimate_influence_weights(adapter: LocalCSVAdapter) -> InfluenceWeights:
+    """Ridge fit of the influence weights over the adapter's matches, computed once per matches frame.
+
+    The weights are frozen, so the cached instance is returned as is; a new ``matches_df``
+    (e.g. a reloaded or re-snapshotted table) triggers a refit.
+    """
+    df = adapter.matches_df
     cached = getattr(adapter, "_influence_weights_cache", None)
-    if cached is not None:
-        return cached.model_copy(deep=True)
+    if cached is not None and getattr(adapter, "_influence_weights_source", None) is df:
+        return cached
 
-    df = adapter.matches_df.copy()
     if len(df) < 10:
-        weights = _default_influence_weights()
-        adapter._influence_weights_cache = weights
-        return weights.model_copy(deep=True)
+        return _cache_influence_weights(adapter, df, _default_influence_weights())
 
     feature_rows: list[list[float]] = []
     targets: list[float] = []
@@ -115,9 +118,7 @@ def estimate_influence_weights(adapter: LocalCSVAdapter) -> InfluenceWeights:
         targets.append((float(row.a_points) / total_points) - 0.5)
 
     if len(feature_rows) < 10:
-        weights = _default_influence_weights()
-        adapter._influence_weights_cache = weights
-        return weights.model_copy(deep=True)
+        return _cache_influence_weights(adapter, df, _default_influence_weights())
 
     X = np.column_stack([
         np.ones(len(feature_rows), dtype=float),
@@ -163,8 +164,7 @@ def estimate_influence_weights(adapter: LocalCSVAdapter) -> InfluenceWeights:
         w_recent_form=w_recent_form,
         w_rest=w_rest,
     )
-    adapter._influence_weights_cache = weights
-    return weights.model_copy(deep=True)
+    return _cache_influence_weights(adapter, df, weights)
 
 
 def _build_player_params(stats: dict[str, Any], sample_matches: int) -> PlayerParams:
@@ -214,19 +214,13 @@ def build_matchup_params(
     if player_a.player_id == player_b.player_id:
         raise ValueError("Player A and Player B must be different players.")
 
-    a_stats = adapter.get_player_params(
+    a_stats, b_stats, h2h = adapter.get_matchup_params(
         player_a.player_id,
-        window=window,
-        as_of_date=as_of_date,
-        allow_cold_start=allow_cold_start,
-    )
-    b_stats = adapter.get_player_params(
         player_b.player_id,
         window=window,
         as_of_date=as_of_date,
         allow_cold_start=allow_cold_start,
     )
-    h2h = adapter.get_head_to_head(player_a.player_id, player_b.player_id, window=window, as_of_date=as_of_date)
     weights = estimate_influence_weights(adapter)
 
     blend = min(0.35, h2h["matches"] / (h2h["matches"] + 12.0)) if h2h["matches"] > 0 else 0.0
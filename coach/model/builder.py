@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import hashlib
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -9,6 +11,7 @@ from coach.model.params import MatchupParams
 from coach.utils import ensure_run_dir, write_json
 
 _PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*([a-zA-Z0-9_]+)\s*\}\}")
+_TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
 
 
 @dataclass(frozen=True)
@@ -16,25 +19,61 @@ class ModelBuildResult:
     run_dir: Path
     template_path: Path
     matchup_pcsp_path: Path
-    params_json_path: Path
+    params_json_path: Path | None
     context: dict[str, Any]
 
 
-def render_template(template_text: str, context: dict[str, Any]) -> str:
-    missing: set[str] = set()
+@lru_cache(maxsize=16)
+def _compile_template(template_text: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Split *template_text* once into literal chunks and the placeholder keys between them."""
+    parts = _PLACEHOLDER_PATTERN.split(template_text)
+    return tuple(parts[0::2]), tuple(parts[1::2])
+
+
+def _load_template(template_path: Path) -> str:
+    """Template text, re-read only when the file's mtime or size changes."""
+    try:
+        stat = template_path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Template not found: {template_path}") from None
+    return _read_template(str(template_path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=16)
+def _read_template(path: str, mtime_ns: int, size: int) -> str:
+    return Path(path).read_text(encoding="utf-8")
+
 
-    def repl(match: re.Match[str]) -> str:
-        key = match.group(1)
-        if key not in context:
-            missing.add(key)
-            return match.group(0)
-        return str(context[key])
+def _write_model_text(path: Path, text: str) -> None:
+    # Strategy sweeps write many models into one existing directory; only create it on a miss.
+    try:
+        path.write_text(text, encoding="utf-8")
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
 
-    rendered = _PLACEHOLDER_PATTERN.sub(repl, template_text)
+
+def render_template(template_text: str, context: dict[str, Any]) -> str:
+    literals, keys = _compile_template(template_text)
+    missing = set(keys).difference(context)
     if missing:
         missing_list = ", ".join(sorted(missing))
         raise ValueError(f"Missing template parameters: {missing_list}")
-    return rendered
+
+    pieces = [literals[0]]
+    for key, literal in zip(keys, literals[1:]):
+        pieces.append(str(context[key]))
+        pieces.append(literal)
+    return "".join(pieces)
+
+
+def template_digest(template_name: str) -> str | None:
+    """Digest of the named template's text, or ``None`` if it does not exist."""
+    try:
+        template_text = _load_template(_TEMPLATES_DIR / template_name)
+    except FileNotFoundError:
+        return None
+    return hashlib.blake2b(template_text.encode("utf-8"), digest_size=16).hexdigest()
 
 
 def build_matchup_model(
@@ -43,34 +82,33 @@ def build_matchup_model(
     out_path: str | Path | None = None,
     run_id: str | None = None,
     run_dir: str | Path | None = None,
+    write_params: bool = True,
 ) -> ModelBuildResult:
-    template_path = Path(__file__).resolve().parent / "templates" / template_name
-    if not template_path.exists():
-        raise FileNotFoundError(f"Template not found: {template_path}")
-
+    template_path = _TEMPLATES_DIR / template_name
+    template_text = _load_template(template_path)
     context = params.to_template_context()
-    template_text = template_path.read_text(encoding="utf-8")
     rendered = render_template(template_text, context)
 
     if out_path is not None:
         matchup_path = Path(out_path)
         resolved_run_dir = matchup_path.parent
-        resolved_run_dir.mkdir(parents=True, exist_ok=True)
     else:
         resolved_run_dir = ensure_run_dir(run_id=run_id, base_dir=run_dir)
         matchup_path = resolved_run_dir / "matchup.pcsp"
 
-    matchup_path.write_text(rendered, encoding="utf-8")
-
-    params_payload = {
-        "player_a": params.player_a.model_dump(),
-        "player_b": params.player_b.model_dump(),
-        "weights": params.weights.model_dump(),
-        "effective_probabilities": params.effective_probabilities(),
-        "context": context,
-    }
-    params_path = resolved_run_dir / "params.json"
-    write_json(params_path, params_payload)
+    _write_model_text(matchup_path, rendered)
+
+    params_path: Path | None = None
+    if write_params:
+        params_payload = {
+            "player_a": params.player_a.model_dump(),
+            "player_b": params.player_b.model_dump(),
+            "weights": params.weights.model_dump(),
+            "effective_probabilities": params.effective_probabilities(),
+            "context": context,
+        }
+        params_path = resolved_run_dir / "params.json"
+        write_json(params_path, params_payload)
 
     return ModelBuildResult(
         run_dir=resolved_run_dir,
@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 from coach.utils import clamp
@@ -41,7 +42,7 @@ _EFFECTIVE_PROBABILITY_SCALES = _EffectiveProbabilityScales()
 
 
 class ServeMix(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     short: float = Field(..., ge=0.0, le=1.0)
     flick: float = Field(..., ge=0.0, le=1.0)
@@ -55,7 +56,7 @@ class ServeMix(BaseModel):
 
 
 class RallyStyleMix(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     attack: float = Field(..., ge=0.0, le=1.0)
     neutral: float = Field(..., ge=0.0, le=1.0)
@@ -70,7 +71,7 @@ class RallyStyleMix(BaseModel):
 
 
 class InfluenceWeights(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     w_short: float = Field(..., gt=0.0, le=0.3)
     w_attack: float = Field(..., gt=0.0, le=0.3)
@@ -89,7 +90,7 @@ class InfluenceWeights(BaseModel):
 
 
 class PlayerParams(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     player_id: str
     name: str
@@ -122,7 +123,7 @@ class PlayerParams(BaseModel):
 
 
 class MatchupParams(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     player_a: PlayerParams
     player_b: PlayerParams
@@ -286,14 +287,20 @@ class MatchupParams(BaseModel):
     ) -> "MatchupParams":
         a = self.player_a
 
+        # The clamps below keep both mixes in range and summing to one, so the
+        # derived mixes skip re-validation, as the model_copy calls already do.
         short = clamp(a.serve_mix.short + serve_short_delta, 0.01, 0.99)
-        serve_mix = ServeMix(short=short, flick=1.0 - short)
+        serve_mix = ServeMix.model_construct(short=short, flick=1.0 - short)
 
         attack = clamp(a.rally_style.attack + attack_delta, 0.01, 0.98)
-        remain_old = max(a.rally_style.neutral + a.rally_style.safe, 1e-6)
-        neutral = (a.rally_style.neutral / remain_old) * (1.0 - attack)
-        safe = (a.rally_style.safe / remain_old) * (1.0 - attack)
-        rally_style = RallyStyleMix(attack=attack, neutral=neutral, safe=safe)
+        remain_old = a.rally_style.neutral + a.rally_style.safe
+        if remain_old < 1e-6:
+            # No neutral/safe share to scale (an all-attack player): split the remainder evenly.
+            neutral = safe = (1.0 - attack) / 2.0
+        else:
+            neutral = (a.rally_style.neutral / remain_old) * (1.0 - attack)
+            safe = (a.rally_style.safe / remain_old) * (1.0 - attack)
+        rally_style = RallyStyleMix.model_construct(attack=attack, neutral=neutral, safe=safe)
 
         new_a = a.model_copy(
             update={
@@ -330,6 +337,48 @@ class MatchupParams(BaseModel):
             + abs(a_now.rally_tolerance - a_base.rally_tolerance)
         )
 
+    def adjustment_l1_changes(self, deltas: np.ndarray) -> np.ndarray:
+        """
+        Vectorized ``with_adjustments(...).l1_change_from(self)`` for many candidates.
+
+        *deltas* is an ``(n, 8)`` array whose columns follow the keyword order of
+        :meth:`with_adjustments`. Clamping and summation order mirror the scalar path,
+        so results match it exactly without building ``n`` model copies.
+        """
+        a = self.player_a
+        d = np.asarray(deltas, dtype=float).reshape(-1, 8)
+
+        short = np.clip(a.serve_mix.short + d[:, 0], 0.01, 0.99)
+        flick = 1.0 - short
+        attack = np.clip(a.rally_style.attack + d[:, 1], 0.01, 0.98)
+        remain_old = max(a.rally_style.neutral + a.rally_style.safe, 1e-6)
+        neutral = (a.rally_style.neutral / remain_old) * (1.0 - attack)
+        safe = (a.rally_style.safe / remain_old) * (1.0 - attack)
+        unforced_error = np.clip(a.unforced_error_rate + d[:, 2], 0.01, 0.6)
+        return_pressure = np.clip(a.return_pressure + d[:, 3], 0.01, 0.99)
+        clutch = np.clip(a.clutch_point_win + d[:, 4], 0.01, 0.99)
+        short_serve = np.clip(a.short_serve_skill + d[:, 5], 0.01, 0.99)
+        long_serve = np.clip(a.long_serve_skill + d[:, 5], 0.01, 0.99)
+        net_error = np.clip(a.net_error_rate - d[:, 6], 0.0, 1.0)
+        out_error = np.clip(a.out_error_rate - d[:, 6], 0.0, 1.0)
+        rally_tolerance = np.clip(a.rally_tolerance + d[:, 7], 0.01, 0.99)
+
+        return (
+            np.abs(short - a.serve_mix.short)
+            + np.abs(flick - a.serve_mix.flick)
+            + np.abs(attack - a.rally_style.attack)
+            + np.abs(neutral - a.rally_style.neutral)
+            + np.abs(safe - a.rally_style.safe)
+            + np.abs(unforced_error - a.unforced_error_rate)
+            + np.abs(return_pressure - a.return_pressure)
+            + np.abs(clutch - a.clutch_point_win)
+            + np.abs(short_serve - a.short_serve_skill)
+            + np.abs(long_serve - a.long_serve_skill)
+            + np.abs(net_error - a.net_error_rate)
+            + np.abs(out_error - a.out_error_rate)
+            + np.abs(rally_tolerance - a.rally_tolerance)
+        )
+
     def to_template_context(self) -> dict[str, Any]:
         eff = self.effective_probabilities()
         scale = 10000
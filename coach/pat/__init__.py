@@ -1,11 +1,13 @@
-from .mock_pat import mock_probability, mock_run
-from .parser import parse_probability, read_pat_output
+from .mock_pat import mock_probability, mock_probability_batch, mock_run
+from .parser import parse_probability, parse_probability_file, read_pat_output
 from .runner import run_pat
 
 __all__ = [
     "mock_probability",
+    "mock_probability_batch",
     "mock_run",
     "parse_probability",
+    "parse_probability_file",
     "read_pat_output",
     "run_pat",
 ]
@@ -3,7 +3,9 @@ from __future__ import annotations
 import math
 import re
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
+
+import numpy as np
 
 _CANONICAL_PARAM_KEYS = (
     "pA_srv_win",
@@ -33,8 +35,10 @@ _ACCEPTED_PARAM_KEYS = _CANONICAL_PARAM_KEYS + tuple(_LEGACY_PARAM_ALIASES)
 
 def _compile_param_pattern() -> re.Pattern[str]:
     accepted_keys = sorted((re.escape(key) for key in _ACCEPTED_PARAM_KEYS), key=len, reverse=True)
+    # The first-character lookahead lets the scanner skip positions before trying every alternative.
+    first_chars = "".join(sorted({key[0].lower() for key in _ACCEPTED_PARAM_KEYS}))
     return re.compile(
-        rf"\b({'|'.join(accepted_keys)})\b"
+        rf"\b(?=[{first_chars}])({'|'.join(accepted_keys)})\b"
         rf"\s*[:=]\s*([+-]?(?:\d*\.\d+|\d+))",
         flags=re.IGNORECASE,
     )
@@ -70,8 +74,8 @@ def _get_param(params: dict[str, Any], key: str, *, legacy_key: str | None = Non
     return default
 
 
-def mock_probability(params: dict[str, Any]) -> float:
-    """Deterministic monotonic mapping from rally params to match win probability."""
+def _mock_inputs(params: dict[str, Any]) -> tuple[float, float, float, float, float, float, float, float]:
+    """Serve/receive win rates and the six A-vs-B edges that feed the mock's linear score."""
 
     params = _normalize_params(params)
 
@@ -93,6 +97,13 @@ def mock_probability(params: dict[str, Any]) -> float:
         params, "return_pressure_B", default=0.5
     )
     clutch_edge = _get_param(params, "clutch_A", default=0.5) - _get_param(params, "clutch_B", default=0.5)
+    return p_a_srv, p_a_rcv, serve_edge, attack_edge, safe_edge, ue_edge, return_edge, clutch_edge
+
+
+def mock_probability(params: dict[str, Any]) -> float:
+    """Deterministic monotonic mapping from rally params to match win probability."""
+
+    p_a_srv, p_a_rcv, serve_edge, attack_edge, safe_edge, ue_edge, return_edge, clutch_edge = _mock_inputs(params)
 
     linear = (
         2.8 * (p_a_srv - 0.5)
@@ -108,18 +119,88 @@ def mock_probability(params: dict[str, Any]) -> float:
     return max(0.01, min(0.99, probability))
 
 
+def mock_probability_batch(params_list: Iterable[dict[str, Any]]) -> np.ndarray:
+    """``mock_probability`` for many param dicts, with the linear score computed column-wise.
+
+    Terms are combined in the same order as the scalar path and the logistic uses ``math.exp``,
+    so every element equals ``mock_probability`` of the same dict.
+    """
+    inputs = np.array([_mock_inputs(params) for params in params_list], dtype=float).reshape(-1, 8)
+    p_a_srv, p_a_rcv, serve_edge, attack_edge, safe_edge, ue_edge, return_edge, clutch_edge = inputs.T
+
+    linear = (
+        2.8 * (p_a_srv - 0.5)
+        + 2.2 * (p_a_rcv - 0.5)
+        + 0.7 * serve_edge
+        + 0.9 * attack_edge
+        - 0.6 * safe_edge
+        + 0.9 * ue_edge
+        + 0.7 * return_edge
+        + 0.5 * clutch_edge
+    )
+    probability = np.fromiter((_logistic(value) for value in linear.tolist()), dtype=float, count=len(linear))
+    return np.clip(probability, 0.01, 0.99)
+
+
+_LOWER_PARAM_KEYS = tuple(key.lower() for key in _ACCEPTED_PARAM_KEYS)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _number_end(text: str, start: int) -> int:
+    """End of the signed decimal at *start* (the grammar ``_PARAM_PATTERN`` accepts), else *start*."""
+    size = len(text)
+    digits_start = start + 1 if start < size and text[start] in "+-" else start
+    end = digits_start
+    while end < size and text[end].isdigit():
+        end += 1
+    if end + 1 < size and text[end] == "." and text[end + 1].isdigit():
+        end += 2
+        while end < size and text[end].isdigit():
+            end += 1
+    return end if end > digits_start else start
+
+
 def _extract_params_from_pcsp(pcsp_text: str) -> dict[str, float]:
-    params: dict[str, float] = {}
-    for match in _PARAM_PATTERN.finditer(pcsp_text):
-        raw_key = match.group(1)
-        value = float(match.group(2))
-        key = _normalize_param_key(raw_key)
-        params[key] = value
-    return params
+    """``key = number`` / ``key: number`` pairs for the mock's known keys; the last occurrence wins.
+
+    ASCII text (every rendered template) is scanned with ``str.find`` per key, which beats the
+    regex alternation; anything else goes through ``_PARAM_PATTERN`` for full Unicode semantics.
+    """
+    if not pcsp_text.isascii():
+        return {_normalize_param_key(raw_key): float(value) for raw_key, value in _PARAM_PATTERN.findall(pcsp_text)}
+
+    lowered = pcsp_text.lower()
+    size = len(pcsp_text)
+    hits: list[tuple[int, str, float]] = []
+    for key in _LOWER_PARAM_KEYS:
+        start = lowered.find(key)
+        while start != -1:
+            end = start + len(key)
+            if (start == 0 or not _is_word_char(pcsp_text[start - 1])) and (
+                end == size or not _is_word_char(pcsp_text[end])
+            ):
+                pos = end
+                while pos < size and pcsp_text[pos].isspace():
+                    pos += 1
+                if pos < size and pcsp_text[pos] in ":=":
+                    pos += 1
+                    while pos < size and pcsp_text[pos].isspace():
+                        pos += 1
+                    value_end = _number_end(pcsp_text, pos)
+                    if value_end > pos:
+                        hits.append((start, key, float(pcsp_text[pos:value_end])))
+            start = lowered.find(key, start + 1)
+    hits.sort()
+    return {_PARAM_KEY_LOOKUP[key]: value for _, key, value in hits}
 
 
 def mock_run(pcsp_path: Path, out_path: Path) -> dict[str, Any]:
-    pcsp_text = pcsp_path.read_text(encoding="utf-8", errors="replace")
+    # One binary read plus a single decode: the parameter scan treats "\r" as whitespace, so
+    # text-mode newline translation (and its wrapper) buys nothing here.
+    pcsp_text = pcsp_path.read_bytes().decode("utf-8", errors="replace")
     params = _extract_params_from_pcsp(pcsp_text)
     probability = mock_probability(params)
 
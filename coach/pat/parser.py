@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import mmap
+import os
 import re
 from pathlib import Path
+from typing import Any, Iterator
 
-_PROB_CONTEXT_PATTERN = re.compile(r"(?is)(?:prob(?:ability)?|with\s+prob)")
+# Probability keywords. ASCII input is searched for them with ``rfind`` (see _context_ends);
+# the pattern is the reference and still handles text with non-ASCII characters.
+_PROB_CONTEXT_PATTERN = re.compile(r"(?is)(?=[pw])(?:prob(?:ability)?|with\s+prob)")
 _NUMBER_PATTERN = re.compile(r"[+-]?(?:\d*\.\d+|\d+)(?:[eE][+-]?\d+)?")
+# Byte twin of the number pattern, for scanning output files in place. It agrees with the
+# text path unless a file holds bytes that decoding or newline translation would change, or
+# that only ``str`` patterns treat as whitespace; such files take the text path.
+_NUMBER_BYTES_PATTERN = re.compile(_NUMBER_PATTERN.pattern.encode("ascii"))
+_TEXT_ONLY_BYTES_PATTERN = re.compile(rb"[\r\x1c-\x1f\x80-\xff]")
 
 
 def parse_probability(text: str) -> float:
@@ -19,27 +29,30 @@ def parse_probability(text: str) -> float:
     If multiple contextual matches exist, the last one is used.
     """
 
-    values: list[float] = []
-    for context_match in _PROB_CONTEXT_PATTERN.finditer(text):
-        segment_start = context_match.end()
-        line_end = text.find("\n", segment_start)
-        if line_end == -1:
-            line_end = len(text)
+    value = _scan_probability(text, _NUMBER_PATTERN, "\n")
+    if value is not None:
+        return value
 
-        line_segment = text[segment_start:line_end]
-        line_values = _extract_probabilities(line_segment)
-        if line_values:
-            values.extend(line_values)
-            continue
+    raise ValueError(f"Could not parse probability from PAT output. Excerpt: {_excerpt(text)}")
 
-        # Fallback for unusual formatting where the numeric value follows on next characters.
-        nearby_segment = text[segment_start : min(len(text), segment_start + 40)]
-        values.extend(_extract_probabilities(nearby_segment))
 
-    if values:
-        return values[-1]
+def parse_probability_file(path: Path) -> float:
+    """:func:`parse_probability` for a PAT output file.
 
-    raise ValueError(f"Could not parse probability from PAT output. Excerpt: {_excerpt(text)}")
+    Plain ASCII output (the usual case) is scanned in place through ``mmap``, without
+    decoding it into a string. Other files, and files without a probability, go through
+    :func:`read_pat_output` so the result and the error excerpt match the text path.
+    """
+
+    with open(path, "rb") as handle:
+        # Empty files cannot be mapped; they fall through to the text path's error.
+        if os.fstat(handle.fileno()).st_size > 0:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                if _TEXT_ONLY_BYTES_PATTERN.search(view) is None:
+                    value = _scan_probability(view, _NUMBER_BYTES_PATTERN, b"\n")
+                    if value is not None:
+                        return value
+    return parse_probability(read_pat_output(path))
 
 
 def read_pat_output(path: Path) -> str:
@@ -62,10 +75,59 @@ def _excerpt(text: str, max_len: int = 180) -> str:
     return compact[: max_len - 3] + "..."
 
 
-def _extract_probabilities(segment: str) -> list[float]:
-    values: list[float] = []
-    for number_match in _NUMBER_PATTERN.finditer(segment):
+def _scan_probability(text: Any, number_pattern: re.Pattern[Any], newline: Any) -> float | None:
+    # Only the last contextual value matters, so walk the keyword hits backwards and stop at
+    # the first one that yields a probability; numbers are scanned in place via pos/endpos.
+    # *text* is a ``str`` or, with the byte pattern, any bytes-like buffer such as an mmap.
+    for segment_start in _context_ends(text):
+        line_end = text.find(newline, segment_start)
+        if line_end == -1:
+            line_end = len(text)
+
+        value = _last_probability(text, number_pattern, segment_start, line_end)
+        if value is None:
+            # Fallback for unusual formatting where the numeric value follows on next characters.
+            value = _last_probability(text, number_pattern, segment_start, min(len(text), segment_start + 40))
+        if value is not None:
+            return value
+    return None
+
+
+def _context_ends(text: Any) -> Iterator[int]:
+    """End offsets of the ``_PROB_CONTEXT_PATTERN`` hits in *text*, last hit first.
+
+    ASCII text (byte buffers reach here only when ASCII) is lower-cased once and searched
+    backwards for "prob"; each occurrence is one hit, as none can overlap another. Other
+    text runs the pattern, whose case folding also maps a few non-ASCII letters.
+    """
+    if isinstance(text, str):
+        if not text.isascii():
+            yield from reversed([match.end() for match in _PROB_CONTEXT_PATTERN.finditer(text)])
+            return
+        folded, prob, ability, with_ = text.lower(), "prob", "ability", "with"
+    else:
+        folded, prob, ability, with_ = bytes(text).lower(), b"prob", b"ability", b"with"
+
+    start = folded.rfind(prob)
+    while start != -1:
+        before = start
+        while before and folded[before - 1 : before].isspace():
+            before -= 1
+        if before < start and folded.endswith(with_, 0, before):
+            # "with\s+prob" ends at "prob" even when "ability" follows.
+            yield start + 4
+        elif folded.startswith(ability, start + 4):
+            yield start + 11
+        else:
+            yield start + 4
+        start = folded.rfind(prob, 0, start)
+
+
+def _last_probability(text: Any, number_pattern: re.Pattern[Any], start: int, end: int) -> float | None:
+    """Last number in ``text[start:end]`` that lies in [0, 1], without slicing *text*."""
+    last: float | None = None
+    for number_match in number_pattern.finditer(text, start, end):
         value = float(number_match.group(0))
         if 0.0 <= value <= 1.0:
-            values.append(value)
-    return values
+            last = value
+    return last
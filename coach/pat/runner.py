@@ -1,17 +1,54 @@
 from __future__ import annotations
 
-import json
+import fnmatch
+import hashlib
+import mmap
 import os
+import re
 import shutil
 import subprocess
 import textwrap
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Literal
 
 from coach.config import CoachConfig
 from coach.pat.mock_pat import mock_run
-from coach.pat.parser import parse_probability, read_pat_output
+from coach.pat.parser import parse_probability_file, read_pat_output
+from coach.utils import write_json
+
+_ARTIFACT_BUFFER_BYTES = 64 * 1024
+_LOG_EXCERPT_BYTES = 64 * 1024
+
+_MODEL_ERROR_PATTERN = re.compile(
+    r"parsing error:|runtime exception occurred:|error occurred:|invalid file name:|invalid folder name:"
+    r"|invalid arguments\.",
+    re.IGNORECASE,
+)
+_NON_WHITESPACE_PATTERN = re.compile(r"\S")
+# The separators str.splitlines() breaks on.
+_LINE_BOUNDARY_PATTERN = re.compile("[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+_MODEL_ERROR_BYTES_PATTERN = re.compile(_MODEL_ERROR_PATTERN.pattern.encode("ascii"), re.IGNORECASE)
+_LINE_BREAK_BYTES_PATTERN = re.compile(rb"[\r\n]")
+_PAT_USAGE_PATTERN = re.compile(r"for all modules except uml:", re.IGNORECASE)
+_INVALID_ARGUMENTS_PATTERN = re.compile(r"invalid arguments\.", re.IGNORECASE)
+_NESC_STARTUP_SYMPTOM_PATTERN = re.compile(
+    r"invalid image|object reference not set to an instance of an object", re.IGNORECASE
+)
+# Checked in order: the first pattern found in stdout or stderr picks the hint.
+_OUTPUT_HINTS: tuple[tuple[re.Pattern[str], str], ...] = (
+    (
+        re.compile(r"invalid arguments\. invalid image", re.IGNORECASE),
+        "PAT3.Console under Mono can fail due NESC startup checks. "
+        "The runner will attempt a compatibility shim automatically; if this still fails, install full Mono (with mcs) or use PAT4.",
+    ),
+    (
+        re.compile(r"object reference not set to an instance of an object", re.IGNORECASE),
+        "This is usually PAT3 NESC startup failure on Mono. "
+        "Try setting PAT_CONSOLE_PATH to PAT3.Console.exe and let the runner apply compatibility fallback.",
+    ),
+)
 
 
 def run_pat(
@@ -22,8 +59,12 @@ def run_pat(
     pat_console_path: Path | None,
     timeout_s: int,
     use_mono: bool | None,
+    write_summary: bool = True,
 ) -> dict:
-    """Run PAT Console in real or deterministic mock mode."""
+    """Run PAT Console in real or deterministic mock mode.
+
+    Pass ``write_summary=False`` when the caller writes its own ``summary.json`` or discards the run directory.
+    """
 
     pcsp_path = pcsp_path.expanduser().resolve()
     out_path = out_path.expanduser().resolve()
@@ -36,8 +77,8 @@ def run_pat(
 
     if mode == "mock":
         result = mock_run(pcsp_path=pcsp_path, out_path=out_path)
-        stdout_path.write_text(str(result.get("stdout", "")), encoding="utf-8")
-        stderr_path.write_text(str(result.get("stderr", "")), encoding="utf-8")
+        _write_artifact(stdout_path, str(result.get("stdout", "")))
+        _write_artifact(stderr_path, str(result.get("stderr", "")))
         payload = {
             "ok": True,
             "returncode": 0,
@@ -47,8 +88,9 @@ def run_pat(
             "pat_out_path": str(out_path),
             "probability": result.get("probability"),
         }
-        pat_run_json.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-        _write_summary(summary_json=summary_json, probability=result.get("probability"))
+        write_json(pat_run_json, payload)
+        if write_summary:
+            _write_summary(summary_json=summary_json, probability=result.get("probability"))
         return payload
 
     if mode != "real":
@@ -75,11 +117,13 @@ def run_pat(
         )
 
     resolved_use_mono = _resolve_use_mono(use_mono=use_mono, pat_console_path=resolved_pat_path)
+    # Read once per run; the command builders and the mcs lookup all share it.
+    mono_path = CoachConfig.from_env().mono_path if resolved_use_mono else None
     base_cmd = _build_pat_command(
         pat_console_path=resolved_pat_path,
         pcsp_path=pcsp_path,
         out_path=out_path,
-        use_mono=resolved_use_mono,
+        mono_path=mono_path,
     )
 
     try:
@@ -91,6 +135,7 @@ def run_pat(
             timeout_s=timeout_s,
             use_mono=resolved_use_mono,
             cwd=resolved_pat_path.parent,
+            log_paths=_attempt_log_paths(run_dir, 1),
         )
         attempts.append(primary)
 
@@ -105,46 +150,41 @@ def run_pat(
                 compat_console = _prepare_pat3_mono_compat_runtime(
                     pat_console_path=resolved_pat_path,
                     run_dir=run_dir,
+                    mono_path=mono_path or "mono",
                 )
                 compat_cmd = _build_pat_command(
                     pat_console_path=compat_console,
                     pcsp_path=pcsp_path,
                     out_path=out_path,
-                    use_mono=resolved_use_mono,
+                    mono_path=mono_path,
                 )
                 compat = _run_pat_command(
                     cmd=compat_cmd,
                     timeout_s=timeout_s,
                     use_mono=resolved_use_mono,
                     cwd=compat_console.parent,
+                    log_paths=_attempt_log_paths(run_dir, len(attempts) + 1),
                 )
                 attempts.append(compat)
             except Exception as exc:
                 fallback_error = str(exc)
 
-        attempt_meta = _write_attempt_logs(run_dir=run_dir, attempts=attempts)
+        attempt_meta = _attempt_metadata(attempts)
         selected = attempts[-1]
         stdout = selected.stdout
         stderr = selected.stderr
-        stdout_path.write_text(stdout, encoding="utf-8")
-        stderr_path.write_text(stderr, encoding="utf-8")
+        _link_or_copy(selected.stdout_path, stdout_path)
+        _link_or_copy(selected.stderr_path, stderr_path)
 
-        model_error = _extract_pat_model_error(stdout=stdout, stderr=stderr)
+        # Scan the full logs; the decoded excerpts in ``stdout``/``stderr`` may skip the middle of long runs.
+        model_error = _log_model_error(selected.stdout_path) or _log_model_error(selected.stderr_path)
         probability: float | None = None
         if out_path.exists():
             try:
-                pat_out_text = read_pat_output(out_path)
-            except Exception:
-                pat_out_text = ""
-            if not pat_out_text.strip():
+                probability = parse_probability_file(out_path)
+            except Exception as exc:
                 if model_error is None:
-                    model_error = "PAT produced an empty output file."
-            else:
-                try:
-                    probability = parse_probability(pat_out_text)
-                except ValueError as exc:
-                    if model_error is None:
-                        model_error = str(exc)
+                    model_error = _unparsed_output_error(out_path, exc)
         elif selected.returncode == 0 and model_error is None:
             model_error = "PAT did not produce the expected output file."
 
@@ -153,7 +193,7 @@ def run_pat(
         payload: dict[str, object] = {
             "ok": ok,
             "returncode": selected.returncode,
-            "cmd": [str(part) for part in selected.cmd],
+            "cmd": selected.cmd,
             "stdout_path": str(stdout_path),
             "stderr_path": str(stderr_path),
             "pat_out_path": str(out_path),
@@ -176,16 +216,17 @@ def run_pat(
                 )
             payload["error"] = message
 
-        pat_run_json.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-        _write_summary(summary_json=summary_json, probability=probability)
+        write_json(pat_run_json, payload)
+        if write_summary:
+            _write_summary(summary_json=summary_json, probability=probability)
         return payload
     except FileNotFoundError:
-        stdout_path.write_text("", encoding="utf-8")
-        stderr_path.write_text("", encoding="utf-8")
+        _write_artifact(stdout_path, "")
+        _write_artifact(stderr_path, "")
         payload = {
             "ok": False,
             "returncode": -1,
-            "cmd": [str(part) for part in base_cmd],
+            "cmd": base_cmd,
             "stdout_path": str(stdout_path),
             "stderr_path": str(stderr_path),
             "pat_out_path": str(out_path),
@@ -195,27 +236,32 @@ def run_pat(
                 "Mono is installed and available on PATH when required."
             ),
         }
-        pat_run_json.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-        _write_summary(summary_json=summary_json, probability=None)
+        write_json(pat_run_json, payload)
+        if write_summary:
+            _write_summary(summary_json=summary_json, probability=None)
         return payload
     except subprocess.TimeoutExpired as exc:
-        stdout = (exc.stdout or "") if isinstance(exc.stdout, str) else ""
-        stderr = (exc.stderr or "") if isinstance(exc.stderr, str) else ""
-        stdout_path.write_text(stdout, encoding="utf-8")
-        stderr_path.write_text(stderr, encoding="utf-8")
+        # The child wrote straight into the attempt logs, so expose that partial output for diagnosis.
+        if isinstance(exc, _PATTimeoutExpired):
+            _link_or_copy(exc.log_paths[0], stdout_path)
+            _link_or_copy(exc.log_paths[1], stderr_path)
+        else:
+            _write_artifact(stdout_path, "")
+            _write_artifact(stderr_path, "")
 
         payload = {
             "ok": False,
             "returncode": -1,
-            "cmd": [str(part) for part in base_cmd],
+            "cmd": base_cmd,
             "stdout_path": str(stdout_path),
             "stderr_path": str(stderr_path),
             "pat_out_path": str(out_path),
             "probability": None,
             "error": f"PAT timed out after {timeout_s}s",
         }
-        pat_run_json.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-        _write_summary(summary_json=summary_json, probability=None)
+        write_json(pat_run_json, payload)
+        if write_summary:
+            _write_summary(summary_json=summary_json, probability=None)
         return payload
 
 
@@ -225,22 +271,35 @@ def resolve_pat_console_path(pat_console_path: Path) -> Path:
     expanded = pat_console_path.expanduser()
     if not expanded.exists():
         return expanded.resolve(strict=False)
+    return _resolve_existing_console_path(str(expanded))
+
+
+_KNOWN_CONSOLE_NAMES = ("PAT.Console.exe", "PAT3.Console.exe", "PAT4.Console.exe")
+
+
+@lru_cache(maxsize=32)
+def _resolve_existing_console_path(path: str) -> Path:
+    """Stat/glob probing for an existing PAT path, memoised because batch runs reuse one install."""
+    expanded = Path(path)
     if expanded.is_file():
         return expanded.resolve()
 
-    candidates = (
-        "PAT.Console.exe",
-        "PAT3.Console.exe",
-        "PAT4.Console.exe",
-    )
-    for name in candidates:
-        candidate = expanded / name
-        if candidate.exists():
-            return candidate.resolve()
+    try:
+        with os.scandir(expanded) as entries:
+            names = [entry.name for entry in entries]
+    except OSError:
+        return expanded.resolve()
 
-    globbed = sorted(expanded.glob("*Console*.exe"))
-    if len(globbed) == 1:
-        return globbed[0].resolve()
+    # One directory listing serves both the known-name probe and the *Console*.exe fallback.
+    by_case = {os.path.normcase(name): name for name in names}
+    for known in _KNOWN_CONSOLE_NAMES:
+        name = by_case.get(os.path.normcase(known))
+        if name is not None:
+            return (expanded / name).resolve()
+
+    matched = [name for name in names if fnmatch.fnmatch(name, "*Console*.exe")]
+    if len(matched) == 1:
+        return (expanded / matched[0]).resolve()
 
     return expanded.resolve()
 
@@ -256,20 +315,31 @@ def _build_pat_command(
     pat_console_path: Path,
     pcsp_path: Path,
     out_path: Path,
-    use_mono: bool,
+    mono_path: str | None,
 ) -> list[str]:
-    if use_mono:
-        settings = CoachConfig.from_env()
-        return [settings.mono_path, str(pat_console_path), "-pcsp", str(pcsp_path), str(out_path)]
+    if mono_path is not None:
+        return [mono_path, str(pat_console_path), "-pcsp", str(pcsp_path), str(out_path)]
     return [str(pat_console_path), "-pcsp", str(pcsp_path), str(out_path)]
 
 
+class _PATTimeoutExpired(subprocess.TimeoutExpired):
+    """``TimeoutExpired`` that also names the attempt logs holding the partial PAT output."""
+
+    def __init__(self, exc: subprocess.TimeoutExpired, log_paths: tuple[Path, Path]) -> None:
+        super().__init__(exc.cmd, exc.timeout)
+        self.log_paths = log_paths
+
+
 @dataclass(frozen=True)
 class _PATCommandResult:
+    """One PAT invocation; ``stdout``/``stderr`` hold the decoded head and tail of the on-disk logs."""
+
     cmd: list[str]
     returncode: int
     stdout: str
     stderr: str
+    stdout_path: Path
+    stderr_path: Path
 
 
 def _run_pat_command(
@@ -278,45 +348,65 @@ def _run_pat_command(
     timeout_s: int,
     use_mono: bool,
     cwd: Path,
+    log_paths: tuple[Path, Path],
 ) -> _PATCommandResult:
-    proc_env = os.environ.copy()
-    if use_mono:
-        proc_env.pop("MONO_PATH", None)
-
-    proc = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        timeout=timeout_s,
-        check=False,
-        env=proc_env,
-        cwd=str(cwd),
-    )
+    # Inherit the parent environment unless MONO_PATH has to be hidden from Mono.
+    proc_env: dict[str, str] | None = None
+    if use_mono and "MONO_PATH" in os.environ:
+        proc_env = {key: value for key, value in os.environ.items() if key != "MONO_PATH"}
+
+    stdout_path, stderr_path = log_paths
+    # PAT traces can be very large, so the child writes straight into the attempt logs.
+    with (
+        open(stdout_path, "wb", buffering=_ARTIFACT_BUFFER_BYTES) as stdout_file,
+        open(stderr_path, "wb", buffering=_ARTIFACT_BUFFER_BYTES) as stderr_file,
+    ):
+        # No preexec_fn/user/group/umask/new-session kwargs: those would force CPython from
+        # vfork back to a full fork of the interpreter for every launch.
+        proc = subprocess.Popen(cmd, stdout=stdout_file, stderr=stderr_file, env=proc_env, cwd=str(cwd))
+        try:
+            returncode = proc.wait(timeout=timeout_s)
+        except subprocess.TimeoutExpired as exc:
+            proc.kill()
+            proc.wait()
+            raise _PATTimeoutExpired(exc, log_paths) from exc
     return _PATCommandResult(
-        cmd=[str(part) for part in cmd],
-        returncode=proc.returncode,
-        stdout=proc.stdout or "",
-        stderr=proc.stderr or "",
+        cmd=cmd,
+        returncode=returncode,
+        stdout=_read_log_excerpt(stdout_path),
+        stderr=_read_log_excerpt(stderr_path),
+        stdout_path=stdout_path,
+        stderr_path=stderr_path,
     )
 
 
-def _write_attempt_logs(run_dir: Path, attempts: list[_PATCommandResult]) -> list[dict[str, object]]:
-    metadata: list[dict[str, object]] = []
-    for idx, attempt in enumerate(attempts, start=1):
-        out = run_dir / f"pat_stdout_attempt{idx}.txt"
-        err = run_dir / f"pat_stderr_attempt{idx}.txt"
-        out.write_text(attempt.stdout, encoding="utf-8")
-        err.write_text(attempt.stderr, encoding="utf-8")
-        metadata.append(
-            {
-                "index": idx,
-                "cmd": [str(part) for part in attempt.cmd],
-                "returncode": attempt.returncode,
-                "stdout_path": str(out),
-                "stderr_path": str(err),
-            }
-        )
-    return metadata
+def _read_log_excerpt(path: Path) -> str:
+    """Decode a PAT log, keeping only its first and last ``_LOG_EXCERPT_BYTES`` when it is large."""
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size <= 2 * _LOG_EXCERPT_BYTES:
+            raw = handle.read()
+        else:
+            head = handle.read(_LOG_EXCERPT_BYTES)
+            handle.seek(-_LOG_EXCERPT_BYTES, os.SEEK_END)
+            raw = head + b"\n" + handle.read()
+    return raw.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _attempt_log_paths(run_dir: Path, idx: int) -> tuple[Path, Path]:
+    return run_dir / f"pat_stdout_attempt{idx}.txt", run_dir / f"pat_stderr_attempt{idx}.txt"
+
+
+def _attempt_metadata(attempts: list[_PATCommandResult]) -> list[dict[str, object]]:
+    return [
+        {
+            "index": idx,
+            "cmd": attempt.cmd,
+            "returncode": attempt.returncode,
+            "stdout_path": str(attempt.stdout_path),
+            "stderr_path": str(attempt.stderr_path),
+        }
+        for idx, attempt in enumerate(attempts, start=1)
+    ]
 
 
 def _should_try_pat3_mono_compat_fallback(
@@ -335,33 +425,43 @@ def _should_try_pat3_mono_compat_fallback(
     if "pat3.console" not in pat_console_path.name.lower():
         return False
 
-    combined = f"{stdout}\n{stderr}".lower()
-    has_pat_usage = "for all modules except uml:" in combined
-    has_nesc_startup_symptom = (
-        "invalid arguments." in combined
-        and ("invalid image" in combined or "object reference not set to an instance of an object" in combined)
-    )
+    def seen(pattern: re.Pattern[str]) -> bool:
+        return pattern.search(stdout) is not None or pattern.search(stderr) is not None
+
+    has_pat_usage = seen(_PAT_USAGE_PATTERN)
+    has_nesc_startup_symptom = seen(_INVALID_ARGUMENTS_PATTERN) and seen(_NESC_STARTUP_SYMPTOM_PATTERN)
     return has_pat_usage and has_nesc_startup_symptom
 
 
-def _prepare_pat3_mono_compat_runtime(*, pat_console_path: Path, run_dir: Path) -> Path:
+def _prepare_pat3_mono_compat_runtime(*, pat_console_path: Path, run_dir: Path, mono_path: str) -> Path:
     """Create isolated PAT runtime and inject a NESC shim for PAT3-on-Mono compatibility."""
 
     compat_root = run_dir / "pat3_mono_compat_runtime"
     if compat_root.exists():
         shutil.rmtree(compat_root)
-    shutil.copytree(pat_console_path.parent, compat_root)
+    # Hardlink the install's binaries instead of copying them; configs and other data files are copied,
+    # since PAT may rewrite them at runtime. Every binary written into compat_root below is unlinked
+    # first, so a write never reaches the original install through a shared inode.
+    shutil.copytree(pat_console_path.parent, compat_root, copy_function=_link_or_copy_file)
 
     shim_src = compat_root / "Modules" / "NESC" / "nesc_shim.cs"
     shim_src.parent.mkdir(parents=True, exist_ok=True)
-    shim_src.write_text(_nesc_shim_source(), encoding="utf-8")
+    shim_src.unlink(missing_ok=True)
+    shim_src.write_bytes(_NESC_SHIM_SOURCE_BYTES)
 
     shim_out = (compat_root / "Modules" / "NESC" / "PAT.Module.NESC.dll").resolve()
     pat_common = (compat_root / "PAT.Common.dll").resolve()
     shim_src_abs = shim_src.resolve()
+    shim_out.unlink(missing_ok=True)
+
+    mcs_path = _resolve_mcs_path(mono_path)
+    cached_dll = _shim_cache_dir() / f"nesc_shim_{_shim_cache_key(pat_common, mcs_path)}.dll"
+    if cached_dll.is_file():
+        shutil.copyfile(cached_dll, shim_out)
+        return compat_root / pat_console_path.name
 
     mcs_cmd = [
-        _resolve_mcs_path(),
+        mcs_path,
         "-target:library",
         f"-out:{shim_out}",
         f"-r:{pat_common}",
@@ -389,14 +489,54 @@ def _prepare_pat3_mono_compat_runtime(*, pat_console_path: Path, run_dir: Path)
         detail = _first_nonempty_line(mcs_proc.stderr or "") or _first_nonempty_line(mcs_proc.stdout or "")
         raise RuntimeError(f"Failed to compile PAT3 NESC shim. {detail or 'Unknown compile failure.'}")
 
+    _store_compiled_shim(shim_out, cached_dll)
     return compat_root / pat_console_path.name
 
 
-def _resolve_mcs_path() -> str:
-    settings = CoachConfig.from_env()
-    mono_path = Path(settings.mono_path).expanduser()
-    if mono_path.is_absolute():
-        sibling = mono_path.with_name("mcs")
+_LINKABLE_SUFFIXES = frozenset({".dll", ".exe"})
+
+
+def _link_or_copy_file(source: str, target: str) -> None:
+    if Path(source).suffix.lower() in _LINKABLE_SUFFIXES:
+        try:
+            os.link(source, target)
+            return
+        except OSError:
+            pass
+    shutil.copy2(source, target)
+
+
+def _shim_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ai-coach"
+
+
+def _shim_cache_key(pat_common: Path, mcs_path: str) -> str:
+    """Digest of everything the compiled shim depends on: its source, PAT.Common.dll and the compiler."""
+    try:
+        stat = pat_common.stat()
+        common: list[object] = [stat.st_size, stat.st_mtime_ns]
+    except OSError:
+        common = [None, None]
+    material = "\0".join([_NESC_SHIM_SOURCE, mcs_path, *map(str, common)]).encode("utf-8")
+    return hashlib.blake2b(material, digest_size=16).hexdigest()
+
+
+def _store_compiled_shim(shim_out: Path, cached_dll: Path) -> None:
+    """Best-effort copy of a freshly compiled shim into the user cache; concurrent writers are harmless."""
+    try:
+        cached_dll.parent.mkdir(parents=True, exist_ok=True)
+        partial = cached_dll.with_name(f"{cached_dll.name}.{os.getpid()}.tmp")
+        shutil.copyfile(shim_out, partial)
+        os.replace(partial, cached_dll)
+    except OSError:
+        pass
+
+
+def _resolve_mcs_path(mono_path: str) -> str:
+    mono = Path(mono_path).expanduser()
+    if mono.is_absolute():
+        sibling = mono.with_name("mcs")
         if sibling.exists():
             return str(sibling)
 
@@ -406,93 +546,119 @@ def _resolve_mcs_path() -> str:
     return "mcs"
 
 
-def _nesc_shim_source() -> str:
-    return textwrap.dedent(
-        """\
-        using System;
-        using System.Collections.Generic;
-        using PAT.Common;
-        using PAT.Common.Classes.ModuleInterface;
+_NESC_SHIM_SOURCE = textwrap.dedent(
+    """\
+    using System;
+    using System.Collections.Generic;
+    using PAT.Common;
+    using PAT.Common.Classes.ModuleInterface;
 
-        namespace PAT.NESC
+    namespace PAT.NESC
+    {
+        // PAT3 console invokes these methods on startup even when using non-NESC modules.
+        public static class NCSetting
         {
-            // PAT3 console invokes these methods on startup even when using non-NESC modules.
-            public static class NCSetting
-            {
-                public static void SetBufferSize(int size) {}
-                public static void SetAbstractionLevel(int level) {}
-            }
+            public static void SetBufferSize(int size) {}
+            public static void SetAbstractionLevel(int level) {}
+        }
 
-            // Optional no-op facade so reflective module loading remains valid.
-            public sealed class ModuleFacade : ModuleFacadeBase
+        // Optional no-op facade so reflective module loading remains valid.
+        public sealed class ModuleFacade : ModuleFacadeBase
+        {
+            protected override SpecificationBase InstanciateSpecification(string text, string options, string filePath)
             {
-                protected override SpecificationBase InstanciateSpecification(string text, string options, string filePath)
-                {
-                    throw new NotSupportedException("NESC shim is compatibility-only.");
-                }
-
-                public override string ModuleName => "NESC";
-                public override List<string> GetTemplateTypes() => new List<string>();
-                public override SortedList<string, string> GetTemplateNames(string type) => new SortedList<string, string>();
-                public override string GetTemplateModel(string templateName) => string.Empty;
+                throw new NotSupportedException("NESC shim is compatibility-only.");
             }
+
+            public override string ModuleName => "NESC";
+            public override List<string> GetTemplateTypes() => new List<string>();
+            public override SortedList<string, string> GetTemplateNames(string type) => new SortedList<string, string>();
+            public override string GetTemplateModel(string templateName) => string.Empty;
         }
-        """
-    )
+    }
+    """
+)
+_NESC_SHIM_SOURCE_BYTES = _NESC_SHIM_SOURCE.encode("utf-8")
 
 
 def _write_summary(*, summary_json: Path, probability: float | None) -> None:
-    summary_json.write_text(
-        json.dumps(
-            {
-                "question": None,
-                "players": None,
-                "params_used": None,
-                "probability": probability,
-            },
-            indent=2,
-        ),
-        encoding="utf-8",
+    write_json(
+        summary_json,
+        {
+            "question": None,
+            "players": None,
+            "params_used": None,
+            "probability": probability,
+        },
     )
 
 
+def _write_artifact(path: Path, text: str) -> None:
+    """Write a run artifact through one buffered handle, so it lands in a single ``write()``."""
+    with open(path, "w", encoding="utf-8", buffering=_ARTIFACT_BUFFER_BYTES) as handle:
+        handle.write(text)
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Expose an already-written log under *target* without re-encoding it: hardlink, else copy."""
+    target.unlink(missing_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
 def _first_nonempty_line(text: str) -> str | None:
-    for raw in text.splitlines():
-        line = raw.strip()
-        if line:
-            return line
-    return None
+    # The first non-whitespace character sits on the first non-empty line; only that line is sliced.
+    first = _NON_WHITESPACE_PATTERN.search(text)
+    if first is None:
+        return None
+    boundary = _LINE_BOUNDARY_PATTERN.search(text, first.start())
+    return text[first.start() : boundary.start() if boundary is not None else len(text)].strip()
 
 
 def _extract_pat_model_error(*, stdout: str, stderr: str) -> str | None:
-    signals = (
-        "parsing error:",
-        "runtime exception occurred:",
-        "error occurred:",
-        "invalid file name:",
-        "invalid folder name:",
-        "invalid arguments.",
-    )
-    for raw in f"{stdout}\n{stderr}".splitlines():
-        line = raw.strip()
-        if not line:
+    for text in (stdout, stderr):
+        if _MODEL_ERROR_PATTERN.search(text) is None:
             continue
-        lowered = line.lower()
-        if any(token in lowered for token in signals):
-            return line
+        for raw in text.splitlines():
+            line = raw.strip()
+            if line and _MODEL_ERROR_PATTERN.search(line):
+                return line
     return None
 
 
+def _log_model_error(path: Path) -> str | None:
+    """``_extract_pat_model_error`` for one log file, matched on raw bytes so clean logs are never decoded."""
+    try:
+        with open(path, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size == 0:
+                return None
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                match = _MODEL_ERROR_BYTES_PATTERN.search(view)
+                if match is None:
+                    return None
+                line_start = max(view.rfind(b"\n", 0, match.start()), view.rfind(b"\r", 0, match.start())) + 1
+                line_break = _LINE_BREAK_BYTES_PATTERN.search(view, match.end())
+                line_end = line_break.start() if line_break is not None else len(view)
+                return view[line_start:line_end].decode("utf-8", errors="replace").strip()
+    except (OSError, ValueError):
+        return None
+
+
+def _unparsed_output_error(out_path: Path, exc: Exception) -> str:
+    """Error for a PAT output file that yielded no probability; blank or unreadable files are called empty."""
+    try:
+        blank = not read_pat_output(out_path).strip()
+    except Exception:
+        blank = True
+    if blank or not isinstance(exc, ValueError):
+        return "PAT produced an empty output file."
+    return str(exc)
+
+
 def _infer_hint_from_output(*, stdout: str, stderr: str) -> str | None:
-    combined = f"{stdout}\n{stderr}".lower()
-    if "invalid arguments. invalid image" in combined:
-        return (
-            "PAT3.Console under Mono can fail due NESC startup checks. "
-            "The runner will attempt a compatibility shim automatically; if this still fails, install full Mono (with mcs) or use PAT4."
-        )
-    if "object reference not set to an instance of an object" in combined:
-        return (
-            "This is usually PAT3 NESC startup failure on Mono. "
-            "Try setting PAT_CONSOLE_PATH to PAT3.Console.exe and let the runner apply compatibility fallback."
-        )
+    for pattern, hint in _OUTPUT_HINTS:
+        if pattern.search(stdout) or pattern.search(stderr):
+            return hint
     return None
@@ -2,23 +2,103 @@ from __future__ import annotations
 
 import csv
 import datetime as dt
-from dataclasses import dataclass
+import hashlib
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
 from coach.config import CoachConfig
 from coach.data.adapters.local_csv import LocalCSVAdapter
 from coach.data.stats_builder import MatchupStats, build_matchup_params
 from coach.model.builder import ModelBuildResult, build_matchup_model
-from coach.model.params import MatchupParams
+from coach.model.params import InfluenceWeights, MatchupParams
 from coach.pat.mock_pat import mock_probability
-from coach.pat.parser import parse_probability, read_pat_output
-from coach.pat.runner import run_pat
+from coach.pat.parser import parse_probability_file
+from coach.pat.runner import resolve_pat_console_path, run_pat
 from coach.runs import new_run_dir
-from coach.utils import write_json
-
-
-@dataclass(frozen=True)
+from coach.utils import iter_ordered_map, read_json, write_json
+
+# Real PAT runs are deterministic in the PCSP bytes and console setup, and they dominate
+# strategy sweeps; reuse their outputs in-process and across restarts (under runs_root).
+# Entries hold full PAT logs, so the in-process copy is an LRU bounded to the most recent runs.
+_PAT_RESULT_CACHE: OrderedDict[str, dict[str, Any]] = OrderedDict()
+_PAT_RESULT_CACHE_MAX_ENTRIES = 256
+# Cached stdout/stderr keep this many bytes from each end; full traces can run to hundreds of MB.
+_CACHED_LOG_BYTES = 32 * 1024
+_PAT_CACHE_ENTRY_KEYS = frozenset({"probability", "returncode", "cmd", "stdout", "stderr", "pat_output"})
+_PAT_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def _get_memory_pat_result(cache_key: str) -> dict[str, Any] | None:
+    with _PAT_RESULT_CACHE_LOCK:
+        entry = _PAT_RESULT_CACHE.get(cache_key)
+        if entry is not None:
+            _PAT_RESULT_CACHE.move_to_end(cache_key)
+        return entry
+
+
+def _remember_pat_result(cache_key: str, entry: dict[str, Any]) -> None:
+    with _PAT_RESULT_CACHE_LOCK:
+        _PAT_RESULT_CACHE[cache_key] = entry
+        _PAT_RESULT_CACHE.move_to_end(cache_key)
+        while len(_PAT_RESULT_CACHE) > _PAT_RESULT_CACHE_MAX_ENTRIES:
+            _PAT_RESULT_CACHE.popitem(last=False)
+
+
+def _pat_cache_key(*, pcsp_path: Path, pat_console: Path | None, use_mono: bool) -> str:
+    digest = hashlib.blake2b(pcsp_path.read_bytes(), digest_size=16)
+    # The console's mtime/size stand in for its version, so upgrading PAT in place misses the cache.
+    console_stat: tuple[int, int] | None = None
+    if pat_console is not None:
+        try:
+            stat = resolve_pat_console_path(pat_console).stat()
+            console_stat = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+    digest.update(f"\0{pat_console}\0{use_mono}\0{console_stat}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _read_cached_log(path: Path) -> str:
+    """Decode a PAT log for the result cache, keeping only its head and tail when it is large."""
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size <= 2 * _CACHED_LOG_BYTES:
+            raw = handle.read()
+        else:
+            head = handle.read(_CACHED_LOG_BYTES)
+            handle.seek(-_CACHED_LOG_BYTES, os.SEEK_END)
+            marker = f"\n[... {size - 2 * _CACHED_LOG_BYTES} bytes omitted from cached PAT log ...]\n"
+            raw = head + marker.encode("utf-8") + handle.read()
+    return raw.decode("utf-8", errors="replace")
+
+
+def _artifact_dumps(params: MatchupParams, weights: InfluenceWeights) -> tuple[dict[str, Any], dict[str, Any]]:
+    params_dump = params.model_dump()
+    # build_matchup_params hands the same weights to the params and the stats, so the params
+    # dump already holds the stats.json weights; write_json serializes both dicts right away.
+    weights_dump = params_dump["weights"] if weights is params.weights else weights.model_dump()
+    return params_dump, weights_dump
+
+
+@lru_cache(maxsize=16)
+def _resolve_pat_target(config: CoachConfig, pat_path: str | None) -> tuple[Path | None, bool]:
+    # Resolved once per (config, override) rather than for every candidate in a sweep.
+    pat_console = Path(pat_path).expanduser() if pat_path else config.pat_console_path
+    return pat_console, config.resolve_use_mono(pat_console)
+
+
+@dataclass(frozen=True, slots=True)
 class PATExecution:
     ok: bool
     returncode: int
@@ -44,7 +124,7 @@ class PATExecution:
         return payload
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PredictionResult:
     run_id: str
     run_dir: Path
@@ -58,7 +138,7 @@ class PredictionResult:
     pat: PATExecution
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StrategyCandidate:
     rank: int
     serve_short_delta: float
@@ -73,7 +153,23 @@ class StrategyCandidate:
     probability: float
 
 
-@dataclass(frozen=True)
+_TOP_ALTERNATIVES_COLUMNS = (
+    "rank",
+    "serve_short_delta",
+    "attack_delta",
+    "unforced_error_delta",
+    "return_pressure_delta",
+    "clutch_delta",
+    "serve_effectiveness_delta",
+    "error_profile_delta",
+    "rally_tolerance_delta",
+    "l1_change",
+    "probability",
+)
+_top_alternative_row = attrgetter(*_TOP_ALTERNATIVES_COLUMNS)
+
+
+@dataclass(frozen=True, slots=True)
 class StrategyAdjustment:
     serve_short_delta: float = 0.0
     attack_delta: float = 0.0
@@ -110,7 +206,64 @@ class StrategyAdjustment:
         )
 
 
-@dataclass(frozen=True)
+# Strategy search grid; baseline-independent, so it is built once at import time.
+_KNOB_STEPS: dict[str, tuple[float, ...]] = {
+    "serve_short_delta": (-0.08, -0.05, -0.03, -0.02, -0.01, 0.01, 0.02, 0.03, 0.05, 0.08),
+    "attack_delta": (-0.08, -0.05, -0.03, -0.02, -0.01, 0.01, 0.02, 0.03, 0.05, 0.08),
+    "unforced_error_delta": (-0.06, -0.04, -0.03, -0.02, -0.01, 0.01, 0.02, 0.03, 0.04, 0.06),
+    "return_pressure_delta": (-0.06, -0.04, -0.03, -0.02, -0.01, 0.01, 0.02, 0.03, 0.04, 0.06),
+    "clutch_delta": (-0.04, -0.03, -0.02, -0.01, 0.01, 0.02, 0.03, 0.04),
+    "serve_effectiveness_delta": (-0.04, -0.03, -0.02, -0.01, 0.01, 0.02, 0.03, 0.04),
+    "error_profile_delta": (-0.04, -0.03, -0.02, -0.01, 0.01, 0.02, 0.03, 0.04),
+    "rally_tolerance_delta": (-0.04, -0.03, -0.02, -0.01, 0.01, 0.02, 0.03, 0.04),
+}
+_PAIR_KNOBS: tuple[tuple[str, str], ...] = (
+    ("serve_short_delta", "attack_delta"),
+    ("serve_short_delta", "unforced_error_delta"),
+    ("serve_short_delta", "return_pressure_delta"),
+    ("attack_delta", "unforced_error_delta"),
+    ("attack_delta", "clutch_delta"),
+    ("return_pressure_delta", "clutch_delta"),
+    ("serve_effectiveness_delta", "error_profile_delta"),
+    ("serve_effectiveness_delta", "rally_tolerance_delta"),
+    ("error_profile_delta", "rally_tolerance_delta"),
+)
+_PAIR_STEPS: dict[str, tuple[float, ...]] = {
+    k: tuple(d for d in values if abs(d) <= 0.03) for k, values in _KNOB_STEPS.items()
+}
+_ORDERED_KNOBS: tuple[str, ...] = tuple(_KNOB_STEPS)
+
+
+def _build_candidate_rows() -> tuple[tuple[float, ...], ...]:
+    """Single-knob then paired-knob delta rows in search order, deduplicated."""
+    rows: list[tuple[float, ...]] = []
+    seen: set[tuple[float, ...]] = set()
+
+    def _maybe_add(changes: dict[str, float]) -> None:
+        row = tuple(changes.get(knob, 0.0) for knob in _ORDERED_KNOBS)
+        key = tuple(round(value, 6) for value in row)
+        if key not in seen:
+            seen.add(key)
+            rows.append(row)
+
+    for knob, steps in _KNOB_STEPS.items():
+        for delta in steps:
+            _maybe_add({knob: delta})
+
+    for knob_1, knob_2 in _PAIR_KNOBS:
+        for delta_1 in _PAIR_STEPS[knob_1]:
+            for delta_2 in _PAIR_STEPS[knob_2]:
+                _maybe_add({knob_1: delta_1, knob_2: delta_2})
+    return tuple(rows)
+
+
+_CANDIDATE_ROWS = _build_candidate_rows()
+_CANDIDATE_DELTAS = np.array(_CANDIDATE_ROWS, dtype=float)
+_CANDIDATE_MAGNITUDES = np.array([sum(abs(value) for value in row) for row in _CANDIDATE_ROWS], dtype=float)
+_CANDIDATE_KWARGS = tuple(dict(zip(_ORDERED_KNOBS, row)) for row in _CANDIDATE_ROWS)
+
+
+@dataclass(frozen=True, slots=True)
 class StrategyResult:
     run_id: str
     run_dir: Path
@@ -209,7 +362,11 @@ class BadmintonCoachService:
         pat_path: str | None = None,
         timeout_s: int | None = None,
         as_of_date: str | None = None,
+        early_stop_k: int | None = None,
+        early_stop_margin: float = 0.05,
     ) -> StrategyResult:
+        if early_stop_k is not None and early_stop_k < 1:
+            raise ValueError(f"early_stop_k must be at least 1, got {early_stop_k}.")
         run_name, run_dir = self._make_run_dir(prefix="strategy", run_id=run_id)
 
         params, stats = build_matchup_params(
@@ -220,24 +377,25 @@ class BadmintonCoachService:
             as_of_date=as_of_date,
         )
 
-        baseline_model = build_matchup_model(
-            params=params,
-            template_name=self.template_name,
-            out_path=run_dir / "baseline.pcsp",
-        )
-
-        baseline_pat = self._execute_pat(
-            pcsp_path=baseline_model.matchup_pcsp_path,
-            run_dir=run_dir,
-            mode=mode,
-            pat_path=pat_path,
-            timeout_s=timeout_s,
-        )
-        if baseline_pat.probability is None:
-            raise RuntimeError(
-                "Could not parse baseline probability from PAT output. "
-                f"See {baseline_pat.pat_out_path}."
+        def _run_baseline() -> PATExecution:
+            baseline_model = build_matchup_model(
+                params=params,
+                template_name=self.template_name,
+                out_path=run_dir / "baseline.pcsp",
             )
+            baseline_pat = self._execute_pat(
+                pcsp_path=baseline_model.matchup_pcsp_path,
+                run_dir=run_dir,
+                mode=mode,
+                pat_path=pat_path,
+                timeout_s=timeout_s,
+            )
+            if baseline_pat.probability is None:
+                raise RuntimeError(
+                    "Could not parse baseline probability from PAT output. "
+                    f"See {baseline_pat.pat_out_path}."
+                )
+            return baseline_pat
 
         candidates = self._generate_candidates(params, l1_bound=l1_bound)
         selected_candidates = self._select_candidates_for_budget(
@@ -250,22 +408,56 @@ class BadmintonCoachService:
         candidate_dir = run_dir / "candidates"
         candidate_dir.mkdir(parents=True, exist_ok=True)
 
-        for idx, (candidate, adjusted) in enumerate(selected_candidates, start=1):
-            cand_path = candidate_dir / f"candidate_{idx:03d}.pcsp"
+        def _run_candidate(idx: int, adjusted: MatchupParams) -> PATExecution:
+            # Candidates share candidate_dir, so a params.json per build would only be overwritten.
             build = build_matchup_model(
                 params=adjusted,
                 template_name=self.template_name,
-                out_path=cand_path,
+                out_path=candidate_dir / f"candidate_{idx:03d}.pcsp",
+                write_params=False,
             )
-
-            cand_run_dir = candidate_dir / f"candidate_{idx:03d}"
-            pat_exec = self._execute_pat(
+            return self._execute_pat(
                 pcsp_path=build.matchup_pcsp_path,
-                run_dir=cand_run_dir,
+                run_dir=candidate_dir / f"candidate_{idx:03d}",
                 mode=mode,
                 pat_path=pat_path,
                 timeout_s=timeout_s,
             )
+
+        indexed = list(enumerate((adjusted for _, adjusted in selected_candidates), start=1))
+        workers = min(self.config.pat_max_workers, len(indexed) + 1)
+        if early_stop_k is not None:
+            # Hits are measured against the baseline, so it has to finish before the candidates.
+            baseline_pat = _run_baseline()
+            threshold = baseline_pat.probability + early_stop_margin
+            executions = []
+            hits = 0
+            with closing(
+                iter_ordered_map(
+                    lambda item: _run_candidate(*item),
+                    indexed,
+                    max_workers=workers if mode == "real" else 1,
+                )
+            ) as results:
+                # Closing the iterator early cancels candidates that have not started yet.
+                for pat_exec in results:
+                    executions.append(pat_exec)
+                    if pat_exec.probability is not None and pat_exec.probability >= threshold:
+                        hits += 1
+                        if hits >= early_stop_k:
+                            break
+        elif mode == "real" and workers > 1:
+            # Real PAT runs are independent subprocesses, so overlap them; mock mode is pure Python.
+            # The baseline is only needed once candidates are ranked, so it runs alongside them.
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                baseline_future = pool.submit(_run_baseline)
+                executions = list(pool.map(lambda item: _run_candidate(*item), indexed))
+                baseline_pat = baseline_future.result()
+        else:
+            baseline_pat = _run_baseline()
+            executions = [_run_candidate(idx, adjusted) for idx, adjusted in indexed]
+
+        for (candidate, adjusted), pat_exec in zip(selected_candidates, executions):
             if pat_exec.probability is None:
                 continue
 
@@ -350,25 +542,32 @@ class BadmintonCoachService:
         timeout_s: int | None,
     ) -> PATExecution:
         out_path = run_dir / "pat_output.txt"
-        pat_console = Path(pat_path).expanduser() if pat_path else self.config.pat_console_path
+        pat_console, use_mono = self.resolve_pat_target(pat_path)
         resolved_timeout = timeout_s or self.config.pat_timeout_s
-        use_mono = self.config.resolve_use_mono(pat_console)
 
-        result = run_pat(
-            pcsp_path=pcsp_path,
-            out_path=out_path,
-            mode=mode,
-            pat_console_path=pat_console,
-            timeout_s=resolved_timeout,
-            use_mono=use_mono,
+        cache_key = (
+            _pat_cache_key(pcsp_path=pcsp_path, pat_console=pat_console, use_mono=use_mono)
+            if mode == "real"
+            else None
         )
+        result = self._load_cached_pat_result(cache_key, run_dir=run_dir, out_path=out_path)
+        if result is None:
+            result = run_pat(
+                pcsp_path=pcsp_path,
+                out_path=out_path,
+                mode=mode,
+                pat_console_path=pat_console,
+                timeout_s=resolved_timeout,
+                use_mono=use_mono,
+            )
+            self._store_cached_pat_result(cache_key, result)
 
         raw_probability = result.get("probability")
         probability = float(raw_probability) if raw_probability is not None else None
         parse_error: str | None = None
         if probability is None and out_path.exists():
             try:
-                probability = parse_probability(read_pat_output(out_path))
+                probability = parse_probability_file(out_path)
             except Exception as exc:
                 parse_error = str(exc)
 
@@ -389,6 +588,89 @@ class BadmintonCoachService:
             error=error,
         )
 
+    @property
+    def _pat_cache_dir(self) -> Path:
+        return self.runs_root / ".pat_cache"
+
+    def _load_cached_pat_result(self, cache_key: str | None, *, run_dir: Path, out_path: Path) -> dict | None:
+        """Replay a cached real-PAT result into *run_dir*; ``None`` on a cache miss."""
+        if cache_key is None:
+            return None
+        entry = _get_memory_pat_result(cache_key)
+        if entry is None:
+            cache_file = self._pat_cache_dir / f"{cache_key}.json"
+            if not cache_file.exists():
+                return None
+            try:
+                entry = read_json(cache_file)
+            except (OSError, ValueError):
+                return None
+            # A well-formed but incomplete (or older-format) file is a miss, not an error.
+            if not isinstance(entry, dict) or not _PAT_CACHE_ENTRY_KEYS <= entry.keys():
+                return None
+            _remember_pat_result(cache_key, entry)
+
+        # Strategy candidates get their run_dir from run_pat on a miss, so replays create it too.
+        run_dir.mkdir(parents=True, exist_ok=True)
+        stdout_path = run_dir / "pat_stdout.txt"
+        stderr_path = run_dir / "pat_stderr.txt"
+        stdout_path.write_text(entry["stdout"], encoding="utf-8")
+        stderr_path.write_text(entry["stderr"], encoding="utf-8")
+        out_path.write_text(entry["pat_output"], encoding="utf-8")
+        payload = {
+            "ok": True,
+            "returncode": entry["returncode"],
+            "cmd": entry["cmd"],
+            "stdout_path": str(stdout_path),
+            "stderr_path": str(stderr_path),
+            "pat_out_path": str(out_path),
+            "probability": entry["probability"],
+            "cached": True,
+        }
+        write_json(run_dir / "pat_run.json", payload)
+        return payload
+
+    def _store_cached_pat_result(self, cache_key: str | None, result: dict) -> None:
+        if cache_key is None or not result.get("ok") or result.get("probability") is None:
+            return
+        try:
+            entry = {
+                "probability": float(result["probability"]),
+                "returncode": int(result.get("returncode", 0)),
+                "cmd": [str(part) for part in result.get("cmd", [])],
+                "stdout": _read_cached_log(Path(str(result["stdout_path"]))),
+                "stderr": _read_cached_log(Path(str(result["stderr_path"]))),
+                "pat_output": Path(str(result["pat_out_path"])).read_text(encoding="utf-8"),
+            }
+        except (KeyError, OSError, ValueError):
+            return
+        _remember_pat_result(cache_key, entry)
+        try:
+            self._pat_cache_dir.mkdir(parents=True, exist_ok=True)
+            write_json(self._pat_cache_dir / f"{cache_key}.json", entry)
+        except OSError:
+            pass
+
+    def resolve_pat_target(self, pat_path: str | None = None) -> tuple[Path | None, bool]:
+        """The PAT console (``pat_path`` or the configured one) and whether it runs under mono."""
+        return _resolve_pat_target(self.config, pat_path)
+
+    def warmup(self) -> None:
+        """Load the player and match tables and build their lookup indexes ahead of the first request."""
+        adapter = self.adapter
+        # Reading each cached property builds and stores it; the values themselves are not needed here.
+        _ = (adapter.player_name_tables, adapter.player_id_index, adapter.match_row_index)
+
+    def clear_pat_cache(self) -> None:
+        """Forget cached real-PAT results, in memory and under ``runs_root/.pat_cache``.
+
+        Call this after replacing the PAT install in place or editing cached outputs by hand; the
+        cache key covers the PCSP bytes, console path and mono setting, not the install's contents.
+        """
+        with _PAT_RESULT_CACHE_LOCK:
+            _PAT_RESULT_CACHE.clear()
+        shutil.rmtree(self._pat_cache_dir, ignore_errors=True)
+
     def _make_run_dir(self, prefix: str, run_id: str | None) -> tuple[str, Path]:
         if run_id is not None:
             run_dir = self.runs_root / run_id
@@ -410,97 +692,35 @@ class BadmintonCoachService:
         if len(candidates) <= limit:
             return [(candidate, candidate.apply_to(baseline)) for candidate in candidates]
 
-        prepared: list[tuple[float, float, StrategyAdjustment, MatchupParams]] = []
-        for candidate in candidates:
-            adjusted = candidate.apply_to(baseline)
-            prepared.append(
-                (
-                    self._estimate_candidate_probability(adjusted),
-                    adjusted.l1_change_from(baseline),
-                    candidate,
-                    adjusted,
-                )
-            )
+        adjusted_params = [candidate.apply_to(baseline) for candidate in candidates]
+        proxy_scores = np.fromiter(
+            (self._estimate_candidate_probability(adjusted) for adjusted in adjusted_params),
+            dtype=float,
+            count=len(adjusted_params),
+        )
+        l1_changes = np.fromiter(
+            (adjusted.l1_change_from(baseline) for adjusted in adjusted_params),
+            dtype=float,
+            count=len(adjusted_params),
+        )
 
-        prepared.sort(key=lambda item: (-item[0], item[1]))
-        return [(candidate, adjusted) for _, _, candidate, adjusted in prepared[:limit]]
+        # Highest proxy score first, smallest L1 change as tie-break (lexsort is stable).
+        order = np.lexsort((l1_changes, -proxy_scores))[:limit]
+        return [(candidates[idx], adjusted_params[idx]) for idx in order.tolist()]
 
     def _generate_candidates(self, baseline: MatchupParams, l1_bound: float) -> list[StrategyAdjustment]:
-        knob_steps: dict[str, list[float]] = {
-            "serve_short_delta": [-0.08, -0.05, -0.03, -0.02, -0.01, 0.01, 0.02, 0.03, 0.05, 0.08],
-            "attack_delta": [-0.08, -0.05, -0.03, -0.02, -0.01, 0.01, 0.02, 0.03, 0.05, 0.08],
-            "unforced_error_delta": [-0.06, -0.04, -0.03, -0.02, -0.01, 0.01, 0.02, 0.03, 0.04, 0.06],
-            "return_pressure_delta": [-0.06, -0.04, -0.03, -0.02, -0.01, 0.01, 0.02, 0.03, 0.04, 0.06],
-            "clutch_delta": [-0.04, -0.03, -0.02, -0.01, 0.01, 0.02, 0.03, 0.04],
-            "serve_effectiveness_delta": [-0.04, -0.03, -0.02, -0.01, 0.01, 0.02, 0.03, 0.04],
-            "error_profile_delta": [-0.04, -0.03, -0.02, -0.01, 0.01, 0.02, 0.03, 0.04],
-            "rally_tolerance_delta": [-0.04, -0.03, -0.02, -0.01, 0.01, 0.02, 0.03, 0.04],
-        }
-        pair_knobs = [
-            ("serve_short_delta", "attack_delta"),
-            ("serve_short_delta", "unforced_error_delta"),
-            ("serve_short_delta", "return_pressure_delta"),
-            ("attack_delta", "unforced_error_delta"),
-            ("attack_delta", "clutch_delta"),
-            ("return_pressure_delta", "clutch_delta"),
-            ("serve_effectiveness_delta", "error_profile_delta"),
-            ("serve_effectiveness_delta", "rally_tolerance_delta"),
-            ("error_profile_delta", "rally_tolerance_delta"),
+        # L1 changes for every grid row in one vectorized pass; only rows within the bound are kept.
+        l1_changes = baseline.adjustment_l1_changes(_CANDIDATE_DELTAS)
+        kept = np.flatnonzero(l1_changes <= l1_bound + 1e-9)
+        # Stable sort by (l1, magnitude), matching the previous tuple-key sort.
+        order = kept[np.lexsort((_CANDIDATE_MAGNITUDES[kept], l1_changes[kept]))]
+        return [
+            StrategyAdjustment(**_CANDIDATE_KWARGS[idx], l1_change=l1)
+            for idx, l1 in zip(order.tolist(), l1_changes[order].tolist())
         ]
-        pair_steps = {k: [d for d in values if abs(d) <= 0.03] for k, values in knob_steps.items()}
-
-        candidates: list[StrategyAdjustment] = []
-        seen: set[tuple[float, ...]] = set()
-        ordered_knobs = list(knob_steps.keys())
-
-        def _maybe_add(changes: dict[str, float]) -> None:
-            payload = {k: 0.0 for k in ordered_knobs}
-            payload.update(changes)
-            candidate = StrategyAdjustment(
-                serve_short_delta=payload["serve_short_delta"],
-                attack_delta=payload["attack_delta"],
-                unforced_error_delta=payload["unforced_error_delta"],
-                return_pressure_delta=payload["return_pressure_delta"],
-                clutch_delta=payload["clutch_delta"],
-                serve_effectiveness_delta=payload["serve_effectiveness_delta"],
-                error_profile_delta=payload["error_profile_delta"],
-                rally_tolerance_delta=payload["rally_tolerance_delta"],
-            )
-            key = candidate.as_key()
-            if key in seen:
-                return
-
-            adjusted = candidate.apply_to(baseline)
-            l1 = adjusted.l1_change_from(baseline)
-            if l1 <= l1_bound + 1e-9:
-                candidates.append(StrategyAdjustment(**{**candidate.__dict__, "l1_change": l1}))
-                seen.add(key)
-
-        for knob, steps in knob_steps.items():
-            for delta in steps:
-                _maybe_add({knob: delta})
-
-        for knob_1, knob_2 in pair_knobs:
-            for delta_1 in pair_steps[knob_1]:
-                for delta_2 in pair_steps[knob_2]:
-                    _maybe_add({knob_1: delta_1, knob_2: delta_2})
-
-        def _magnitude(candidate: StrategyAdjustment) -> float:
-            return (
-                abs(candidate.serve_short_delta)
-                + abs(candidate.attack_delta)
-                + abs(candidate.unforced_error_delta)
-                + abs(candidate.return_pressure_delta)
-                + abs(candidate.clutch_delta)
-                + abs(candidate.serve_effectiveness_delta)
-                + abs(candidate.error_profile_delta)
-                + abs(candidate.rally_tolerance_delta)
-            )
-
-        candidates.sort(key=lambda c: (c.l1_change, _magnitude(c)))
-        return candidates
 
     def _write_prediction_artifacts(self, result: PredictionResult, window: int, as_of_date: str | None) -> None:
+        params_dump, weights_dump = _artifact_dumps(result.params, result.stats.weights)
         write_json(
             result.run_dir / "inputs.json",
             {
@@ -519,7 +739,7 @@ class BadmintonCoachService:
                 "player_a": result.stats.player_a_stats,
                 "player_b": result.stats.player_b_stats,
                 "head_to_head": result.stats.head_to_head,
-                "weights": result.stats.weights.model_dump(),
+                "weights": weights_dump,
             },
         )
         write_json(
@@ -539,7 +759,7 @@ class BadmintonCoachService:
             {
                 "question": f"Predict win probability: {result.player_a} vs {result.player_b}",
                 "players": [result.player_a, result.player_b],
-                "params_used": result.params.model_dump(),
+                "params_used": params_dump,
                 "probability": result.probability,
                 "timestamps": {
                     "generated_utc": dt.datetime.now(dt.UTC).isoformat(),
@@ -554,6 +774,7 @@ class BadmintonCoachService:
         window: int,
         as_of_date: str | None,
     ) -> None:
+        params_dump, weights_dump = _artifact_dumps(result.params_baseline, stats.weights)
         write_json(
             result.run_dir / "inputs.json",
             {
@@ -572,7 +793,7 @@ class BadmintonCoachService:
                 "player_a": stats.player_a_stats,
                 "player_b": stats.player_b_stats,
                 "head_to_head": stats.head_to_head,
-                "weights": stats.weights.model_dump(),
+                "weights": weights_dump,
             },
         )
         write_json(
@@ -582,8 +803,8 @@ class BadmintonCoachService:
                 "baseline_probability": result.baseline_probability,
                 "improved_probability": result.improved_probability,
                 "delta": result.delta,
-                "best_candidate": result.best_candidate.__dict__,
-                "top_alternatives": [c.__dict__ for c in result.top_alternatives],
+                "best_candidate": asdict(result.best_candidate),
+                "top_alternatives": [asdict(c) for c in result.top_alternatives],
             },
         )
         write_json(
@@ -591,7 +812,7 @@ class BadmintonCoachService:
             {
                 "question": f"Strategy optimization: {result.player_a} vs {result.player_b}",
                 "players": [result.player_a, result.player_b],
-                "params_used": result.params_baseline.model_dump(),
+                "params_used": params_dump,
                 "probability": {
                     "baseline": result.baseline_probability,
                     "improved": result.improved_probability,
@@ -605,22 +826,6 @@ class BadmintonCoachService:
 
         csv_path = result.run_dir / "top_alternatives.csv"
         with csv_path.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(
-                f,
-                fieldnames=[
-                    "rank",
-                    "serve_short_delta",
-                    "attack_delta",
-                    "unforced_error_delta",
-                    "return_pressure_delta",
-                    "clutch_delta",
-                    "serve_effectiveness_delta",
-                    "error_profile_delta",
-                    "rally_tolerance_delta",
-                    "l1_change",
-                    "probability",
-                ],
-            )
-            writer.writeheader()
-            for cand in result.top_alternatives:
-                writer.writerow(cand.__dict__)
+            writer = csv.writer(f)
+            writer.writerow(_TOP_ALTERNATIVES_COLUMNS)
+            writer.writerows(map(_top_alternative_row, result.top_alternatives))
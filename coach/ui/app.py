@@ -1,6 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import json
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from functools import partial
 from typing import Any
 
 from dotenv import load_dotenv
@@ -14,12 +20,34 @@ from coach.service import BadmintonCoachService
 
 load_dotenv(override=True)
 
-app = FastAPI(title="AI Badminton Coach")
 service = BadmintonCoachService()
 llm_client = LLMClient()
 chat_executor = AgentExecutor(service=service, llm_client=llm_client)
 
 
+async def _run_blocking(func: Any, /, **kwargs: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(app.state.work_pool, partial(func, **kwargs))
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # PAT-backed routes run on their own pool so long sweeps cannot exhaust the threadpool
+    # that serves the cheap routes. Threads, not processes: the service caches live in-process.
+    work_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="coach-ui")
+    app.state.work_pool = work_pool
+    try:
+        # Parse the CSVs and build the lookup indexes before the first request, not during it.
+        await _run_blocking(service.warmup)
+        app.state.service = service
+        yield
+    finally:
+        work_pool.shutdown(wait=True, cancel_futures=True)
+
+
+app = FastAPI(title="AI Badminton Coach", lifespan=_lifespan)
+
+
 class PredictRequest(BaseModel):
     a: str
     b: str
@@ -41,6 +69,10 @@ class ChatRequest(BaseModel):
     window: int = Field(default=30, ge=1, le=500)
     budget: int = Field(default=60, ge=1, le=1000)
     show_trace: bool = False
+    include_trace: bool = Field(
+        default=True,
+        description="Return the tool trace in the response; clients that do not render it can pass false.",
+    )
 
 
 def _render_home() -> str:
@@ -965,6 +997,8 @@ def _render_home() -> str:
               budget: Number(document.getElementById("chat-budget").value),
               show_trace: document.getElementById("show-trace").value === "true",
             }};
+            // The trace carries full per-player stats, so only ask for it when it will be rendered.
+            payload.include_trace = payload.show_trace;
             addBubble("user", payload.query);
             try {{
               const result = await postJson("/chat", payload);
@@ -1063,9 +1097,11 @@ def players() -> dict[str, list[str]]:
 
 
 @app.post("/predict")
-def predict(req: PredictRequest) -> dict[str, Any]:
+async def predict(req: PredictRequest) -> dict[str, Any]:
     try:
-        result = service.predict(player_a=req.a, player_b=req.b, window=req.window, mode=req.mode)
+        result = await _run_blocking(
+            service.predict, player_a=req.a, player_b=req.b, window=req.window, mode=req.mode
+        )
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     return {
@@ -1079,9 +1115,10 @@ def predict(req: PredictRequest) -> dict[str, Any]:
 
 
 @app.post("/strategy")
-def strategy(req: StrategyRequest) -> dict[str, Any]:
+async def strategy(req: StrategyRequest) -> dict[str, Any]:
     try:
-        result = service.strategy(
+        result = await _run_blocking(
+            service.strategy,
             player_a=req.a,
             player_b=req.b,
             window=req.window,
@@ -1098,17 +1135,18 @@ def strategy(req: StrategyRequest) -> dict[str, Any]:
         "baseline_probability": result.baseline_probability,
         "improved_probability": result.improved_probability,
         "delta": result.delta,
-        "best_candidate": result.best_candidate.__dict__,
-        "top_alternatives": [cand.__dict__ for cand in result.top_alternatives],
+        "best_candidate": asdict(result.best_candidate),
+        "top_alternatives": [asdict(cand) for cand in result.top_alternatives],
         "mode": result.mode,
     }
 
 
 @app.post("/chat")
-def chat(req: ChatRequest) -> dict[str, Any]:
+async def chat(req: ChatRequest) -> dict[str, Any]:
     try:
-        result = chat_executor.run(
-            req.query,
+        result = await _run_blocking(
+            chat_executor.run,
+            user_query=req.query,
             mode=req.mode,
             window=req.window,
             budget=req.budget,
@@ -1119,6 +1157,6 @@ def chat(req: ChatRequest) -> dict[str, Any]:
         "answer": result.answer,
         "plan": result.plan.model_dump(),
         "payload": result.payload,
-        "tool_trace": result.tool_trace,
+        "tool_trace": result.tool_trace if req.include_trace else [],
         "show_trace": req.show_trace,
     }
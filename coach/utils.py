@@ -1,21 +1,37 @@
 from __future__ import annotations
 
+import dataclasses
 import datetime as dt
+import enum
 import json
+import math
+import os
 import re
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Callable, Iterable, Iterator, Mapping, TypeVar
+
+try:  # pragma: no cover - optional dependency
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
 
 RUNS_DIR_ENV = "COACH_RUNS_DIR"
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
 
 
 def utc_timestamp() -> str:
-    return dt.datetime.now(dt.UTC).strftime("%Y%m%d_%H%M%S")
+    return time.strftime("%Y%m%d_%H%M%S", time.gmtime())
 
 
 def make_run_id(prefix: str = "run") -> str:
-    return f"{prefix}_{utc_timestamp()}_{uuid.uuid4().hex[:8]}"
+    return f"{prefix}_{utc_timestamp()}_{os.urandom(4).hex()}"
 
 
 def ensure_run_dir(run_id: str | None = None, base_dir: str | Path | None = None) -> Path:
@@ -30,11 +46,71 @@ def ensure_run_dir(run_id: str | None = None, base_dir: str | Path | None = None
     return run_dir
 
 
+_ORJSON_OPTIONS = (
+    orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    if orjson is not None
+    else 0
+)
+
+
+def _has_non_finite(value: Any) -> bool:
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, Mapping):
+        return any(_has_non_finite(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite(item) for item in value)
+    return False
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize, for stdlib json, the extra types orjson handles natively (with numpy enabled)."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, (dt.datetime, dt.date, dt.time)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if type(value).__module__ == "numpy" and hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 def write_json(path: str | Path, payload: Mapping[str, Any] | list[Any]) -> None:
-    Path(path).write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+    """Write *payload* as indented, key-sorted JSON (via orjson when installed).
+
+    orjson writes NaN/Infinity as ``null``, so payloads holding non-finite floats take the stdlib path,
+    which accepts the same numpy, dataclass, datetime, enum and UUID values.
+    The bytes go to a sibling temp file that is renamed over *path*, so readers never see a partial file.
+    """
+    data: bytes | None = None
+    if orjson is not None and not _has_non_finite(payload):
+        try:
+            data = orjson.dumps(payload, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass
+    if data is None:
+        data = json.dumps(payload, indent=2, sort_keys=True, default=_json_default).encode("utf-8")
+    target = Path(path)
+    partial = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        partial.write_bytes(data)
+        os.replace(partial, target)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
 
 
 def read_json(path: str | Path) -> Any:
+    if orjson is not None:
+        raw = Path(path).read_bytes()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # stdlib json also accepts what orjson rejects (e.g. NaN, integers wider than 64 bits).
+            return json.loads(raw.decode("utf-8"))
     return json.loads(Path(path).read_text(encoding="utf-8"))
 
 
@@ -43,5 +119,22 @@ def clamp(value: float, low: float = 0.01, high: float = 0.99) -> float:
 
 
 def sanitize_filename(text: str) -> str:
-    cleaned = re.sub(r"[^A-Za-z0-9._-]+", "-", text.strip())
+    cleaned = _UNSAFE_FILENAME_CHARS.sub("-", text.strip())
     return cleaned.strip("-") or "item"
+
+
+def iter_ordered_map(fn: Callable[[_T], _R], items: Iterable[_T], max_workers: int = 1) -> Iterator[_R]:
+    """Like :func:`ordered_map`, but yield each result as soon as it and its predecessors are done."""
+    items = list(items)
+    workers = min(max_workers, len(items))
+    if workers <= 1:
+        for item in items:
+            yield fn(item)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(fn, items)
+
+
+def ordered_map(fn: Callable[[_T], _R], items: Iterable[_T], max_workers: int = 1) -> list[_R]:
+    """Map *fn* over *items* on up to *max_workers* threads, preserving input order."""
+    return list(iter_ordered_map(fn, items, max_workers=max_workers))
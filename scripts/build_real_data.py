@@ -9,13 +9,27 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import csv
+import os
 import random
 import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
 
+import numpy as np
 import pandas as pd
 
+try:  # pragma: no cover - optional dependency
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from pyarrow import csv as pa_csv
+except Exception:  # pragma: no cover
+    pa = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+    pa_csv = None  # type: ignore[assignment]
+
 # Ensure project root is importable
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
@@ -24,6 +38,8 @@ from scripts.shuttleset_config import (
     PLAYER_COUNTRY,
     PLAYER_HANDEDNESS,
     SERVE_TYPES,
+    SHOT_CATEGORIES,
+    SHOT_CATEGORY_CODE,
     SHOT_CLASSIFICATION,
 )
 
@@ -32,6 +48,35 @@ OUTPUT_DIR = Path(__file__).resolve().parents[1] / "coach" / "data"
 LONG_RALLY_THRESHOLD = 8
 NET_ERROR_REASONS = {"掛網", "未過網"}
 OUT_ERROR_REASONS = {"出界"}
+# Only these columns of the ShuttleSet CSVs are used; the optional ones may be absent.
+SET_COLUMNS = (
+    "rally", "ball_round", "type", "player", "getpoint_player",
+    "roundscore_A", "roundscore_B", "backhand", "aroundhead", "lose_reason",
+)
+# Set CSVs are cached as ``<name>.csv.parquet``; bump when SET_COLUMNS or the read changes.
+SET_CACHE_FORMAT = 1
+SET_CACHE_SOURCE_KEY = b"build_real_data_source"
+MATCH_COLUMNS = ("video", "winner", "loser", "set", "year", "month", "day", "tournament", "round", "duration")
+# Column order of the generated sample_matches.csv.
+MATCH_OUTPUT_COLUMNS = (
+    "date", "playerA_id", "playerB_id", "winner_id",
+    "a_games_won", "b_games_won", "a_points", "b_points",
+    "a_serve_rallies", "a_serve_wins", "b_serve_rallies", "b_serve_wins",
+    "a_short_serve_rate", "a_flick_serve_rate",
+    "a_attack_rate", "a_neutral_rate", "a_safe_rate",
+    "b_short_serve_rate", "b_flick_serve_rate",
+    "b_attack_rate", "b_neutral_rate", "b_safe_rate",
+    "tournament", "round", "duration_min", "match_sets",
+    "avg_rally_len", "long_rally_share",
+    "a_backhand_rate", "b_backhand_rate",
+    "a_aroundhead_rate", "b_aroundhead_rate",
+    "a_net_error_lost_rate", "b_net_error_lost_rate",
+    "a_out_error_lost_rate", "b_out_error_lost_rate",
+    "a_short_serve_win_rate", "b_short_serve_win_rate",
+    "a_long_serve_win_rate", "b_long_serve_win_rate",
+    "a_short_serve_samples", "b_short_serve_samples",
+    "a_long_serve_samples", "b_long_serve_samples",
+)
 
 
 # --------------------------------------------------------------------------- #
@@ -60,6 +105,52 @@ def ensure_shuttleset(data_dir: Path) -> Path:
     return set_dir
 
 
+def read_csv_columns(path: Path, columns: tuple[str, ...]) -> pd.DataFrame:
+    """Read the listed columns that *path* has, with PyArrow's CSV parser when it is installed."""
+    with path.open(newline="", encoding="utf-8-sig") as handle:
+        header = next(csv.reader(handle), [])
+    present = [name for name in header if name in columns]
+    if pa_csv is None:
+        return pd.read_csv(path, usecols=present)
+    # Empty cells are nulls for every column type, as they are for pandas.
+    convert_options = pa_csv.ConvertOptions(include_columns=present, strings_can_be_null=True)
+    table = pa_csv.read_csv(path, convert_options=convert_options)
+    # All-empty columns come back as Arrow nulls, which pandas reads as float NaN.
+    schema = pa.schema(
+        [pa.field(field.name, pa.float64()) if pa.types.is_null(field.type) else field for field in table.schema]
+    )
+    return table.cast(schema).to_pandas()
+
+
+def read_set_columns(set_path: Path, use_cache: bool = True) -> pd.DataFrame:
+    """Read SET_COLUMNS of a set CSV, reusing a Parquet copy written by an earlier run.
+
+    The copy records the CSV's ``st_mtime_ns``/``st_size`` and is ignored once either changes;
+    without pyarrow, with *use_cache* off, or when the folder is not writable, this is a plain read.
+    """
+    if not use_cache or pq is None:
+        return read_csv_columns(set_path, SET_COLUMNS)
+
+    stat = set_path.stat()
+    fingerprint = f"{SET_CACHE_FORMAT}:{stat.st_mtime_ns}:{stat.st_size}".encode()
+    cache_path = set_path.with_name(f"{set_path.name}.parquet")
+    try:
+        table = pq.read_table(cache_path)
+        if (table.schema.metadata or {}).get(SET_CACHE_SOURCE_KEY) == fingerprint:
+            return table.to_pandas()
+    except (OSError, ValueError, pa.ArrowException):
+        pass
+
+    df = read_csv_columns(set_path, SET_COLUMNS)
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = {**(table.schema.metadata or {}), SET_CACHE_SOURCE_KEY: fingerprint}
+        pq.write_table(table.replace_schema_metadata(metadata), cache_path, compression="zstd")
+    except (OSError, ValueError, pa.ArrowException):
+        pass
+    return df
+
+
 # --------------------------------------------------------------------------- #
 # Shot type helpers
 # --------------------------------------------------------------------------- #
@@ -88,9 +179,9 @@ def classify_shot(english_type: str) -> str | None:
 # Per-match aggregation
 # --------------------------------------------------------------------------- #
 
-def process_set_csv(set_path: Path) -> dict:
+def process_set_csv(set_path: Path, use_cache: bool = True) -> dict:
     """Parse one set CSV and return per-player aggregated counts."""
-    df = pd.read_csv(set_path)
+    df = read_set_columns(set_path, use_cache=use_cache)
 
     counts = {
         side: {
@@ -115,77 +206,101 @@ def process_set_csv(set_path: Path) -> dict:
         "long_rally_count": 0,
     }
 
-    for rally_id, rally_df in df.groupby("rally"):
-        rally_df = rally_df.sort_values("ball_round")
-        rally_len = int(rally_df["ball_round"].max())
-        rally_context["rally_count"] += 1
-        rally_context["rally_len_total"] += rally_len
-        if rally_len >= LONG_RALLY_THRESHOLD:
-            rally_context["long_rally_count"] += 1
-
-        # Identify server from first stroke
-        first = rally_df.iloc[0]
-        english_type = translate_type(str(first["type"]))
-        serve_kind: str | None = None
-
-        if english_type not in SERVE_TYPES:
-            # Malformed rally — skip serve counting but still count rally shots
-            server = None
-        else:
-            server = str(first["player"])
-            counts[server]["serve_rallies"] += 1
-
-            if english_type == "short service":
-                counts[server]["short_serves"] += 1
-                counts[server]["short_serve_samples"] += 1
-                serve_kind = "short"
-            else:
-                counts[server]["long_serves"] += 1
-                counts[server]["long_serve_samples"] += 1
-                serve_kind = "long"
-
-        # Determine rally winner
-        point_rows = rally_df[rally_df["getpoint_player"].notna()]
-        if not point_rows.empty:
-            terminal = point_rows.iloc[-1]
-            winner = str(terminal["getpoint_player"])
-            total_points[winner] += 1
-            if server is not None and winner == server:
-                counts[server]["serve_wins"] += 1
-                if serve_kind == "short":
-                    counts[server]["short_serve_wins"] += 1
-                elif serve_kind == "long":
-                    counts[server]["long_serve_wins"] += 1
-
-            if winner in {"A", "B"}:
-                loser = "B" if winner == "A" else "A"
-                counts[loser]["lost_rallies"] += 1
-                lose_reason_raw = terminal["lose_reason"]
-                lose_reason = str(lose_reason_raw) if pd.notna(lose_reason_raw) else ""
-                if lose_reason in NET_ERROR_REASONS:
-                    counts[loser]["net_error_lost"] += 1
-                if lose_reason in OUT_ERROR_REASONS:
-                    counts[loser]["out_error_lost"] += 1
-
-        # Classify all non-serve strokes into attack/neutral/safe
-        for _, row in rally_df.iterrows():
-            side = str(row["player"])
-            if side not in counts:
-                continue
-
-            counts[side]["strokes"] += 1
-            if pd.notna(row.get("backhand")) and float(row["backhand"]) == 1.0:
-                counts[side]["backhand_true"] += 1
-            if pd.notna(row.get("aroundhead")) and float(row["aroundhead"]) == 1.0:
-                counts[side]["aroundhead_true"] += 1
-
-            eng = translate_type(str(row["type"]))
-            cat = classify_shot(eng)
-            if cat is not None:
-                counts[side][cat] += 1
-
-    # Final set score
-    last_row = df.sort_values("ball_round").groupby("rally").last().iloc[-1]
+    # Strokes in rally order; rows without a rally id never belong to a rally.
+    ordered = df[df["rally"].notna()].sort_values(["rally", "ball_round"], kind="stable")
+    english = ordered["type"].astype(str).map(CHINESE_TO_ENGLISH)
+    sides = ordered["player"].astype(str)
+    in_counts = sides.isin(counts.keys())
+    is_first = ~ordered["rally"].duplicated()
+
+    # Unknown types raise for every counted stroke and for each rally's opening stroke.
+    unknown = english.isna() & (in_counts | is_first)
+    if unknown.any():
+        translate_type(str(ordered.loc[unknown, "type"].iloc[0]))
+
+    rally_lens = ordered.groupby("rally", sort=False)["ball_round"].max().astype(int)
+    rally_context["rally_count"] = len(rally_lens)
+    rally_context["rally_len_total"] = int(rally_lens.sum())
+    rally_context["long_rally_count"] = int((rally_lens >= LONG_RALLY_THRESHOLD).sum())
+
+    # Identify servers from first strokes; malformed rallies (no serve first) have no server.
+    first_english = english[is_first]
+    serve_first = first_english.isin(SERVE_TYPES)
+    servers = pd.Series(
+        sides[is_first].where(serve_first).to_numpy(), index=ordered.loc[is_first, "rally"].to_numpy()
+    )
+    serve_kinds = pd.Series(
+        np.where(first_english == "short service", "short", "long"), index=servers.index
+    ).where(servers.notna())
+    # A serve with a blank player cell is bad data, not a server-less rally: fail as str(nan) would.
+    if (serve_first & ordered.loc[is_first, "player"].isna()).any():
+        raise KeyError("nan")
+    named_servers = servers.dropna()
+    bad_servers = named_servers[~named_servers.isin(counts.keys())]
+    if not bad_servers.empty:
+        raise KeyError(bad_servers.iloc[0])
+
+    # Rally winners from the last point-bearing stroke of each rally.
+    terminal = ordered[ordered["getpoint_player"].notna()].groupby("rally", sort=False).tail(1)
+    winners = pd.Series(terminal["getpoint_player"].astype(str).to_numpy(), index=terminal["rally"].to_numpy())
+    bad_winners = winners[~winners.isin(counts.keys())]
+    if not bad_winners.empty:
+        raise KeyError(bad_winners.iloc[0])
+    losers = winners.map({"A": "B", "B": "A"})
+    lose_reasons = terminal["lose_reason"].where(terminal["lose_reason"].notna(), "").astype(str).to_numpy()
+    served_wins = servers.reindex(winners.index) == winners
+    won_kinds = serve_kinds.reindex(winners.index)[served_wins]
+
+    # Tally counted (A/B) strokes into attack/neutral/safe; serves and "unknown" are skipped.
+    strokes = ordered[in_counts]
+    stroke_sides = sides[in_counts]
+    stroke_english = english[in_counts]
+    shot_codes = stroke_english.map(SHOT_CATEGORY_CODE)
+    unclassified = shot_codes.isna() & ~stroke_english.isin(SERVE_TYPES | {"unknown"})
+    if unclassified.any():
+        classify_shot(str(stroke_english[unclassified].iloc[0]))
+
+    def flagged(column: str) -> pd.Series:
+        if column not in strokes:
+            return stroke_sides.iloc[:0]
+        values = strokes[column]
+        return stroke_sides[values.notna() & (values.astype(float) == 1.0)]
+
+    tallies = {
+        "strokes": stroke_sides.value_counts(),
+        "backhand_true": flagged("backhand").value_counts(),
+        "aroundhead_true": flagged("aroundhead").value_counts(),
+        "serve_rallies": servers.value_counts(),
+        "short_serves": servers[serve_kinds == "short"].value_counts(),
+        "long_serves": servers[serve_kinds == "long"].value_counts(),
+        "serve_wins": winners[served_wins].value_counts(),
+        "short_serve_wins": winners[served_wins][won_kinds == "short"].value_counts(),
+        "long_serve_wins": winners[served_wins][won_kinds == "long"].value_counts(),
+        "lost_rallies": losers.value_counts(),
+        "net_error_lost": losers[np.isin(lose_reasons, list(NET_ERROR_REASONS))].value_counts(),
+        "out_error_lost": losers[np.isin(lose_reasons, list(OUT_ERROR_REASONS))].value_counts(),
+    }
+    tallies["short_serve_samples"] = tallies["short_serves"]
+    tallies["long_serve_samples"] = tallies["long_serves"]
+    # One bincount over (category code, side) pairs; A is column 0, B column 1.
+    classified = shot_codes.notna().to_numpy()
+    pair_codes = shot_codes.to_numpy()[classified].astype(np.intp) * 2
+    pair_codes += stroke_sides.to_numpy()[classified] == "B"
+    category_grid = np.bincount(pair_codes, minlength=2 * len(SHOT_CATEGORIES)).reshape(-1, 2)
+    for category, (a_count, b_count) in zip(SHOT_CATEGORIES, category_grid.tolist()):
+        tallies[category] = {"A": a_count, "B": b_count}
+    winner_points = winners.value_counts()
+
+    for side, side_counts in counts.items():
+        for key, tally in tallies.items():
+            side_counts[key] += int(tally.get(side, 0))
+        total_points[side] += int(winner_points.get(side, 0))
+
+    # Final set score: last recorded scores of the highest rally, which closes the rally-order
+    # sort. Not the column max: that would also pick up a score that was later corrected.
+    rally_ids = ordered["rally"]
+    final_start = int(np.searchsorted(rally_ids.to_numpy(), rally_ids.iloc[-1]))
+    last_row = ordered[["roundscore_A", "roundscore_B"]].iloc[final_start:].ffill().iloc[-1]
     score_a = int(last_row["roundscore_A"])
     score_b = int(last_row["roundscore_B"])
 
@@ -203,7 +318,7 @@ def process_set_csv(set_path: Path) -> dict:
     }
 
 
-def process_match(match_folder: Path, num_sets: int) -> dict:
+def process_match(match_folder: Path, num_sets: int, use_cache: bool = True) -> dict:
     """Aggregate all sets of a match into match-level statistics."""
 
     agg = {
@@ -235,7 +350,7 @@ def process_match(match_folder: Path, num_sets: int) -> dict:
         if not set_path.exists():
             continue
 
-        result = process_set_csv(set_path)
+        result = process_set_csv(set_path, use_cache=use_cache)
 
         for side in ("A", "B"):
             for key in agg[side]:
@@ -262,6 +377,19 @@ def process_match(match_folder: Path, num_sets: int) -> dict:
     }
 
 
+def process_matches(tasks: list[tuple[Path, int]], use_cache: bool = True, workers: int = 1) -> list[dict]:
+    """Run :func:`process_match` for each ``(match_folder, num_sets)`` task, in order.
+
+    Matches are independent, so with *workers* > 1 they are spread over worker processes.
+    """
+    if workers <= 1 or len(tasks) <= 1:
+        return [process_match(folder, num_sets, use_cache=use_cache) for folder, num_sets in tasks]
+    folders = [folder for folder, _ in tasks]
+    set_counts = [num_sets for _, num_sets in tasks]
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        return list(pool.map(process_match, folders, set_counts, [use_cache] * len(tasks), chunksize=4))
+
+
 def compute_rates(counts: dict) -> dict:
     """Convert raw counts into rate fields with sum-to-1 guarantees."""
     total_serves = counts["short_serves"] + counts["long_serves"]
@@ -350,35 +478,35 @@ def build_player_registry(all_names: set[str]) -> pd.DataFrame:
 # Main ETL
 # --------------------------------------------------------------------------- #
 
-def build_data(set_dir: Path) -> tuple[pd.DataFrame, pd.DataFrame]:
-    """Process all ShuttleSet matches and produce players + matches DataFrames."""
-    match_csv = set_dir / "match.csv"
-    matches_df = pd.read_csv(match_csv)
-
-    rng = random.Random(RANDOM_SEED)
-    all_player_names: set[str] = set()
-    match_rows: list[dict] = []
-
-    for _, match_row in matches_df.iterrows():
+def iter_match_rows(
+    matches_df: pd.DataFrame,
+    folder_present: list[bool],
+    match_results: Iterable[dict],
+    rng: random.Random,
+    player_ids: dict[str, str],
+) -> Iterator[dict]:
+    """Yield one output row per ``match.csv`` entry whose folder exists, in file order.
+
+    *match_results* holds the :func:`process_matches` output for the present folders, in the
+    same order. *player_ids* maps every player name to its :func:`make_player_id` slug. Rows
+    are built one at a time so only the final frame holds them all.
+    """
+    match_results = iter(match_results)
+    for (_, match_row), present in zip(matches_df.iterrows(), folder_present):
         folder_name = str(match_row["video"])
         winner = str(match_row["winner"])
         loser = str(match_row["loser"])
-        num_sets = int(match_row["set"])
         date = f"{int(match_row['year']):04d}-{int(match_row['month']):02d}-{int(match_row['day']):02d}"
         tournament = str(match_row["tournament"])
         round_name = str(match_row["round"])
         duration_min = int(match_row["duration"])
         match_sets = int(match_row["set"])
 
-        all_player_names.add(winner)
-        all_player_names.add(loser)
-
-        match_folder = set_dir / folder_name
-        if not match_folder.is_dir():
+        if not present:
             print(f"  WARNING: folder not found for {folder_name}, skipping")
             continue
 
-        result = process_match(match_folder, num_sets)
+        result = next(match_results)
 
         # ShuttleSet: A = winner, B = loser
         # Randomly swap A/B so winner_id is not always playerA_id
@@ -412,11 +540,11 @@ def build_data(set_dir: Path) -> tuple[pd.DataFrame, pd.DataFrame]:
             avg_rally_len = 0.0
             long_rally_share = 0.0
 
-        match_rows.append({
+        yield {
             "date": date,
-            "playerA_id": make_player_id(pa_name),
-            "playerB_id": make_player_id(pb_name),
-            "winner_id": make_player_id(winner),
+            "playerA_id": player_ids[pa_name],
+            "playerB_id": player_ids[pb_name],
+            "winner_id": player_ids[winner],
             "a_games_won": pa_games,
             "b_games_won": pb_games,
             "a_points": pa_points,
@@ -457,11 +585,35 @@ def build_data(set_dir: Path) -> tuple[pd.DataFrame, pd.DataFrame]:
             "b_short_serve_samples": pb_enriched["short_serve_samples"],
             "a_long_serve_samples": pa_enriched["long_serve_samples"],
             "b_long_serve_samples": pb_enriched["long_serve_samples"],
-        })
+        }
 
-    players_df = build_player_registry(all_player_names)
-    matches_out = pd.DataFrame(match_rows)
+
+def build_data(set_dir: Path, use_cache: bool = True, workers: int = 1) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Process all ShuttleSet matches and produce players + matches DataFrames."""
+    match_csv = set_dir / "match.csv"
+    matches_df = read_csv_columns(match_csv, MATCH_COLUMNS)
+
+    rng = random.Random(RANDOM_SEED)
+    all_player_names = {str(name) for name in matches_df["winner"]} | {str(name) for name in matches_df["loser"]}
+    player_ids = {name: make_player_id(name) for name in all_player_names}
+
+    # Per-match aggregation runs up front (possibly in parallel); the row loop stays serial so
+    # the A/B swap draws keep their order.
+    match_folders = [set_dir / str(video) for video in matches_df["video"]]
+    folder_present = [folder.is_dir() for folder in match_folders]
+    tasks = [
+        (folder, int(num_sets))
+        for folder, num_sets, present in zip(match_folders, matches_df["set"], folder_present)
+        if present
+    ]
+    match_results = process_matches(tasks, use_cache=use_cache, workers=workers)
+
+    matches_out = pd.DataFrame.from_records(
+        iter_match_rows(matches_df, folder_present, match_results, rng, player_ids),
+        columns=list(MATCH_OUTPUT_COLUMNS),
+    )
     matches_out = matches_out.sort_values("date").reset_index(drop=True)
+    players_df = build_player_registry(all_player_names)
 
     return players_df, matches_out
 
@@ -477,15 +629,47 @@ def validate(players_df: pd.DataFrame, matches_df: pd.DataFrame) -> None:
     assert players_df["player_id"].is_unique, "Duplicate player IDs"
     assert players_df["handedness"].isin(["R", "L"]).all(), "Invalid handedness values"
 
-    expected_match_cols = [
-        "date", "playerA_id", "playerB_id", "winner_id",
-        "a_games_won", "b_games_won", "a_points", "b_points",
-        "a_serve_rallies", "a_serve_wins", "b_serve_rallies", "b_serve_wins",
+    expected_match_cols = list(MATCH_OUTPUT_COLUMNS)
+    assert list(matches_df.columns) == expected_match_cols, f"Match columns: {list(matches_df.columns)}"
+
+    # Each check runs over whole columns; findings are tagged (row position, check order) so
+    # they print grouped by row, in the same order as a row-by-row walk.
+    findings: list[tuple[int, int, str]] = []
+    labels = matches_df.index
+
+    def report(mask: pd.Series | np.ndarray, describe: Callable[[int], str]) -> None:
+        for pos in np.flatnonzero(np.asarray(mask, dtype=bool)).tolist():
+            findings.append((pos, len(findings), f"Row {labels[pos]}: {describe(pos)}"))
+
+    def column(name: str) -> np.ndarray:
+        return matches_df[name].to_numpy()
+
+    # FK integrity
+    player_ids = set(players_df["player_id"])
+    a_ids, b_ids, winner_ids = column("playerA_id"), column("playerB_id"), column("winner_id")
+    report(~matches_df["playerA_id"].isin(player_ids), lambda i: f"playerA_id {a_ids[i]!r} not in players")
+    report(~matches_df["playerB_id"].isin(player_ids), lambda i: f"playerB_id {b_ids[i]!r} not in players")
+    report(
+        (winner_ids != a_ids) & (winner_ids != b_ids),
+        lambda i: f"winner_id {winner_ids[i]!r} not playerA or playerB",
+    )
+
+    # Serve and rally style rates sum to 1.0
+    sums = {
+        "a serve": column("a_short_serve_rate") + column("a_flick_serve_rate"),
+        "b serve": column("b_short_serve_rate") + column("b_flick_serve_rate"),
+        "a rally": column("a_attack_rate") + column("a_neutral_rate") + column("a_safe_rate"),
+        "b rally": column("b_attack_rate") + column("b_neutral_rate") + column("b_safe_rate"),
+    }
+    for label, total in sums.items():
+        report(np.abs(total - 1.0) > 1e-3, lambda i, label=label, total=total: f"{label} rates sum to {total[i]}")
+
+    # Rate bounds
+    rate_cols = [
         "a_short_serve_rate", "a_flick_serve_rate",
         "a_attack_rate", "a_neutral_rate", "a_safe_rate",
         "b_short_serve_rate", "b_flick_serve_rate",
         "b_attack_rate", "b_neutral_rate", "b_safe_rate",
-        "tournament", "round", "duration_min", "match_sets",
         "avg_rally_len", "long_rally_share",
         "a_backhand_rate", "b_backhand_rate",
         "a_aroundhead_rate", "b_aroundhead_rate",
@@ -493,84 +677,36 @@ def validate(players_df: pd.DataFrame, matches_df: pd.DataFrame) -> None:
         "a_out_error_lost_rate", "b_out_error_lost_rate",
         "a_short_serve_win_rate", "b_short_serve_win_rate",
         "a_long_serve_win_rate", "b_long_serve_win_rate",
-        "a_short_serve_samples", "b_short_serve_samples",
-        "a_long_serve_samples", "b_long_serve_samples",
     ]
-    assert list(matches_df.columns) == expected_match_cols, f"Match columns: {list(matches_df.columns)}"
+    for col in rate_cols:
+        values = column(col)
+        if col == "avg_rally_len":
+            report(values < 0.0, lambda i, col=col, values=values: f"{col}={values[i]} must be >= 0")
+        else:
+            in_range = (values >= 0.0) & (values <= 1.0)
+            report(~in_range, lambda i, col=col, values=values: f"{col}={values[i]} out of [0, 1]")
+
+    sample_cols = [
+        "a_short_serve_samples",
+        "b_short_serve_samples",
+        "a_long_serve_samples",
+        "b_long_serve_samples",
+    ]
+    for col in sample_cols:
+        values = column(col)
+        as_float = values.astype(float)
+        report(as_float < 0, lambda i, col=col, values=values: f"{col}={values[i]} must be >= 0")
+        whole = np.isfinite(as_float) & (as_float == np.floor(as_float))
+        report(~whole, lambda i, col=col, values=values: f"{col}={values[i]} must be an integer")
 
-    player_ids = set(players_df["player_id"])
-    errors = []
-
-    for idx, row in matches_df.iterrows():
-        # FK integrity
-        if row["playerA_id"] not in player_ids:
-            errors.append(f"Row {idx}: playerA_id {row['playerA_id']!r} not in players")
-        if row["playerB_id"] not in player_ids:
-            errors.append(f"Row {idx}: playerB_id {row['playerB_id']!r} not in players")
-        if row["winner_id"] not in (row["playerA_id"], row["playerB_id"]):
-            errors.append(f"Row {idx}: winner_id {row['winner_id']!r} not playerA or playerB")
-
-        # Serve rates sum to 1.0
-        a_srv_sum = row["a_short_serve_rate"] + row["a_flick_serve_rate"]
-        b_srv_sum = row["b_short_serve_rate"] + row["b_flick_serve_rate"]
-        if abs(a_srv_sum - 1.0) > 1e-3:
-            errors.append(f"Row {idx}: a serve rates sum to {a_srv_sum}")
-        if abs(b_srv_sum - 1.0) > 1e-3:
-            errors.append(f"Row {idx}: b serve rates sum to {b_srv_sum}")
-
-        # Rally style rates sum to 1.0
-        a_rally_sum = row["a_attack_rate"] + row["a_neutral_rate"] + row["a_safe_rate"]
-        b_rally_sum = row["b_attack_rate"] + row["b_neutral_rate"] + row["b_safe_rate"]
-        if abs(a_rally_sum - 1.0) > 1e-3:
-            errors.append(f"Row {idx}: a rally rates sum to {a_rally_sum}")
-        if abs(b_rally_sum - 1.0) > 1e-3:
-            errors.append(f"Row {idx}: b rally rates sum to {b_rally_sum}")
-
-        # Rate bounds
-        rate_cols = [
-            "a_short_serve_rate", "a_flick_serve_rate",
-            "a_attack_rate", "a_neutral_rate", "a_safe_rate",
-            "b_short_serve_rate", "b_flick_serve_rate",
-            "b_attack_rate", "b_neutral_rate", "b_safe_rate",
-            "avg_rally_len", "long_rally_share",
-            "a_backhand_rate", "b_backhand_rate",
-            "a_aroundhead_rate", "b_aroundhead_rate",
-            "a_net_error_lost_rate", "b_net_error_lost_rate",
-            "a_out_error_lost_rate", "b_out_error_lost_rate",
-            "a_short_serve_win_rate", "b_short_serve_win_rate",
-            "a_long_serve_win_rate", "b_long_serve_win_rate",
-        ]
-        for col in rate_cols:
-            if col == "avg_rally_len":
-                if row[col] < 0.0:
-                    errors.append(f"Row {idx}: {col}={row[col]} must be >= 0")
-            elif not (0.0 <= row[col] <= 1.0):
-                errors.append(f"Row {idx}: {col}={row[col]} out of [0, 1]")
-
-        sample_cols = [
-            "a_short_serve_samples",
-            "b_short_serve_samples",
-            "a_long_serve_samples",
-            "b_long_serve_samples",
-        ]
-        for col in sample_cols:
-            value = float(row[col])
-            if value < 0:
-                errors.append(f"Row {idx}: {col}={row[col]} must be >= 0")
-            if not value.is_integer():
-                errors.append(f"Row {idx}: {col}={row[col]} must be an integer")
-
-        # Serve wins <= serve rallies
-        if row["a_serve_wins"] > row["a_serve_rallies"]:
-            errors.append(f"Row {idx}: a_serve_wins > a_serve_rallies")
-        if row["b_serve_wins"] > row["b_serve_rallies"]:
-            errors.append(f"Row {idx}: b_serve_wins > b_serve_rallies")
-
-        if int(row["match_sets"]) < 1:
-            errors.append(f"Row {idx}: match_sets must be >= 1")
-        if int(row["duration_min"]) <= 0:
-            errors.append(f"Row {idx}: duration_min must be > 0")
+    # Serve wins <= serve rallies
+    report(column("a_serve_wins") > column("a_serve_rallies"), lambda i: "a_serve_wins > a_serve_rallies")
+    report(column("b_serve_wins") > column("b_serve_rallies"), lambda i: "b_serve_wins > b_serve_rallies")
+
+    report(matches_df["match_sets"].astype(int) < 1, lambda i: "match_sets must be >= 1")
+    report(matches_df["duration_min"].astype(int) <= 0, lambda i: "duration_min must be > 0")
 
+    errors = [message for _, _, message in sorted(findings)]
     if errors:
         for e in errors:
             print(f"  VALIDATION ERROR: {e}", file=sys.stderr)
@@ -588,6 +724,17 @@ def main() -> None:
         default=None,
         help="Path to ShuttleSet/set/ directory (auto-downloads if not provided)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-read every set CSV instead of reusing the <set>.csv.parquet copies from earlier runs",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for per-match aggregation (default: CPU count; 1 runs in-process)",
+    )
     args = parser.parse_args()
 
     if args.shuttleset_path:
@@ -598,7 +745,7 @@ def main() -> None:
         set_dir = ensure_shuttleset(raw_dir)
 
     print(f"Reading ShuttleSet from: {set_dir}")
-    players_df, matches_df = build_data(set_dir)
+    players_df, matches_df = build_data(set_dir, use_cache=not args.no_cache, workers=args.workers)
 
     print(f"Players: {len(players_df)}")
     print(f"Matches: {len(matches_df)}")
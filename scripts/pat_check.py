@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import os
 import platform
+import shutil
+import stat
 import subprocess
 import sys
 import tempfile
@@ -32,11 +34,13 @@ def main() -> None:
         _print_next_steps("PAT_CONSOLE_PATH is not set")
         return
 
-    if not resolved_pat.exists():
+    try:
+        pat_stat = resolved_pat.stat()
+    except OSError:
         _print_next_steps(f"PAT executable not found: {resolved_pat}")
         return
 
-    if resolved_pat.is_dir():
+    if stat.S_ISDIR(pat_stat.st_mode):
         _print_next_steps(f"PAT_CONSOLE_PATH points to a directory without PAT.Console.exe: {resolved_pat}")
         return
 
@@ -48,13 +52,13 @@ def main() -> None:
 
     print(f"Checking command: {' '.join(cmd)}")
     try:
-        proc_env = os.environ.copy()
-        if use_mono:
-            proc_env.pop("MONO_PATH", None)
+        # Inherit the parent environment unless MONO_PATH has to be hidden from Mono.
+        proc_env: dict[str, str] | None = None
+        if use_mono and "MONO_PATH" in os.environ:
+            proc_env = {key: value for key, value in os.environ.items() if key != "MONO_PATH"}
         proc = subprocess.run(
             cmd,
             capture_output=True,
-            text=True,
             timeout=min(cfg.pat_timeout_s, 20),
             check=False,
             env=proc_env,
@@ -68,32 +72,35 @@ def main() -> None:
         return
 
     print(f"return code: {proc.returncode}")
-    if proc.stdout:
-        print("stdout:")
-        print(proc.stdout.strip())
-    if proc.stderr:
-        print("stderr:")
-        print(proc.stderr.strip())
+    # Raw pipes, decoded only to print, the same way the runner decodes PAT logs; a locale
+    # text pipe would raise on a banner the locale codec cannot decode.
+    for label, raw in (("stdout", proc.stdout), ("stderr", proc.stderr)):
+        if raw:
+            print(f"{label}:")
+            print(raw.decode("utf-8", errors="replace").replace("\r\n", "\n").strip())
 
     if proc.returncode == 0:
         print("PAT connectivity check passed.")
-        _run_smoke_check(
+        # Only started once -ver passes: a PAT run cannot be cancelled midway, so an overlapped
+        # smoke check would hold up a failed probe and leave its temp dir behind.
+        for line in _run_smoke_check(
             pat_console_path=resolved_pat,
             use_mono=use_mono,
             timeout_s=min(cfg.pat_timeout_s, 30),
-        )
+        ):
+            print(line)
     else:
         _print_next_steps("PAT command ran but returned a non-zero code")
 
 
-def _run_smoke_check(*, pat_console_path: Path, use_mono: bool, timeout_s: int) -> None:
+def _run_smoke_check(*, pat_console_path: Path, use_mono: bool, timeout_s: int) -> list[str]:
+    """Run examples/minimal.pcsp through PAT and return the report lines."""
     from coach.pat.parser import parse_probability, read_pat_output
     from coach.pat.runner import run_pat
 
     minimal = REPO_ROOT / "examples" / "minimal.pcsp"
     if not minimal.exists():
-        print("Skipped module smoke check: examples/minimal.pcsp not found.")
-        return
+        return ["Skipped module smoke check: examples/minimal.pcsp not found."]
 
     temp_dir = Path(tempfile.mkdtemp(prefix="pat_check_"))
     out_path = temp_dir / "pat_output.txt"
@@ -107,20 +114,21 @@ def _run_smoke_check(*, pat_console_path: Path, use_mono: bool, timeout_s: int)
         use_mono=use_mono,
     )
     if not bool(result.get("ok", False)):
-        print("PAT module smoke check failed.")
-        print(f"pat_error: {result.get('error', 'unknown PAT error')}")
-        print(f"pat_stdout: {result.get('stdout_path')}")
-        print(f"pat_stderr: {result.get('stderr_path')}")
-        return
+        return [
+            "PAT module smoke check failed.",
+            f"pat_error: {result.get('error', 'unknown PAT error')}",
+            f"pat_stdout: {result.get('stdout_path')}",
+            f"pat_stderr: {result.get('stderr_path')}",
+        ]
 
     try:
         probability = parse_probability(read_pat_output(out_path))
     except Exception as exc:
-        print(f"PAT module smoke check output parse failed: {exc}")
-        print(f"raw_output: {out_path}")
-        return
+        return [f"PAT module smoke check output parse failed: {exc}", f"raw_output: {out_path}"]
 
-    print(f"PAT module smoke check passed. Probability: {probability:.6f}")
+    # Failed checks keep the directory so the paths reported above stay readable.
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    return [f"PAT module smoke check passed. Probability: {probability:.6f}"]
 
 
 def _print_next_steps(reason: str) -> None:
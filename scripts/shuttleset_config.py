@@ -57,6 +57,12 @@ SHOT_CLASSIFICATION: dict[str, str] = {
 
 SERVE_TYPES = {"short service", "long service"}
 
+# Dense codes for the categories above, so per-stroke tallies can use integer arrays.
+SHOT_CATEGORIES = ("attack", "neutral", "safe")
+SHOT_CATEGORY_CODE: dict[str, int] = {
+    shot: SHOT_CATEGORIES.index(category) for shot, category in SHOT_CLASSIFICATION.items()
+}
+
 # --------------------------------------------------------------------------- #
 # Player metadata (manually verified from BWF profiles)
 # --------------------------------------------------------------------------- #
@@ -4,6 +4,7 @@ from pathlib import Path
 
 import pytest
 
+from coach.agent.planner import AgentExecutor
 from coach.data.adapters.local_csv import LocalCSVAdapter
 from coach.model.params import (
     InfluenceWeights,
@@ -30,6 +31,30 @@ def coach_service(runs_root: Path, csv_adapter: LocalCSVAdapter) -> BadmintonCoa
     return BadmintonCoachService(adapter=csv_adapter, runs_root=runs_root)
 
 
+@pytest.fixture(scope="module")
+def mock_service(tmp_path_factory: pytest.TempPathFactory) -> BadmintonCoachService:
+    # One warm service per module for mock-mode runs; each run still writes its own run dir.
+    return BadmintonCoachService(runs_root=tmp_path_factory.mktemp("runs"))
+
+
+@pytest.fixture(scope="module")
+def mock_executor(mock_service: BadmintonCoachService) -> AgentExecutor:
+    return AgentExecutor(service=mock_service)
+
+
+@pytest.fixture(scope="session")
+def minimal_mock_pcsp(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    pcsp_path = tmp_path_factory.mktemp("mock_pcsp") / "minimal.pcsp"
+    pcsp_path.write_text(
+        "// inline params for mock parser\n"
+        "pA_srv_win = 0.62\n"
+        "pA_rcv_win = 0.57\n"
+        "#assert M reaches X with prob;\n",
+        encoding="utf-8",
+    )
+    return pcsp_path
+
+
 @pytest.fixture
 def sample_matchup_params() -> MatchupParams:
     return MatchupParams(
@@ -261,3 +261,112 @@ def test_validate_rejects_invalid_new_columns(monkeypatch: pytest.MonkeyPatch, t
     bad_rate.loc[0, "a_backhand_rate"] = 1.2
     with pytest.raises(ValueError):
         brd.validate(players, bad_rate)
+
+
+def test_process_set_csv_handles_unsorted_rows_and_serveless_rallies(tmp_path: Path) -> None:
+    rows = _fixture_set_rows()
+    expected_path = tmp_path / "sorted.csv"
+    pd.DataFrame(rows).to_csv(expected_path, index=False)
+    shuffled_path = tmp_path / "shuffled.csv"
+    pd.DataFrame(list(reversed(rows))).to_csv(shuffled_path, index=False)
+    assert brd.process_set_csv(shuffled_path) == brd.process_set_csv(expected_path)
+
+    # A rally that opens with a rally shot has no server, but its strokes and winner still count.
+    serveless = [dict(row, type="殺球") if row["rally"] == 1 and row["ball_round"] == 1 else row for row in rows]
+    serveless_path = tmp_path / "serveless.csv"
+    pd.DataFrame(serveless).to_csv(serveless_path, index=False)
+    out = brd.process_set_csv(serveless_path)
+    assert out["counts"]["A"]["short_serve_samples"] == 0
+    assert out["counts"]["A"]["serve_wins"] == 0
+    assert out["counts"]["A"]["strokes"] == 4
+    assert out["counts"]["A"]["attack"] == 3
+    assert out["total_points"]["A"] == brd.process_set_csv(expected_path)["total_points"]["A"]
+
+    unknown = [dict(row, type="???") if row["rally"] == 2 and row["ball_round"] == 2 else row for row in rows]
+    unknown_path = tmp_path / "unknown.csv"
+    pd.DataFrame(unknown).to_csv(unknown_path, index=False)
+    with pytest.raises(ValueError, match="Unknown shot type"):
+        brd.process_set_csv(unknown_path)
+
+    # A serve with a blank player cell fails loudly instead of silently dropping the rally's serve.
+    blank_server = [dict(row, player=None) if row["rally"] == 2 and row["ball_round"] == 1 else row for row in rows]
+    blank_server_path = tmp_path / "blank_server.csv"
+    pd.DataFrame(blank_server).to_csv(blank_server_path, index=False)
+    with pytest.raises(KeyError, match="nan"):
+        brd.process_set_csv(blank_server_path, use_cache=False)
+
+
+@pytest.mark.parametrize("use_pyarrow", [True, False])
+def test_read_csv_columns_keeps_only_present_listed_columns(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, use_pyarrow: bool
+) -> None:
+    if use_pyarrow and brd.pa_csv is None:
+        pytest.skip("pyarrow not installed")
+    if not use_pyarrow:
+        monkeypatch.setattr(brd, "pa_csv", None)
+    set_path = tmp_path / "set1.csv"
+    rows = [{key: value for key, value in row.items() if key != "aroundhead"} for row in _fixture_set_rows()]
+    pd.DataFrame(rows).assign(frame_num=7).to_csv(set_path, index=False)
+
+    df = brd.read_csv_columns(set_path, brd.SET_COLUMNS)
+
+    assert list(df.columns) == [name for name in pd.DataFrame(rows).columns if name in brd.SET_COLUMNS]
+    assert df["getpoint_player"].isna().sum() == sum(row["getpoint_player"] is None for row in rows)
+    assert brd.process_set_csv(set_path)["counts"]["A"]["aroundhead_true"] == 0
+
+
+def test_process_set_csv_reuses_parquet_copy_until_csv_changes(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    if brd.pq is None:
+        pytest.skip("pyarrow not installed")
+    set_path = tmp_path / "set1.csv"
+    pd.DataFrame(_fixture_set_rows()).to_csv(set_path, index=False)
+    calls = {"count": 0}
+    original = brd.read_csv_columns
+
+    def _counting_read(path: Path, columns: tuple[str, ...]) -> pd.DataFrame:
+        calls["count"] += 1
+        return original(path, columns)
+
+    monkeypatch.setattr(brd, "read_csv_columns", _counting_read)
+
+    first = brd.process_set_csv(set_path)
+    assert (tmp_path / "set1.csv.parquet").exists()
+    assert brd.process_set_csv(set_path) == first
+    assert calls["count"] == 1
+
+    brd.process_set_csv(set_path, use_cache=False)
+    assert calls["count"] == 2
+
+    pd.DataFrame(_fixture_set_rows()[:3]).to_csv(set_path, index=False)
+    assert brd.process_set_csv(set_path)["rally_context"]["rally_count"] == 1
+    assert calls["count"] == 3
+
+
+def test_process_matches_with_worker_processes_matches_serial_run(tmp_path: Path) -> None:
+    match_folder = _write_fixture_dataset(tmp_path) / "fixture_match"
+    tasks = [(match_folder, 2), (match_folder, 1), (match_folder, 2)]
+
+    serial = brd.process_matches(tasks, use_cache=False)
+    parallel = brd.process_matches(tasks, use_cache=False, workers=2)
+
+    assert parallel == serial
+    assert serial[0] == brd.process_match(match_folder, 2, use_cache=False)
+
+
+def test_build_data_keeps_schema_and_players_when_match_folders_are_missing(tmp_path: Path) -> None:
+    set_dir = _write_fixture_dataset(tmp_path)
+    (set_dir / "fixture_match" / "set1.csv").unlink()
+    (set_dir / "fixture_match").rmdir()
+
+    players, matches = brd.build_data(set_dir)
+
+    assert matches.empty
+    assert list(matches.columns) == list(brd.MATCH_OUTPUT_COLUMNS)
+    assert set(players["name"]) == {"Viktor AXELSEN", "Kento MOMOTA"}
+
+
+def test_shot_category_codes_round_trip_classification() -> None:
+    decoded = {shot: brd.SHOT_CATEGORIES[code] for shot, code in brd.SHOT_CATEGORY_CODE.items()}
+    assert decoded == brd.SHOT_CLASSIFICATION
@@ -1,15 +1,23 @@
 from __future__ import annotations
 
+import csv
 import json
+import time
+from dataclasses import fields
 from pathlib import Path
 
-from coach.agent.planner import AgentExecutor
+import pytest
+from pydantic import ValidationError
+
+from coach.agent import schemas
+from coach.agent.llm_client import _extract_json_payload
+from coach.agent.planner import AgentExecutor, Planner
+from coach.agent.schemas import Plan
 from coach.service import BadmintonCoachService
 
 
-def test_predict_end_to_end_mock(tmp_path: Path) -> None:
-    service = BadmintonCoachService(runs_root=tmp_path)
-    result = service.predict(
+def test_predict_end_to_end_mock(mock_service: BadmintonCoachService) -> None:
+    result = mock_service.predict(
         player_a="Viktor Axelsen",
         player_b="Kento Momota",
         window=30,
@@ -22,9 +30,8 @@ def test_predict_end_to_end_mock(tmp_path: Path) -> None:
     assert (result.run_dir / "prediction_result.json").exists()
 
 
-def test_strategy_end_to_end_mock(tmp_path: Path) -> None:
-    service = BadmintonCoachService(runs_root=tmp_path)
-    result = service.strategy(
+def test_strategy_end_to_end_mock(mock_service: BadmintonCoachService) -> None:
+    result = mock_service.strategy(
         player_a="Viktor Axelsen",
         player_b="Kento Momota",
         window=30,
@@ -43,12 +50,15 @@ def test_strategy_end_to_end_mock(tmp_path: Path) -> None:
     assert "unforced_error_delta" in payload["best_candidate"]
     assert "return_pressure_delta" in payload["best_candidate"]
     assert "clutch_delta" in payload["best_candidate"]
+    with (result.run_dir / "top_alternatives.csv").open(newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == len(result.top_alternatives)
+    assert list(rows[0]) == [field.name for field in fields(result.top_alternatives[0])]
+    assert float(rows[0]["probability"]) == result.top_alternatives[0].probability
 
 
-def test_agent_query_mock_mode(tmp_path: Path) -> None:
-    service = BadmintonCoachService(runs_root=tmp_path)
-    executor = AgentExecutor(service=service)
-    out = executor.run(
+def test_agent_query_mock_mode(mock_executor: AgentExecutor) -> None:
+    out = mock_executor.run(
         "What is the expected winning percentage for Viktor Axelsen vs Kento Momota?",
         mode="mock",
         window=30,
@@ -59,10 +69,8 @@ def test_agent_query_mock_mode(tmp_path: Path) -> None:
     assert "PAT" in out.answer or "probability" in out.answer
 
 
-def test_agent_strategy_query_mock_mode(tmp_path: Path) -> None:
-    service = BadmintonCoachService(runs_root=tmp_path)
-    executor = AgentExecutor(service=service)
-    out = executor.run(
+def test_agent_strategy_query_mock_mode(mock_executor: AgentExecutor) -> None:
+    out = mock_executor.run(
         "What adjustment should Viktor Axelsen make to beat Kento Momota?",
         mode="mock",
         window=30,
@@ -73,3 +81,217 @@ def test_agent_strategy_query_mock_mode(tmp_path: Path) -> None:
     assert "delta" in out.payload
     assert isinstance(out.payload["improved_probability"], float)
     assert isinstance(out.payload["baseline_probability"], float)
+
+
+def test_agent_overlaps_llm_planning_with_weight_warmup(tmp_path: Path) -> None:
+    class _SlowPlanLLM:
+        enabled = True
+
+        def __init__(self, adapter, runs_root: Path) -> None:  # type: ignore[no-untyped-def]
+            self.adapter = adapter
+            self.runs_root = runs_root
+            self.weights_ready_during_plan: bool | None = None
+            self.runs_started_during_plan: bool | None = None
+
+        def plan_and_prepare(self, user_query: str) -> None:
+            for _ in range(200):
+                if getattr(self.adapter, "_influence_weights_cache", None) is not None:
+                    break
+                time.sleep(0.01)
+            self.weights_ready_during_plan = getattr(self.adapter, "_influence_weights_cache", None) is not None
+            self.runs_started_during_plan = self.runs_root.exists() and any(self.runs_root.iterdir())
+            return None
+
+        def summarize(self, question: str, computed_payload: dict) -> None:
+            return None
+
+    service = BadmintonCoachService(runs_root=tmp_path / "runs")
+    assert getattr(service.adapter, "_influence_weights_cache", None) is None
+    llm = _SlowPlanLLM(service.adapter, service.runs_root)
+    executor = AgentExecutor(service=service, llm_client=llm)  # type: ignore[arg-type]
+    out = executor.run("Viktor Axelsen vs Kento Momota", mode="mock", window=30)
+
+    assert out.plan.task_type == "prediction"
+    # The weight fit overlaps the planning call, but no run starts before the plan is known.
+    assert llm.weights_ready_during_plan is True
+    assert llm.runs_started_during_plan is False
+
+
+def test_agent_streams_llm_summary_chunks(mock_service: BadmintonCoachService) -> None:
+    class _StreamingLLM:
+        enabled = True
+
+        def plan_and_prepare(self, user_query: str) -> None:
+            return None
+
+        def summarize(self, question: str, computed_payload: dict, on_chunk=None) -> str:  # type: ignore[no-untyped-def]
+            chunks = ["Axelsen ", "is favoured."]
+            if on_chunk is not None:
+                for chunk in chunks:
+                    on_chunk(chunk)
+            return "".join(chunks)
+
+    executor = AgentExecutor(service=mock_service, llm_client=_StreamingLLM())  # type: ignore[arg-type]
+    received: list[str] = []
+    out = executor.run("Viktor Axelsen vs Kento Momota", mode="mock", on_answer_chunk=received.append)
+
+    assert received == ["Axelsen ", "is favoured."]
+    assert out.answer == "Axelsen is favoured."
+
+
+@pytest.mark.parametrize(
+    ("template", "summarize_calls"),
+    [
+        ("{player_a} wins with probability {probability:.1%} ({mode}).", 0),
+        ("{player_a} wins with probability {probability.real}.", 1),
+        ("{player_a} wins {unknown_field} of the time.", 1),
+        ("No numbers at all.", 1),
+    ],
+)
+def test_agent_fills_the_summary_template_drafted_with_the_plan(
+    mock_service: BadmintonCoachService, template: str, summarize_calls: int
+) -> None:
+    plan = Planner(adapter=mock_service.adapter).heuristic_plan("Viktor Axelsen vs Kento Momota")
+
+    class _PreparingLLM:
+        enabled = True
+        summarize_calls = 0
+
+        def plan_and_prepare(self, user_query: str) -> dict:
+            return {"plan": plan.model_dump(), "summary_template": template}
+
+        def summarize(self, question: str, computed_payload: dict, on_chunk=None) -> str:  # type: ignore[no-untyped-def]
+            self.summarize_calls += 1
+            return "Summarized separately."
+
+    llm = _PreparingLLM()
+    executor = AgentExecutor(service=mock_service, llm_client=llm)  # type: ignore[arg-type]
+    received: list[str] = []
+    out = executor.run("Viktor Axelsen vs Kento Momota", mode="mock", on_answer_chunk=received.append)
+
+    assert llm.summarize_calls == summarize_calls
+    if summarize_calls == 0:
+        expected = template.format(player_a=out.payload["player_a"], probability=out.payload["probability"], mode="mock")
+        assert out.answer == expected
+        assert received == [expected]
+    else:
+        assert out.answer == "Summarized separately."
+
+
+def test_planner_markers_match_single_pass_regexes() -> None:
+    assert Planner._detect_task_type("How can Axelsen BEAT Momota?") == "strategy"
+    assert Planner._detect_task_type("Who wins Axelsen vs Momota?") == "prediction"
+    assert Planner._extract_constraints("Serve safer, fewer errors, stay aggressive") == [
+        "emphasize aggression",
+        "control unforced errors",
+        "serve mix considered",
+    ]
+    assert Planner._extract_constraints("Who wins?") == []
+
+
+def test_planner_extracts_players_in_query_order(csv_adapter) -> None:
+    planner = Planner(adapter=csv_adapter)
+    names = csv_adapter.players_df["name"].tolist()
+
+    assert planner._extract_players(f"{names[1]} vs {names[0]}?") == [names[1], names[0]]
+    surname_query = f"can {names[0].split()[-1]} beat {names[2].split()[-1]}"
+    assert planner._extract_players(surname_query) == [names[0], names[2]]
+
+
+def test_planner_template_plans_are_valid_and_independent(csv_adapter) -> None:
+    planner = Planner(adapter=csv_adapter)
+    names = csv_adapter.players_df["name"].tolist()
+
+    for query in (f"{names[0]} vs {names[1]}", f"How can {names[0]} beat {names[1]}?"):
+        plan = planner.create_plan(query, window=12, budget=7)
+        assert Plan.model_validate(plan.model_dump()) == plan
+
+    first = planner.create_plan(f"How can {names[0]} beat {names[1]}?")
+    first.tool_calls[2].arguments["search_space"]["l1_bound"] = 9.0
+    second = planner.create_plan(f"How can {names[0]} beat {names[1]}?")
+    assert second.tool_calls[2].arguments["search_space"]["l1_bound"] == 0.3
+
+
+def test_extract_json_payload_handles_fenced_and_prose_wrapped_objects() -> None:
+    fenced = 'Plan:\n```json\n{"task_type": "prediction", "note": "use }"}\n```\nDone.'
+    assert _extract_json_payload(fenced) == {"task_type": "prediction", "note": "use }"}
+    assert _extract_json_payload('see {"players": ["A", "B"]} then stop.') == {"players": ["A", "B"]}
+
+
+@pytest.mark.parametrize("text", ['see {oops} then {"players": ["A", "B"]}', '{"a": 1} {"b": 2}', '{"a": 1} }'])
+def test_extract_json_payload_rejects_anything_but_one_leading_object(text: str) -> None:
+    with pytest.raises(json.JSONDecodeError):
+        _extract_json_payload(text)
+
+
+def test_agent_runs_only_the_final_plan_while_llm_planning_is_in_flight(tmp_path: Path, monkeypatch) -> None:
+    service = BadmintonCoachService(runs_root=tmp_path / "runs")
+    llm_plan = Planner(adapter=service.adapter).heuristic_plan(
+        "How can Viktor Axelsen beat Kento Momota?", budget=4
+    )
+
+    class _DisagreeingLLM:
+        enabled = True
+
+        def plan_and_prepare(self, user_query: str) -> dict:
+            time.sleep(0.05)
+            return {"plan": llm_plan.model_dump(), "summary_template": None}
+
+        def summarize(self, question: str, computed_payload: dict) -> None:
+            return None
+
+    calls = {"predict": 0, "strategy": 0}
+    original_predict, original_strategy = service.predict, service.strategy
+
+    def _counting_predict(*args, **kwargs):  # type: ignore[no-untyped-def]
+        calls["predict"] += 1
+        return original_predict(*args, **kwargs)
+
+    def _counting_strategy(*args, **kwargs):  # type: ignore[no-untyped-def]
+        calls["strategy"] += 1
+        return original_strategy(*args, **kwargs)
+
+    monkeypatch.setattr(service, "predict", _counting_predict)
+    monkeypatch.setattr(service, "strategy", _counting_strategy)
+    executor = AgentExecutor(service=service, llm_client=_DisagreeingLLM())  # type: ignore[arg-type]
+    out = executor.run("Viktor Axelsen vs Kento Momota", mode="mock", budget=4)
+
+    assert out.plan.task_type == "strategy"
+    assert calls == {"predict": 0, "strategy": 1}
+    assert len([path for path in (tmp_path / "runs").iterdir() if path.is_dir()]) == 1
+
+
+def test_agent_schemas_are_built_at_import() -> None:
+    models = [
+        value
+        for value in vars(schemas).values()
+        if isinstance(value, type) and issubclass(value, schemas.BaseModel) and value is not schemas.BaseModel
+    ]
+    assert len(models) == 8
+    assert all(model.__pydantic_complete__ for model in models)
+
+
+def test_plan_validation_accepts_placeholder_tool_arguments() -> None:
+    plan = Plan.model_validate(
+        {
+            "task_type": "strategy",
+            "analysis_type": "sensitivity",
+            "players": ["Viktor Axelsen", "Kento Momota"],
+            "tool_calls": [
+                {"tool": "ResolvePlayers", "arguments": {"names": ["Viktor Axelsen", "Kento Momota"]}},
+                {"tool": "BatchSensitivity", "arguments": {"base_params": "$params", "budget": 20}},
+            ],
+        }
+    )
+
+    assert [call.tool for call in plan.tool_calls] == ["ResolvePlayers", "BatchSensitivity"]
+    assert plan.tool_calls[1].arguments["base_params"] == "$params"
+
+
+def test_plans_are_frozen(coach_service: BadmintonCoachService) -> None:
+    plan = Planner(adapter=coach_service.adapter).heuristic_plan("Axelsen vs Momota")
+
+    with pytest.raises(ValidationError):
+        plan.task_type = "strategy"
+    with pytest.raises(ValidationError):
+        plan.tool_calls[0].tool = "RunPAT"
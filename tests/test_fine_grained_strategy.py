@@ -55,6 +55,15 @@ def test_unforced_error_proxy_supports_vectorized_inputs() -> None:
 
     pd.testing.assert_series_equal(vectorized, expected)
 
+    from_arrays = LocalCSVAdapter._estimate_unforced_error_proxy(
+        attack_rate=attack.to_numpy(),
+        safe_rate=safe.to_numpy(),
+        flick_rate=flick.to_numpy(),
+        points_for=points_for.to_numpy(),
+        points_against=points_against.to_numpy(),
+    )
+    assert from_arrays.tolist() == expected.tolist()
+
 
 @pytest.mark.parametrize(
     ("points_for", "points_against"),
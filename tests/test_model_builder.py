@@ -2,7 +2,10 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from coach.model.builder import build_matchup_model
+import pytest
+
+import coach.model.builder as builder_module
+from coach.model.builder import build_matchup_model, render_template
 from coach.model.params import (
     InfluenceWeights,
     MatchupParams,
@@ -68,3 +71,61 @@ def test_builder_injects_template_values(tmp_path: Path) -> None:
     assert "w_rally_tolerance=0.020000" in text
     assert "#assert BadmintonMatch reaches A_WinsMatch with prob;" in text
     assert result.params_json_path.exists()
+
+
+def test_builder_can_skip_params_json(tmp_path: Path) -> None:
+    result = build_matchup_model(
+        params=_make_params(),
+        out_path=tmp_path / "candidate_001.pcsp",
+        write_params=False,
+    )
+
+    assert result.matchup_pcsp_path.exists()
+    assert result.params_json_path is None
+    assert not (tmp_path / "params.json").exists()
+
+
+def test_builder_creates_missing_output_directories(tmp_path: Path) -> None:
+    out_path = tmp_path / "nested" / "candidates" / "candidate_001.pcsp"
+    result = build_matchup_model(params=_make_params(), out_path=out_path)
+
+    assert result.matchup_pcsp_path == out_path
+    assert out_path.stat().st_size > 0
+    assert result.params_json_path == out_path.parent / "params.json"
+    assert result.params_json_path.exists()
+
+
+def test_render_template_substitutes_and_reports_missing_keys() -> None:
+    template = "X{a = 1;} {{ p }} / {{q}}{{ p }}"
+    assert render_template(template, {"p": 0.5, "q": "7"}) == "X{a = 1;} 0.5 / 70.5"
+
+    with pytest.raises(ValueError, match="Missing template parameters: q, r"):
+        render_template("{{ r }} {{ q }} {{ p }}", {"p": 1})
+
+
+def test_builder_rereads_template_only_after_it_changes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    template = templates / "tiny.pcsp"
+    template.write_text("srv = {{ pA_srv_win }};\n", encoding="utf-8")
+    monkeypatch.setattr(builder_module, "_TEMPLATES_DIR", templates)
+    reads = {"count": 0}
+    original_read_text = Path.read_text
+
+    def _counting_read_text(self: Path, *args, **kwargs):  # type: ignore[no-untyped-def]
+        if self == template:
+            reads["count"] += 1
+        return original_read_text(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "read_text", _counting_read_text)
+    params = _make_params()
+    for idx in range(3):
+        build_matchup_model(params=params, template_name="tiny.pcsp", out_path=tmp_path / f"c{idx}.pcsp", write_params=False)
+    assert reads["count"] == 1
+
+    template.write_text("changed = {{ pA_srv_win }};\n", encoding="utf-8")
+    result = build_matchup_model(params=params, template_name="tiny.pcsp", out_path=tmp_path / "c3.pcsp", write_params=False)
+    assert original_read_text(result.matchup_pcsp_path, encoding="utf-8").startswith("changed = ")
+
+    with pytest.raises(FileNotFoundError, match="Template not found"):
+        build_matchup_model(params=params, template_name="missing.pcsp", out_path=tmp_path / "m.pcsp")
@@ -11,20 +11,23 @@ from coach.model.params import (
     ServeMix,
 )
 
+# The params models are frozen, so one validated prototype can back every test player.
+_PLAYER_PROTOTYPE = PlayerParams(
+    player_id="prototype",
+    name="Prototype",
+    base_srv_win=0.57,
+    base_rcv_win=0.52,
+    unforced_error_rate=0.18,
+    return_pressure=0.52,
+    clutch_point_win=0.51,
+    serve_mix=ServeMix(short=0.65, flick=0.35),
+    rally_style=RallyStyleMix(attack=0.5, neutral=0.3, safe=0.2),
+    sample_matches=20,
+)
+
 
 def make_player(player_id: str, name: str) -> PlayerParams:
-    return PlayerParams(
-        player_id=player_id,
-        name=name,
-        base_srv_win=0.57,
-        base_rcv_win=0.52,
-        unforced_error_rate=0.18,
-        return_pressure=0.52,
-        clutch_point_win=0.51,
-        serve_mix=ServeMix(short=0.65, flick=0.35),
-        rally_style=RallyStyleMix(attack=0.5, neutral=0.3, safe=0.2),
-        sample_matches=20,
-    )
+    return _PLAYER_PROTOTYPE.model_copy(update={"player_id": player_id, "name": name})
 
 
 def test_serve_mix_must_sum_to_one() -> None:
@@ -69,6 +72,32 @@ def test_matchup_constraints_and_adjustments() -> None:
     assert adjusted.player_a.clutch_point_win > params.player_a.clutch_point_win
 
 
+def test_params_are_frozen_and_adjustments_stay_valid() -> None:
+    params = MatchupParams(
+        player_a=make_player("a", "Player A"),
+        player_b=make_player("b", "Player B"),
+        weights=InfluenceWeights(w_short=0.04, w_attack=0.06, w_safe=0.05),
+    )
+    with pytest.raises(ValidationError):
+        params.player_a.serve_mix.short = 0.9
+
+    adjusted = params.with_adjustments(serve_short_delta=0.5, attack_delta=0.6)
+    assert MatchupParams.model_validate(adjusted.model_dump()) == adjusted
+
+    all_attack = params.model_copy(
+        update={
+            "player_a": params.player_a.model_copy(
+                update={"rally_style": RallyStyleMix(attack=1.0, neutral=0.0, safe=0.0)}
+            )
+        }
+    )
+    for attack_delta in (-0.2, 0.0):
+        adjusted = all_attack.with_adjustments(attack_delta=attack_delta)
+        style = adjusted.player_a.rally_style
+        assert style.neutral == pytest.approx(style.safe)
+        assert MatchupParams.model_validate(adjusted.model_dump()) == adjusted
+
+
 def test_unforced_error_bounds_are_validated() -> None:
     with pytest.raises(ValidationError):
         PlayerParams(
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from pathlib import Path
+
 import pytest
 
-from coach.pat.parser import parse_probability
+from coach.pat import parser
+from coach.pat.parser import parse_probability, parse_probability_file, read_pat_output
 
 
 @pytest.mark.parametrize(
@@ -32,8 +35,57 @@ def test_parse_probability_ignores_non_probability_numbers_on_later_lines() -> N
     assert abs(parse_probability(text) - 0.6) < 1e-9
 
 
+def test_parse_probability_skips_later_keywords_without_values() -> None:
+    text = "Probability [0.25, 0.75]\nprobability stats 5\nWITH PROB\n0.5 follows"
+    assert abs(parse_probability(text) - 0.5) < 1e-9
+    assert abs(parse_probability("Probability [0.25, 0.75]\nprobability stats 5\n") - 0.75) < 1e-9
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "with probability 0.1 PROBABILITY: 0.2 with\t\nPrOb 0.3",
+        "withprob probprobability WITH  ability prob",
+        "prob\x1cwith\x1cprobability",
+        "with prob \u0131 pr\u0130b with \u017f prob",
+    ],
+)
+def test_context_ends_match_keyword_pattern(text: str) -> None:
+    expected = [match.end() for match in parser._PROB_CONTEXT_PATTERN.finditer(text)]
+    assert list(parser._context_ends(text)) == expected[::-1]
+    raw = text.encode("utf-8")
+    if parser._TEXT_ONLY_BYTES_PATTERN.search(raw) is None:
+        assert list(parser._context_ends(raw)) == list(parser._context_ends(text))
+
+
 def test_parse_probability_failure_has_excerpt() -> None:
     with pytest.raises(ValueError) as err:
         parse_probability("No probability keyword exists in this output")
     assert "Could not parse probability" in str(err.value)
     assert "Excerpt" in str(err.value)
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        b"The Assertion is Valid with Probability [0.6125, 0.6125];\nMaximum difference threshold : 1E-06\n",
+        b"Probability [0.25, 0.75]\r\nprobability stats 5\r\nWITH PROB\r0.5 follows",
+        "Probabilité ignored\nwith prob 0.42\n".encode("utf-8"),
+        b"\xef\xbb\xbfProbability = 0.3",
+    ],
+)
+def test_parse_probability_file_matches_text_parser(tmp_path: Path, raw: bytes) -> None:
+    path = tmp_path / "pat_output.txt"
+    path.write_bytes(raw)
+    assert parse_probability_file(path) == parse_probability(read_pat_output(path))
+
+
+def test_parse_probability_file_failure_matches_text_parser(tmp_path: Path) -> None:
+    for name, raw in (("empty.txt", b""), ("none.txt", b"No probability keyword exists in this output")):
+        path = tmp_path / name
+        path.write_bytes(raw)
+        with pytest.raises(ValueError) as err:
+            parse_probability_file(path)
+        with pytest.raises(ValueError) as expected:
+            parse_probability(read_pat_output(path))
+        assert str(err.value) == str(expected.value)
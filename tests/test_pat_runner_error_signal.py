@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from coach.pat.runner import _extract_pat_model_error
+from pathlib import Path
+
+from coach.pat.runner import _extract_pat_model_error, _infer_hint_from_output, _log_model_error
 
 
 def test_extract_pat_model_error_parsing_line() -> None:
@@ -15,3 +17,33 @@ def test_extract_pat_model_error_none_for_clean_output() -> None:
     stdout = "PAT finished successfully.\n"
     stderr = ""
     assert _extract_pat_model_error(stdout=stdout, stderr=stderr) is None
+
+
+def test_extract_pat_model_error_prefers_stdout_then_stderr() -> None:
+    stdout = "Loading model...\n  Runtime Exception occurred: bad index  \n"
+    stderr = "Invalid arguments."
+    assert _extract_pat_model_error(stdout=stdout, stderr=stderr) == "Runtime Exception occurred: bad index"
+    assert _extract_pat_model_error(stdout="ok\n", stderr=stderr) == "Invalid arguments."
+
+
+def test_infer_hint_checks_nesc_image_signature_first() -> None:
+    stdout = "Object reference not set to an instance of an object"
+    stderr = "Invalid Arguments. Invalid image"
+    hint = _infer_hint_from_output(stdout=stdout, stderr=stderr)
+    assert hint is not None and hint.startswith("PAT3.Console under Mono")
+    assert _infer_hint_from_output(stdout="PAT finished successfully.", stderr="") is None
+
+
+def test_log_model_error_matches_text_scan(tmp_path: Path) -> None:
+    cases = [
+        "PAT finished successfully.\n",
+        "",
+        "Loading...\r\n  Parsing Error: unexpected token ';'  \r\nmore\r\n",
+        "x" * 200_000 + "\nINVALID FILE NAME: model.pcsp",
+        "first\rRuntime exception occurred: boom\rlast",
+    ]
+    for idx, text in enumerate(cases):
+        log = tmp_path / f"log{idx}.txt"
+        log.write_bytes(text.encode("utf-8"))
+        assert _log_model_error(log) == _extract_pat_model_error(stdout=text, stderr="")
+    assert _log_model_error(tmp_path / "missing.txt") is None
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 
 from coach.pat.mock_pat import (
@@ -8,24 +7,18 @@ from coach.pat.mock_pat import (
     _LEGACY_PARAM_ALIASES,
     _extract_params_from_pcsp,
     mock_probability,
+    mock_probability_batch,
+    mock_run,
 )
 from coach.pat.parser import parse_probability, read_pat_output
 from coach.pat.runner import run_pat
+from coach.utils import read_json
 
 
-def test_run_pat_mock_writes_artifacts_and_summary(tmp_path: Path) -> None:
-    pcsp_path = tmp_path / "minimal.pcsp"
-    pcsp_path.write_text(
-        "// inline params for mock parser\n"
-        "pA_srv_win = 0.62\n"
-        "pA_rcv_win = 0.57\n"
-        "#assert M reaches X with prob;\n",
-        encoding="utf-8",
-    )
-
+def test_run_pat_mock_writes_artifacts_and_summary(tmp_path: Path, minimal_mock_pcsp: Path) -> None:
     out_path = tmp_path / "pat_output.txt"
     result = run_pat(
-        pcsp_path=pcsp_path,
+        pcsp_path=minimal_mock_pcsp,
         out_path=out_path,
         mode="mock",
         pat_console_path=None,
@@ -40,7 +33,7 @@ def test_run_pat_mock_writes_artifacts_and_summary(tmp_path: Path) -> None:
 
     summary_path = tmp_path / "summary.json"
     assert summary_path.exists()
-    summary = json.loads(summary_path.read_text(encoding="utf-8"))
+    summary = read_json(summary_path)
     assert isinstance(summary.get("probability"), float)
 
     assert (tmp_path / "pat_stdout.txt").exists()
@@ -48,6 +41,22 @@ def test_run_pat_mock_writes_artifacts_and_summary(tmp_path: Path) -> None:
     assert (tmp_path / "pat_run.json").exists()
 
 
+def test_run_pat_mock_can_leave_summary_to_the_caller(tmp_path: Path, minimal_mock_pcsp: Path) -> None:
+    result = run_pat(
+        pcsp_path=minimal_mock_pcsp,
+        out_path=tmp_path / "pat_output.txt",
+        mode="mock",
+        pat_console_path=None,
+        timeout_s=30,
+        use_mono=None,
+        write_summary=False,
+    )
+
+    assert result["ok"] is True
+    assert (tmp_path / "pat_run.json").exists()
+    assert not (tmp_path / "summary.json").exists()
+
+
 def test_run_pat_mock_respects_unforced_error_knobs(tmp_path: Path) -> None:
     better_path = tmp_path / "better.pcsp"
     better_path.write_text(
@@ -203,3 +212,44 @@ def test_mock_pcsp_parser_accepts_all_declared_param_keys() -> None:
         params = _extract_params_from_pcsp(f"{key.upper()} = {value}\n")
         expected_key = _LEGACY_PARAM_ALIASES.get(key.lower(), key)
         assert params == {expected_key: value}
+
+
+def test_mock_pcsp_parser_matches_regex_scan_on_edge_cases() -> None:
+    text = (
+        "// pA_srv_win=0.61, xpA_rcv_win=0.9, clutch_A_extra=0.3\n"
+        "clutch_A : +.45; ue_rate_A=0.2 unforced_error_A =0.17\n"
+        "pA_rcv_win = 5. pA_srv_win=\n0.63 rally_style_B_safe=.\n"
+    )
+    expected = {
+        "pA_srv_win": 0.63,
+        "clutch_A": 0.45,
+        "unforced_error_A": 0.17,
+        "pA_rcv_win": 5.0,
+    }
+    assert _extract_params_from_pcsp(text) == expected
+    # Non-ASCII input takes the regex path and agrees with the ASCII scan.
+    assert _extract_params_from_pcsp(text + "// Axelsen – Antonsen\n") == expected
+
+
+def test_mock_run_reads_crlf_pcsp_like_lf(tmp_path: Path) -> None:
+    body = "pA_srv_win = 0.64\npA_rcv_win=0.41\nclutch_A: 0.7\n"
+    lf_path = tmp_path / "lf.pcsp"
+    crlf_path = tmp_path / "crlf.pcsp"
+    lf_path.write_bytes(body.encode("utf-8"))
+    crlf_path.write_bytes(body.replace("\n", "\r\n").encode("utf-8"))
+
+    lf = mock_run(lf_path, tmp_path / "lf.txt")
+    crlf = mock_run(crlf_path, tmp_path / "crlf.txt")
+    assert crlf["probability"] == lf["probability"]
+
+
+def test_mock_probability_batch_matches_scalar_calls() -> None:
+    params_list = [
+        {},
+        {"pA_srv_win": 0.62, "pA_rcv_win": 0.48, "clutch_A": 0.7},
+        {"PA_SRV_WIN": 0.99, "ue_rate_A": 0.05, "ue_rate_B": 0.4, "rally_style_A_attack": 0.9},
+        {"pA_srv_win": 0.01, "pA_rcv_win": 0.02, "return_pressure_B": 0.99},
+    ]
+    batch = mock_probability_batch(params_list)
+    assert batch.tolist() == [mock_probability(params) for params in params_list]
+    assert mock_probability_batch([]).shape == (0,)
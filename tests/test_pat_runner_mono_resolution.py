@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import sys
 from pathlib import Path
 
-from coach.pat.runner import _resolve_use_mono, _should_try_pat3_mono_compat_fallback
+import pytest
+
+from coach.pat.runner import (
+    _prepare_pat3_mono_compat_runtime,
+    _resolve_use_mono,
+    _should_try_pat3_mono_compat_fallback,
+)
 
 
 def test_resolve_use_mono_auto_uses_mono_for_exe_paths() -> None:
@@ -27,3 +34,50 @@ def test_pat3_mono_compat_fallback_triggers_on_nesc_startup_signature(tmp_path:
         )
         is True
     )
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="uses a POSIX shell script as mcs")
+def test_pat3_compat_runtime_reuses_cached_shim(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    install = tmp_path / "pat"
+    install.mkdir()
+    console = install / "PAT3.Console.exe"
+    console.write_text("console", encoding="utf-8")
+    (install / "PAT.Common.dll").write_text("common", encoding="utf-8")
+    (install / "PAT3.Console.exe.config").write_text("config", encoding="utf-8")
+    original_nesc = install / "Modules" / "NESC" / "PAT.Module.NESC.dll"
+    original_nesc.parent.mkdir(parents=True)
+    original_nesc.write_text("original nesc", encoding="utf-8")
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    calls = tmp_path / "mcs_calls.txt"
+    mcs = bin_dir / "mcs"
+    mcs.write_text(
+        f'#!/bin/sh\necho call >> "{calls}"\nfor arg; do case "$arg" in -out:*) echo dll > "${{arg#-out:}}";; esac; done\n',
+        encoding="utf-8",
+    )
+    mcs.chmod(0o755)
+
+    for run in ("run1", "run2"):
+        compat_console = _prepare_pat3_mono_compat_runtime(
+            pat_console_path=console,
+            run_dir=tmp_path / run,
+            mono_path=str(bin_dir / "mono"),
+        )
+        assert compat_console.read_text(encoding="utf-8") == "console"
+        shim = compat_console.parent / "Modules" / "NESC" / "PAT.Module.NESC.dll"
+        assert shim.read_text(encoding="utf-8") == "dll\n"
+        # Only binaries share inodes with the install; everything else is a private copy.
+        assert compat_console.stat().st_ino == console.stat().st_ino
+        config = compat_console.parent / "PAT3.Console.exe.config"
+        assert config.stat().st_ino != (install / "PAT3.Console.exe.config").stat().st_ino
+
+    assert calls.read_text(encoding="utf-8").count("call") == 1
+    # The runtime is hardlinked from the install, but replacing the shim must not write through to it.
+    assert original_nesc.read_text(encoding="utf-8") == "original nesc"
+    assert sorted(path.name for path in install.rglob("*") if path.is_file()) == [
+        "PAT.Common.dll",
+        "PAT.Module.NESC.dll",
+        "PAT3.Console.exe",
+        "PAT3.Console.exe.config",
+    ]
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from coach.pat.runner import resolve_pat_console_path
+from coach.pat.runner import _resolve_existing_console_path, resolve_pat_console_path
 
 
 def test_resolve_pat_console_path_accepts_directory_with_pat3_console(tmp_path: Path) -> None:
@@ -25,3 +25,35 @@ def test_resolve_pat_console_path_prefers_pat_console_when_multiple_exist(tmp_pa
 
     resolved = resolve_pat_console_path(pat_dir)
     assert resolved == pat
+
+
+def test_resolve_pat_console_path_memoises_existing_installs(tmp_path: Path) -> None:
+    pat_dir = tmp_path / "pat"
+    pat_dir.mkdir(parents=True, exist_ok=True)
+    assert resolve_pat_console_path(pat_dir / "PAT.Console.exe") == (pat_dir / "PAT.Console.exe").resolve()
+
+    pat3 = pat_dir / "PAT3.Console.exe"
+    pat3.write_text("", encoding="utf-8")
+    assert resolve_pat_console_path(pat_dir) == pat3
+
+    # Directory lookups are cached while the install stays put.
+    (pat_dir / "PAT.Console.exe").write_text("", encoding="utf-8")
+    assert resolve_pat_console_path(pat_dir) == pat3
+    _resolve_existing_console_path.cache_clear()
+    assert resolve_pat_console_path(pat_dir) == pat_dir / "PAT.Console.exe"
+
+
+def test_resolve_pat_console_path_falls_back_to_single_console_exe(tmp_path: Path) -> None:
+    pat_dir = tmp_path / "pat"
+    pat_dir.mkdir(parents=True, exist_ok=True)
+    (pat_dir / "PAT.Common.dll").write_text("", encoding="utf-8")
+    custom = pat_dir / "PAT5.Console.exe"
+    custom.write_text("", encoding="utf-8")
+
+    assert resolve_pat_console_path(pat_dir) == custom
+
+    other = tmp_path / "ambiguous"
+    other.mkdir()
+    (other / "A.Console.exe").write_text("", encoding="utf-8")
+    (other / "B.Console.exe").write_text("", encoding="utf-8")
+    assert resolve_pat_console_path(other) == other.resolve()
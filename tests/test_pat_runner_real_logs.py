@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from coach.pat.runner import _LOG_EXCERPT_BYTES, _read_log_excerpt, run_pat
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="uses a POSIX shell script as the PAT console")
+def test_run_pat_real_exposes_selected_attempt_logs(tmp_path: Path) -> None:
+    console = tmp_path / "pat_console.sh"
+    console.write_text(
+        "#!/bin/sh\n"
+        'echo "Verification result: valid with probability 0.61" > "$3"\n'
+        "echo 'PAT stdout line'\n"
+        "echo 'PAT stderr line' >&2\n",
+        encoding="utf-8",
+    )
+    console.chmod(0o755)
+    pcsp_path = tmp_path / "minimal.pcsp"
+    pcsp_path.write_text("#assert M reaches X with prob;\n", encoding="utf-8")
+
+    result = run_pat(
+        pcsp_path=pcsp_path,
+        out_path=tmp_path / "pat_output.txt",
+        mode="real",
+        pat_console_path=console,
+        timeout_s=30,
+        use_mono=False,
+    )
+
+    assert result["ok"] is True
+    assert result["probability"] == pytest.approx(0.61)
+    assert (tmp_path / "pat_stdout.txt").read_text(encoding="utf-8") == "PAT stdout line\n"
+    assert (tmp_path / "pat_stderr.txt").read_text(encoding="utf-8") == "PAT stderr line\n"
+    assert (tmp_path / "pat_stdout_attempt1.txt").read_text(encoding="utf-8") == "PAT stdout line\n"
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="uses a POSIX shell script as the PAT console")
+def test_run_pat_real_timeout_keeps_partial_logs(tmp_path: Path) -> None:
+    console = tmp_path / "pat_console.sh"
+    console.write_text(
+        "#!/bin/sh\necho 'PAT still exploring'\necho 'PAT warning' >&2\nexec sleep 30\n",
+        encoding="utf-8",
+    )
+    console.chmod(0o755)
+    pcsp_path = tmp_path / "minimal.pcsp"
+    pcsp_path.write_text("#assert M reaches X with prob;\n", encoding="utf-8")
+
+    result = run_pat(
+        pcsp_path=pcsp_path,
+        out_path=tmp_path / "pat_output.txt",
+        mode="real",
+        pat_console_path=console,
+        timeout_s=1,
+        use_mono=False,
+    )
+
+    assert result["ok"] is False
+    assert result["error"] == "PAT timed out after 1s"
+    assert (tmp_path / "pat_stdout.txt").read_text(encoding="utf-8") == "PAT still exploring\n"
+    assert (tmp_path / "pat_stderr.txt").read_text(encoding="utf-8") == "PAT warning\n"
+
+
+def test_read_log_excerpt_keeps_head_and_tail_of_large_logs(tmp_path: Path) -> None:
+    log = tmp_path / "pat_stdout_attempt1.txt"
+    filler = b"x" * (_LOG_EXCERPT_BYTES * 3)
+    log.write_bytes(b"Invalid arguments.\r\n" + filler + b"\r\nParsing error: line 3\r\n")
+
+    excerpt = _read_log_excerpt(log)
+
+    assert excerpt.startswith("Invalid arguments.\n")
+    assert excerpt.endswith("Parsing error: line 3\n")
+    assert len(excerpt) < 2 * _LOG_EXCERPT_BYTES + 2
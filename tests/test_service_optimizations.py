@@ -1,10 +1,33 @@
 from __future__ import annotations
 
+import csv
+import datetime as dt
+import re
+import shutil
+import tarfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+import pytest
+
+import coach.analysis.result_cache as result_cache
+import coach.config as config_module
+import coach.data.adapters.local_csv as local_csv_module
+import coach.model.builder as builder_module
 import coach.service as service_module
-from coach.data.stats_builder import estimate_influence_weights
+import coach.utils as utils_module
+from coach.analysis.batch_predict import run_batch_predictions
+from coach.config import CoachConfig
+from coach.data.adapters.local_csv import LocalCSVAdapter
+from coach.data.stats_builder import _resolve_player, estimate_influence_weights
+from coach.runs import new_run_dir
 from coach.service import StrategyAdjustment
+from coach.utils import read_json, write_json
 
 
 def test_get_player_params_returns_detached_cached_copy(csv_adapter) -> None:
@@ -18,6 +41,19 @@ def test_get_player_params_returns_detached_cached_copy(csv_adapter) -> None:
     assert second["serve_mix"]["short"] != 0.01
 
 
+def test_resolve_player_uses_keyed_indexes(csv_adapter) -> None:
+    first = csv_adapter.players_df.iloc[0]
+    by_name = csv_adapter.resolve_player(f"  {str(first['name']).upper()} ")
+    by_id = _resolve_player(csv_adapter, str(first["player_id"]))
+
+    assert by_name.player_id == by_id.player_id == str(first["player_id"])
+    assert csv_adapter.player_name_index[csv_adapter._normalize_name(str(first["name"]))] == 0
+
+    surname = str(first["name"]).split()[-1].lower()
+    by_substring = csv_adapter.resolve_player(surname)
+    assert by_substring is csv_adapter.player_records[0]
+
+
 def test_estimate_influence_weights_reuses_adapter_cache(csv_adapter, monkeypatch) -> None:
     baseline = estimate_influence_weights(csv_adapter)
 
@@ -30,6 +66,16 @@ def test_estimate_influence_weights_reuses_adapter_cache(csv_adapter, monkeypatc
     assert cached == baseline
 
 
+def test_influence_weights_are_shared_until_matches_change(csv_adapter) -> None:
+    first = estimate_influence_weights(csv_adapter)
+    assert estimate_influence_weights(csv_adapter) is first
+
+    csv_adapter._matches_df = csv_adapter.matches_df.head(5).copy()
+    refit = estimate_influence_weights(csv_adapter)
+    assert refit is not first
+    assert estimate_influence_weights(csv_adapter) is refit
+
+
 def test_execute_pat_uses_runner_probability_without_reparsing(
     coach_service,
     monkeypatch,
@@ -58,7 +104,7 @@ def test_execute_pat_uses_runner_probability_without_reparsing(
     monkeypatch.setattr(service_module, "run_pat", _fake_run_pat)
     monkeypatch.setattr(
         service_module,
-        "read_pat_output",
+        "parse_probability_file",
         lambda path: (_ for _ in ()).throw(AssertionError("output should not be re-read when probability exists")),
     )
 
@@ -126,3 +172,569 @@ def test_effective_probabilities_account_for_opponent_phase_baselines(sample_mat
     assert weaker_server.effective_probabilities()["pA_rcv_win"] > stronger_server.effective_probabilities()[
         "pA_rcv_win"
     ]
+
+
+def test_local_csv_frames_are_parsed_once_per_file_version(tmp_path: Path, monkeypatch) -> None:
+    players_path = tmp_path / "players.csv"
+    players_path.write_text("player_id,name\nP1,Alpha One\n", encoding="utf-8")
+    calls = {"count": 0}
+    original = local_csv_module._read_players_csv
+
+    def _counting_read(path: Path):
+        calls["count"] += 1
+        return original(path)
+
+    monkeypatch.setattr(local_csv_module, "_read_players_csv", _counting_read)
+
+    first = LocalCSVAdapter(players_path=players_path).players_df
+    second = LocalCSVAdapter(players_path=players_path).players_df
+    assert calls["count"] == 1
+    assert first is not second
+
+    players_path.write_text("player_id,name\nP1,Alpha One\nP2,Beta Two\n", encoding="utf-8")
+    third = LocalCSVAdapter(players_path=players_path).players_df
+    assert calls["count"] == 2
+    assert len(third) == 2
+
+
+def test_matches_csv_parquet_sidecar_skips_reparse(tmp_path: Path, monkeypatch) -> None:
+    if local_csv_module.pq is None:
+        pytest.skip("pyarrow not installed")
+    matches_path = tmp_path / "matches.csv"
+    matches_path.write_text(
+        "date,playerA_id,playerB_id,winner_id\n2024-02-01,P1,P2,P1\n2024-01-01,P2,P1,P1\n",
+        encoding="utf-8",
+    )
+    calls = {"count": 0}
+    original = local_csv_module._parse_matches_csv
+
+    def _counting_parse(path: Path):
+        calls["count"] += 1
+        return original(path)
+
+    monkeypatch.setattr(local_csv_module, "_parse_matches_csv", _counting_parse)
+
+    parsed = local_csv_module._read_matches_csv(matches_path)
+    assert (tmp_path / "matches.csv.parquet").exists()
+    assert not list(tmp_path.glob("*.tmp"))
+    reloaded = local_csv_module._read_matches_csv(matches_path)
+    assert calls["count"] == 1
+    pd.testing.assert_frame_equal(parsed, reloaded)
+
+    matches_path.write_text("date,playerA_id,playerB_id,winner_id\n2024-03-01,P1,P2,P2\n", encoding="utf-8")
+    changed = local_csv_module._read_matches_csv(matches_path)
+    assert calls["count"] == 2
+    assert changed["winner_id"].tolist() == ["P2"]
+
+
+def test_csv_frame_cache_keeps_only_latest_version_per_path(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(local_csv_module, "_CSV_FRAME_CACHE", OrderedDict())
+    monkeypatch.setattr(local_csv_module, "_CSV_FRAME_CACHE_MAX_PATHS", 2)
+    players = tmp_path / "players.csv"
+    for version in range(3):
+        players.write_text(f"player_id,name\nP{version},Player {version}\n", encoding="utf-8")
+        frame = local_csv_module._load_frame_cached("players", players, pd.read_csv)
+        assert frame["player_id"].tolist() == [f"P{version}"]
+    assert len(local_csv_module._CSV_FRAME_CACHE) == 1
+
+    for name in ("a.csv", "b.csv"):
+        (tmp_path / name).write_text("player_id,name\nP1,Player 1\n", encoding="utf-8")
+        local_csv_module._load_frame_cached("players", tmp_path / name, pd.read_csv)
+    assert [Path(path).name for _, path in local_csv_module._CSV_FRAME_CACHE] == ["a.csv", "b.csv"]
+
+
+def test_matches_csv_keeps_numeric_looking_ids_as_text(tmp_path: Path) -> None:
+    matches_path = tmp_path / "matches.csv"
+    matches_path.write_text(
+        "date,playerA_id,playerB_id,winner_id,a_points\n2024-02-01,007,010,007,21\n2024-01-01,010,007,007,19\n",
+        encoding="utf-8",
+    )
+
+    parsed = local_csv_module._parse_matches_csv(matches_path)
+
+    assert parsed["playerA_id"].tolist() == ["010", "007"]
+    assert parsed["winner_id"].tolist() == ["007", "007"]
+    assert pd.api.types.is_datetime64_any_dtype(parsed["date"])
+    assert parsed["a_points"].dtype == np.int32
+
+
+def test_write_json_round_trips_sorted_numpy_payload(tmp_path: Path) -> None:
+    out = tmp_path / "payload.json"
+    write_json(out, {"b": np.float64(0.25), "a": [1, 2], "c": {"z": 1, "y": "ü"}})
+
+    assert read_json(out) == {"a": [1, 2], "b": 0.25, "c": {"y": "ü", "z": 1}}
+    assert out.read_text(encoding="utf-8").index('"a"') < out.read_text(encoding="utf-8").index('"b"')
+
+
+def test_write_json_keeps_non_finite_floats(tmp_path: Path) -> None:
+    out = tmp_path / "payload.json"
+    write_json(out, {"probability": float("nan"), "bounds": [float("inf"), 0.5]})
+
+    loaded = read_json(out)
+    assert np.isnan(loaded["probability"])
+    assert loaded["bounds"] == [float("inf"), 0.5]
+
+
+def test_write_json_accepts_the_same_types_on_every_path(tmp_path: Path, monkeypatch) -> None:
+    payload = {
+        "when": dt.datetime(2024, 5, 1, 12, 30),
+        "step": np.float64(0.25),
+        "counts": np.array([1, 2]),
+        "adjustment": StrategyAdjustment(attack_delta=0.1),
+    }
+    write_json(tmp_path / "orjson.json", payload)
+    write_json(tmp_path / "nan.json", {**payload, "probability": float("nan")})
+    monkeypatch.setattr(utils_module, "orjson", None)
+    write_json(tmp_path / "stdlib.json", payload)
+
+    expected = read_json(tmp_path / "orjson.json")
+    assert expected["when"] == "2024-05-01T12:30:00"
+    assert read_json(tmp_path / "stdlib.json") == expected
+    with_nan = read_json(tmp_path / "nan.json")
+    assert np.isnan(with_nan.pop("probability"))
+    assert with_nan == expected
+
+
+def test_write_json_replaces_files_atomically(tmp_path: Path) -> None:
+    out = tmp_path / "pat_run.json"
+    write_json(out, {"ok": True})
+    write_json(out, {"ok": False, "probability": None})
+
+    assert read_json(out) == {"ok": False, "probability": None}
+    assert [path.name for path in tmp_path.iterdir()] == ["pat_run.json"]
+
+    with pytest.raises(TypeError):
+        write_json(out, {"bad": object()})
+    assert read_json(out) == {"ok": False, "probability": None}
+    assert [path.name for path in tmp_path.iterdir()] == ["pat_run.json"]
+
+
+def test_adjustment_l1_changes_matches_scalar_path(sample_matchup_params) -> None:
+    rng = np.random.default_rng(7)
+    deltas = rng.uniform(-0.9, 0.9, size=(25, 8))
+
+    vectorized = sample_matchup_params.adjustment_l1_changes(deltas)
+    knobs = list(StrategyAdjustment.__dataclass_fields__)[:8]
+    expected = [
+        StrategyAdjustment(**dict(zip(knobs, row))).apply_to(sample_matchup_params).l1_change_from(sample_matchup_params)
+        for row in deltas.tolist()
+    ]
+
+    assert vectorized.tolist() == expected
+
+
+def test_in_memory_pat_cache_evicts_least_recently_used(monkeypatch) -> None:
+    monkeypatch.setattr(service_module, "_PAT_RESULT_CACHE", OrderedDict())
+    monkeypatch.setattr(service_module, "_PAT_RESULT_CACHE_MAX_ENTRIES", 2)
+    service_module._remember_pat_result("a", {"probability": 0.1})
+    service_module._remember_pat_result("b", {"probability": 0.2})
+    assert service_module._get_memory_pat_result("a") is not None
+    service_module._remember_pat_result("c", {"probability": 0.3})
+
+    assert list(service_module._PAT_RESULT_CACHE) == ["a", "c"]
+
+
+def test_execute_pat_reuses_cached_real_result_for_identical_pcsp(
+    coach_service,
+    monkeypatch,
+    tmp_path: Path,
+) -> None:
+    pcsp_path = tmp_path / "matchup.pcsp"
+    pcsp_path.write_text("// cache-test model\n#assert M reaches X with prob;\n", encoding="utf-8")
+    monkeypatch.setattr(service_module, "_PAT_RESULT_CACHE", OrderedDict())
+    calls = {"count": 0}
+
+    def _fake_run_pat(*, out_path: Path, **kwargs):  # type: ignore[no-untyped-def]
+        calls["count"] += 1
+        run_dir = out_path.parent
+        (run_dir / "pat_stdout.txt").write_text("ok", encoding="utf-8")
+        (run_dir / "pat_stderr.txt").write_text("", encoding="utf-8")
+        out_path.write_text("Probability [0.42, 0.42]", encoding="utf-8")
+        return {
+            "ok": True,
+            "returncode": 0,
+            "cmd": ["PAT.Console.exe"],
+            "stdout_path": str(run_dir / "pat_stdout.txt"),
+            "stderr_path": str(run_dir / "pat_stderr.txt"),
+            "pat_out_path": str(out_path),
+            "probability": 0.42,
+        }
+
+    monkeypatch.setattr(service_module, "run_pat", _fake_run_pat)
+    executions = []
+    for name in ("run_a", "run_b"):
+        run_dir = tmp_path / name
+        run_dir.mkdir()
+        executions.append(
+            coach_service._execute_pat(
+                pcsp_path=pcsp_path,
+                run_dir=run_dir,
+                mode="real",
+                pat_path=str(tmp_path / "PAT.Console.exe"),
+                timeout_s=5,
+            )
+        )
+
+    assert calls["count"] == 1
+    assert [execution.probability for execution in executions] == [0.42, 0.42]
+    assert executions[1].pat_out_path.read_text(encoding="utf-8") == "Probability [0.42, 0.42]"
+    assert any((coach_service.runs_root / ".pat_cache").glob("*.json"))
+
+    coach_service.clear_pat_cache()
+    assert not (coach_service.runs_root / ".pat_cache").exists()
+    rerun_dir = tmp_path / "run_c"
+    rerun_dir.mkdir()
+    coach_service._execute_pat(
+        pcsp_path=pcsp_path,
+        run_dir=rerun_dir,
+        mode="real",
+        pat_path=str(tmp_path / "PAT.Console.exe"),
+        timeout_s=5,
+    )
+    assert calls["count"] == 2
+
+
+def test_pat_cache_key_tracks_console_and_caps_cached_logs(monkeypatch, tmp_path: Path) -> None:
+    pcsp_path = tmp_path / "matchup.pcsp"
+    pcsp_path.write_text("#assert M reaches X with prob;\n", encoding="utf-8")
+    console = tmp_path / "PAT.Console.exe"
+    console.write_bytes(b"v1")
+    before = service_module._pat_cache_key(pcsp_path=pcsp_path, pat_console=console, use_mono=True)
+    console.write_bytes(b"v2-upgraded")
+    assert service_module._pat_cache_key(pcsp_path=pcsp_path, pat_console=console, use_mono=True) != before
+
+    monkeypatch.setattr(service_module, "_CACHED_LOG_BYTES", 8)
+    log = tmp_path / "pat_stdout.txt"
+    log.write_text("HEAD-123" + "x" * 1000 + "TAIL-789", encoding="utf-8")
+    cached = service_module._read_cached_log(log)
+    assert cached.startswith("HEAD-123") and cached.endswith("TAIL-789")
+    assert len(cached) < 100
+
+
+def test_incomplete_pat_cache_file_is_a_miss(coach_service, monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(service_module, "_PAT_RESULT_CACHE", OrderedDict())
+    cache_dir = coach_service.runs_root / ".pat_cache"
+    cache_dir.mkdir(parents=True)
+    write_json(cache_dir / "partial.json", {"probability": 0.5, "returncode": 0})
+    run_dir = tmp_path / "run"
+
+    loaded = coach_service._load_cached_pat_result("partial", run_dir=run_dir, out_path=run_dir / "pat_output.txt")
+
+    assert loaded is None
+    assert "partial" not in service_module._PAT_RESULT_CACHE
+
+
+def test_strategy_runs_real_candidate_pat_calls_concurrently(
+    csv_adapter,
+    monkeypatch,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.setattr(service_module, "_PAT_RESULT_CACHE", OrderedDict())
+    config = replace(CoachConfig.from_env(), pat_max_workers=4)
+    service = service_module.BadmintonCoachService(adapter=csv_adapter, runs_root=tmp_path / "runs", config=config)
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0, "baseline_active": False, "overlapped_baseline": False}
+
+    def _fake_run_pat(*, pcsp_path: Path, out_path: Path, **kwargs):  # type: ignore[no-untyped-def]
+        is_baseline = pcsp_path.name == "baseline.pcsp"
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            if is_baseline:
+                state["baseline_active"] = True
+            elif state["baseline_active"]:
+                state["overlapped_baseline"] = True
+        # Stay active until another call joins (or a generous deadline passes), so the overlap
+        # checks below do not depend on how quickly the pool is scheduled.
+        deadline = time.monotonic() + 1.0
+        while time.monotonic() < deadline:
+            with lock:
+                if state["peak"] > 1 and (state["overlapped_baseline"] or not is_baseline):
+                    break
+            time.sleep(0.005)
+        probability = 0.4 + (len(pcsp_path.read_text(encoding="utf-8")) % 100) / 1000
+        with lock:
+            state["active"] -= 1
+            if is_baseline:
+                state["baseline_active"] = False
+        run_dir = out_path.parent
+        run_dir.mkdir(parents=True, exist_ok=True)
+        for name in ("pat_stdout.txt", "pat_stderr.txt"):
+            (run_dir / name).write_text("", encoding="utf-8")
+        out_path.write_text(f"Probability [{probability}, {probability}]", encoding="utf-8")
+        return {
+            "ok": True,
+            "returncode": 0,
+            "cmd": ["PAT.Console.exe"],
+            "stdout_path": str(run_dir / "pat_stdout.txt"),
+            "stderr_path": str(run_dir / "pat_stderr.txt"),
+            "pat_out_path": str(out_path),
+            "probability": probability,
+        }
+
+    monkeypatch.setattr(service_module, "run_pat", _fake_run_pat)
+    names = csv_adapter.players_df["player_id"].tolist()
+    result = service.strategy(names[0], names[1], mode="real", budget=8, pat_path=str(tmp_path / "PAT.Console.exe"))
+
+    assert state["peak"] > 1
+    assert state["overlapped_baseline"]
+    assert result.improved_probability >= result.top_alternatives[-1].probability
+    assert result.delta == pytest.approx(result.improved_probability - result.baseline_probability)
+
+
+def test_repeated_real_strategy_replays_cached_candidate_results(
+    csv_adapter,
+    monkeypatch,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.setattr(service_module, "_PAT_RESULT_CACHE", OrderedDict())
+    service = service_module.BadmintonCoachService(adapter=csv_adapter, runs_root=tmp_path / "runs")
+    calls = {"count": 0}
+
+    def _fake_run_pat(*, pcsp_path: Path, out_path: Path, **kwargs):  # type: ignore[no-untyped-def]
+        calls["count"] += 1
+        probability = 0.4 + (len(pcsp_path.read_text(encoding="utf-8")) % 100) / 1000
+        run_dir = out_path.parent
+        run_dir.mkdir(parents=True, exist_ok=True)
+        for name in ("pat_stdout.txt", "pat_stderr.txt"):
+            (run_dir / name).write_text("", encoding="utf-8")
+        out_path.write_text(f"Probability [{probability}, {probability}]", encoding="utf-8")
+        return {
+            "ok": True,
+            "returncode": 0,
+            "cmd": ["PAT.Console.exe"],
+            "stdout_path": str(run_dir / "pat_stdout.txt"),
+            "stderr_path": str(run_dir / "pat_stderr.txt"),
+            "pat_out_path": str(out_path),
+            "probability": probability,
+        }
+
+    monkeypatch.setattr(service_module, "run_pat", _fake_run_pat)
+    names = csv_adapter.players_df["player_id"].tolist()
+    pat_path = str(tmp_path / "PAT.Console.exe")
+    first = service.strategy(names[0], names[1], mode="real", budget=8, pat_path=pat_path)
+    first_calls = calls["count"]
+    second = service.strategy(names[0], names[1], mode="real", budget=8, pat_path=pat_path)
+
+    assert first_calls > 1
+    assert calls["count"] == first_calls
+    assert second.improved_probability == first.improved_probability
+    replayed = read_json(second.run_dir / "candidates" / "candidate_001" / "pat_run.json")
+    assert replayed["cached"] is True
+
+
+def test_batch_predictions_reuse_cached_rows(coach_service, monkeypatch, tmp_path: Path) -> None:
+    calls = {"count": 0}
+    original_predict = coach_service.predict
+
+    def _counting_predict(*args, **kwargs):  # type: ignore[no-untyped-def]
+        calls["count"] += 1
+        return original_predict(*args, **kwargs)
+
+    monkeypatch.setattr(coach_service, "predict", _counting_predict)
+    first = run_batch_predictions(tmp_path / "first.csv", limit=2, service=coach_service, use_cache=True)
+    second = run_batch_predictions(tmp_path / "second.csv", limit=2, service=coach_service, use_cache=True)
+    run_batch_predictions(tmp_path / "fresh.csv", limit=2, service=coach_service)
+
+    assert calls["count"] == 4
+    assert first.read_text(encoding="utf-8") == second.read_text(encoding="utf-8")
+
+
+def test_batch_row_cache_misses_when_run_dir_is_gone(coach_service, monkeypatch, tmp_path: Path) -> None:
+    calls = {"count": 0}
+    original_predict = coach_service.predict
+
+    def _counting_predict(*args, **kwargs):  # type: ignore[no-untyped-def]
+        calls["count"] += 1
+        return original_predict(*args, **kwargs)
+
+    monkeypatch.setattr(coach_service, "predict", _counting_predict)
+    first = run_batch_predictions(tmp_path / "first.csv", limit=1, service=coach_service, use_cache=True)
+    with first.open(encoding="utf-8", newline="") as handle:
+        shutil.rmtree(next(csv.DictReader(handle))["run_dir"])
+    run_batch_predictions(tmp_path / "second.csv", limit=1, service=coach_service, use_cache=True)
+
+    assert calls["count"] == 2
+
+
+def test_batch_row_cache_key_tracks_template_text(coach_service, monkeypatch, tmp_path: Path) -> None:
+    template = tmp_path / "templates" / coach_service.template_name
+    template.parent.mkdir()
+    template.write_text("// v1\n", encoding="utf-8")
+    monkeypatch.setattr(builder_module, "_TEMPLATES_DIR", template.parent)
+
+    before = result_cache.cache_key(coach_service, "predict", mode="mock")
+    template.write_text("// v2, edited\n", encoding="utf-8")
+
+    assert result_cache.cache_key(coach_service, "predict", mode="mock") != before
+
+
+def test_config_from_env_is_cached_per_environment(monkeypatch) -> None:
+    monkeypatch.setenv("PAT_TIMEOUT_S", "45")
+    first = CoachConfig.from_env()
+    assert CoachConfig.from_env() is first
+
+    monkeypatch.setenv("PAT_TIMEOUT_S", "90")
+    changed = CoachConfig.from_env()
+    assert changed is not first
+    assert changed.pat_timeout_s == 90
+
+
+def test_pat_max_workers_defaults_to_at_most_four(monkeypatch) -> None:
+    monkeypatch.setenv("PAT_MAX_WORKERS", "")
+    monkeypatch.setattr(config_module.os, "cpu_count", lambda: 32)
+    config_module._config_from_values.cache_clear()
+    try:
+        assert CoachConfig.from_env().pat_max_workers == 4
+    finally:
+        config_module._config_from_values.cache_clear()
+
+
+def test_batch_predictions_can_archive_run_dirs(coach_service, tmp_path: Path) -> None:
+    output = run_batch_predictions(
+        tmp_path / "predictions.csv",
+        limit=2,
+        service=coach_service,
+        use_cache=False,
+        archive_runs=True,
+    )
+
+    tar_path = output.with_suffix(".runs.tar")
+    with output.open(encoding="utf-8", newline="") as f:
+        refs = [row["run_dir"] for row in csv.DictReader(f)]
+    run_ids = [ref.split("#", 1)[1] for ref in refs]
+    assert all(ref.startswith(f"{tar_path}#") for ref in refs)
+    assert not any((coach_service.runs_root / run_id).exists() for run_id in run_ids)
+    with tarfile.open(tar_path) as tar:
+        names = tar.getnames()
+    assert all(f"{run_id}/summary.json" in names for run_id in run_ids)
+
+
+@pytest.mark.parametrize("use_rapidfuzz", [True, False])
+def test_resolve_player_suggests_close_names(csv_adapter, monkeypatch, use_rapidfuzz: bool) -> None:
+    if not use_rapidfuzz:
+        monkeypatch.setattr(local_csv_module, "fuzz_process", None)
+    elif local_csv_module.fuzz_process is None:
+        pytest.skip("rapidfuzz not installed")
+
+    with pytest.raises(ValueError, match="Did you mean: Kento MOMOTA"):
+        csv_adapter.resolve_player("Kento Momta")
+
+
+def test_player_matches_use_row_index_equivalently(csv_adapter) -> None:
+    cutoff = str(csv_adapter.matches_df["date"].iloc[len(csv_adapter.matches_df) // 2].date())
+    for player_id in csv_adapter.players_df["player_id"].head(5):
+        for as_of_date in (None, cutoff):
+            window_df = csv_adapter._window_filter(window=10, as_of_date=as_of_date)
+            mask = (window_df["playerA_id"] == player_id) | (window_df["playerB_id"] == player_id)
+            expected = window_df.loc[mask].sort_values("date").tail(10)
+            if expected.empty:
+                continue
+            actual = csv_adapter.get_player_matches(player_id, window=10, as_of_date=as_of_date)
+            pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_matchup_params_match_separate_adapter_calls(csv_adapter) -> None:
+    latest = csv_adapter.matches_df.iloc[-1]
+    player_a, player_b = latest["playerA_id"], latest["playerB_id"]
+    window_df = csv_adapter._window_filter(window=20, as_of_date=None)
+    pair_mask = window_df["playerA_id"].isin([player_a, player_b]) & window_df["playerB_id"].isin([player_a, player_b])
+
+    a_stats, b_stats, h2h = csv_adapter.get_matchup_params(player_a, player_b, window=10)
+
+    assert a_stats == csv_adapter.get_player_params(player_a, window=10)
+    assert b_stats == csv_adapter.get_player_params(player_b, window=10)
+    assert h2h["matches"] >= 1
+    assert h2h["matches"] == int((pair_mask & (window_df["playerA_id"] != window_df["playerB_id"])).sum())
+
+
+def test_player_records_map_blank_cells_to_none(tmp_path: Path) -> None:
+    players_path = tmp_path / "players.csv"
+    players_path.write_text("player_id,name,country\nP1,Alpha One,Denmark\nP2,Beta Two,\n", encoding="utf-8")
+    adapter = LocalCSVAdapter(players_path=players_path)
+
+    first, second = adapter.player_records
+    assert (first.country, first.handedness) == ("Denmark", None)
+    assert (second.country, second.handedness) == (None, None)
+    assert _resolve_player(adapter, "P2") is second
+
+
+def test_window_filter_slices_sorted_dates_like_a_mask(csv_adapter) -> None:
+    matches = csv_adapter.matches_df
+    for as_of_date in (None, str(matches["date"].iloc[10].date()), "2000-01-01"):
+        expected = matches if as_of_date is None else matches[matches["date"] <= pd.Timestamp(as_of_date)]
+        pd.testing.assert_frame_equal(csv_adapter._window_filter(window=3, as_of_date=as_of_date), expected.tail(12))
+
+
+def test_new_run_dir_creates_missing_base_directories(tmp_path: Path) -> None:
+    run_id, run_dir = new_run_dir(prefix="pat", base_dir=tmp_path / "nested" / "runs")
+    assert run_dir.is_dir() and run_dir.name == run_id
+    assert re.fullmatch(r"pat_\d{8}_\d{6}_[0-9a-f]{8}", run_id)
+
+    second_id, second_dir = new_run_dir(prefix="pat", base_dir=tmp_path / "nested" / "runs")
+    assert second_dir.is_dir() and second_id != run_id
+
+
+def test_pat_target_is_resolved_once_per_override(coach_service, monkeypatch) -> None:
+    service_module._resolve_pat_target.cache_clear()
+    calls = {"count": 0}
+    original = service_module.CoachConfig.resolve_use_mono
+
+    def _counting_resolve(self, pat_console_path=None):  # type: ignore[no-untyped-def]
+        calls["count"] += 1
+        return original(self, pat_console_path)
+
+    monkeypatch.setattr(service_module.CoachConfig, "resolve_use_mono", _counting_resolve)
+    first = service_module._resolve_pat_target(coach_service.config, "~/pat/PAT.Console.exe")
+    second = service_module._resolve_pat_target(coach_service.config, "~/pat/PAT.Console.exe")
+    assert first == second
+    assert first[0] == Path("~/pat/PAT.Console.exe").expanduser()
+    assert calls["count"] == 1
+    service_module._resolve_pat_target.cache_clear()
+
+
+def test_warmup_builds_adapter_indexes(coach_service) -> None:
+    adapter = coach_service.adapter
+    assert adapter._match_row_index is None
+    coach_service.warmup()
+    assert adapter._player_name_tables is not None
+    assert adapter._player_id_index is not None
+    assert adapter._match_row_index is not None
+
+
+def test_strategy_early_stop_skips_remaining_candidates(coach_service, csv_adapter) -> None:
+    names = csv_adapter.players_df["player_id"].tolist()
+    full = coach_service.strategy(names[0], names[1], mode="mock", budget=8)
+    stopped = coach_service.strategy(
+        names[0], names[1], mode="mock", budget=8, early_stop_k=2, early_stop_margin=-1.0
+    )
+
+    assert len(full.top_alternatives) == 5
+    assert len(stopped.top_alternatives) == 2
+    assert len(list((stopped.run_dir / "candidates").glob("*.pcsp"))) == 2
+    assert stopped.baseline_probability == full.baseline_probability
+    with pytest.raises(ValueError, match="early_stop_k"):
+        coach_service.strategy(names[0], names[1], mode="mock", budget=8, early_stop_k=0)
+
+
+def test_prediction_artifacts_share_one_params_dump(coach_service, csv_adapter) -> None:
+    names = csv_adapter.players_df["player_id"].tolist()
+    result = coach_service.predict(names[0], names[1], mode="mock")
+
+    stats = read_json(result.run_dir / "stats.json")
+    summary = read_json(result.run_dir / "summary.json")
+    assert summary["params_used"] == result.params.model_dump()
+    assert stats["weights"] == result.stats.weights.model_dump() == summary["params_used"]["weights"]
+
+
+def test_as_of_dates_are_parsed_once(csv_adapter) -> None:
+    local_csv_module._as_of_timestamp.cache_clear()
+    player_id = csv_adapter.players_df["player_id"].iloc[0]
+    as_of = str(csv_adapter.matches_df["date"].iloc[len(csv_adapter.matches_df) // 2].date())
+
+    first = csv_adapter.get_player_matches(player_id, window=10, as_of_date=as_of)
+    second = csv_adapter.get_player_matches(player_id, window=10, as_of_date=as_of)
+
+    pd.testing.assert_frame_equal(first, second)
+    assert (first["date"] <= pd.Timestamp(as_of)).all()
+    assert local_csv_module._as_of_timestamp.cache_info().misses == 1
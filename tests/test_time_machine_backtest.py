@@ -229,6 +229,23 @@ def test_time_machine_backtester_runs_on_sample_dataset(tmp_path: Path) -> None:
     assert report.artifacts.summary_txt.exists()
 
 
+def test_time_machine_backtester_predictions_do_not_depend_on_workers(tmp_path: Path) -> None:
+    reports = []
+    for workers in (1, 4):
+        backtester = TimeMachineBacktester.from_paths(
+            players_path="coach/data/sample_players.csv",
+            matches_path="coach/data/sample_matches.csv",
+            config=BacktestConfig(mode="mock", fast_mock=False, start_date="2020-01-01", limit=8, workers=workers),
+            runs_root=tmp_path / f"workers_{workers}",
+        )
+        reports.append(backtester.run())
+
+    sequential, threaded = reports
+    columns = [column for column in sequential.predictions.columns if column != "run_id"]
+    pd.testing.assert_frame_equal(sequential.predictions[columns], threaded.predictions[columns])
+    assert sequential.metrics["overall"] == threaded.metrics["overall"]
+
+
 def test_time_machine_backtester_scores_matches_with_cold_start_players(tmp_path: Path) -> None:
     players = pd.DataFrame(
         [